@@ -1,3 +1,49 @@
+from apps.air_quality.models import Alert, AlertRule
 from django.contrib import admin
 
-# Register your models here.
+
+@admin.register(AlertRule)
+class AlertRuleAdmin(admin.ModelAdmin):
+    """
+    Admin for threshold alert rules.
+    """
+
+    list_display = (
+        "name",
+        "compound",
+        "threshold",
+        "unit",
+        "location",
+        "tag",
+        "radius_km",
+        "window_minutes",
+        "is_active",
+    )
+    list_filter = ("is_active", "compound", "unit")
+    search_fields = ("name",)
+
+
+@admin.register(Alert)
+class AlertAdmin(admin.ModelAdmin):
+    """
+    Read-only admin of raised alerts.
+    """
+
+    list_display = (
+        "rule",
+        "location",
+        "value",
+        "threshold",
+        "unit",
+        "measured_at",
+        "created_at",
+    )
+    list_filter = ("rule",)
+    list_select_related = ("rule", "location")
+    readonly_fields = [field.name for field in Alert._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,286 @@
+import bisect
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+import numpy as np
+from apps.air_quality.conditional import get_table_version
+from apps.air_quality.conversions import convert_to_ug_m3
+from apps.air_quality.models import Alert, AlertRule, Compound, Location, Tag
+from django.contrib.gis.measure import D
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+ALL_LOCATIONS = None
+"""
+Index key standing for rules without a location scope.
+"""
+
+
+@dataclass
+class CompiledRule:
+    """
+    Alert rule with its threshold converted to micrograms per cubic meter.
+    """
+
+    id: int
+    name: str
+    threshold: float
+    unit: str
+    unit_factor: float
+    window: timedelta
+    cooldown: timedelta
+
+    @property
+    def threshold_ug_m3(self) -> float:
+        return self.threshold * self.unit_factor
+
+
+@dataclass
+class RollingWindow:
+    """
+    Readings of one rule and location within the rule window, keyed by
+    measurement time, with their sum.
+    """
+
+    timestamps: list = field(default_factory=list)
+    values: dict = field(default_factory=dict)
+    total: float = 0.0
+
+    def add(self, timestamp: datetime, value: float, window: timedelta):
+        """
+        Adds a value, evicts values older than the window and returns the mean
+        of the window ending at the value.
+
+        A value already held for the timestamp is replaced, so upserted
+        retries are counted once. Values arriving out of order are inserted
+        in place; values older than the window of the latest one are ignored
+        and None is returned.
+        """
+        if self.timestamps and timestamp <= self.timestamps[-1] - window:
+            return None
+
+        if timestamp in self.values:
+            self.total -= self.values[timestamp]
+        else:
+            bisect.insort(self.timestamps, timestamp)
+        self.values[timestamp] = value
+        self.total += value
+
+        evicted = bisect.bisect_right(self.timestamps, self.timestamps[-1] - window)
+        for old_timestamp in self.timestamps[:evicted]:
+            self.total -= self.values.pop(old_timestamp)
+        del self.timestamps[:evicted]
+
+        if timestamp == self.timestamps[-1]:
+            return self.total / len(self.timestamps)
+        start = bisect.bisect_right(self.timestamps, timestamp - window)
+        end = bisect.bisect_right(self.timestamps, timestamp)
+        in_window = self.timestamps[start:end]
+        return sum(self.values[key] for key in in_window) / len(in_window)
+
+
+class AlertEngine:
+    """
+    Evaluates ingested readings against active alert rules.
+
+    Rules are compiled into an index keyed by (location, compound), rebuilt
+    whenever rules, locations or tags change, so checking a batch is a
+    dictionary lookup per reading. Rolling windows and cooldowns are kept in
+    memory by each ingesting process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = {}
+        self._index_versions = None
+        self._windows = defaultdict(RollingWindow)
+        self._last_alerts = {}
+
+    def reset(self):
+        with self._lock:
+            self._index = {}
+            self._index_versions = None
+            self._windows.clear()
+            self._last_alerts.clear()
+
+    def get_index(self):
+        """
+        Returns the rule index, rebuilding it when its sources changed.
+        """
+        versions = tuple(
+            get_table_version(model) for model in (AlertRule, Location, Tag)
+        )
+        with self._lock:
+            if versions != self._index_versions:
+                self._index = build_rule_index()
+                self._index_versions = versions
+            return self._index
+
+    def evaluate(self, readings):
+        """
+        Checks readings against the rule index and stores raised alerts.
+        """
+        index = self.get_index()
+        if not index:
+            return []
+
+        readings = sorted(
+            (reading for reading in readings if not reading.is_flagged),
+            key=lambda reading: reading.timestamp,
+        )
+        matches = [
+            (reading, rules)
+            for reading in readings
+            if (
+                rules := index.get((reading.location_id, reading.compound_id), [])
+                + index.get((ALL_LOCATIONS, reading.compound_id), [])
+            )
+        ]
+        if not matches:
+            return []
+
+        values_ug_m3 = convert_reading_values([reading for reading, _ in matches])
+        alerts = []
+        raised = {}
+        with self._lock:
+            for (reading, rules), value in zip(matches, values_ug_m3):
+                if np.isnan(value):
+                    continue
+                for rule in rules:
+                    alert = self.check_rule(rule, reading, value, raised)
+                    if alert:
+                        alerts.append(alert)
+
+        if alerts:
+            Alert.objects.bulk_create(alerts)
+            transaction.on_commit(lambda: self.start_cooldowns(raised))
+            for alert in alerts:
+                logger.warning(
+                    "Alert %s at location %s: %.4f %s exceeds %.4f %s",
+                    alert.rule_id,
+                    alert.location_id,
+                    alert.value,
+                    alert.unit,
+                    alert.threshold,
+                    alert.unit,
+                )
+        return alerts
+
+    def start_cooldowns(self, raised: dict):
+        """
+        Records the times of committed alerts by rule and location.
+        """
+        with self._lock:
+            for key, timestamp in raised.items():
+                last_alert = self._last_alerts.get(key)
+                if last_alert is None or timestamp > last_alert:
+                    self._last_alerts[key] = timestamp
+
+    def check_rule(self, rule: CompiledRule, reading, value: float, raised: dict):
+        """
+        Returns an unsaved alert when the reading makes the rule exceed.
+
+        The alert time is recorded in `raised` by rule and location; cooldowns
+        only start once the alerts are committed, so an alert that failed to
+        be stored does not silence the rule.
+        """
+        key = (rule.id, reading.location_id)
+        if rule.window:
+            value = self._windows[key].add(reading.timestamp, value, rule.window)
+
+        if value is None or value <= rule.threshold_ug_m3:
+            return None
+
+        last_alert = raised.get(key) or self._last_alerts.get(key)
+        if last_alert and reading.timestamp < last_alert + rule.cooldown:
+            return None
+        raised[key] = reading.timestamp
+
+        return Alert(
+            rule_id=rule.id,
+            location_id=reading.location_id,
+            value=value / rule.unit_factor,
+            threshold=rule.threshold,
+            unit=rule.unit,
+            measured_at=reading.timestamp,
+        )
+
+
+def convert_reading_values(readings):
+    """
+    Returns reading values in micrograms per cubic meter.
+    """
+    compound_ids = {reading.compound_id for reading in readings}
+    molecular_weights = dict(
+        Compound.objects.filter(id__in=compound_ids).values_list(
+            "id", "molecular_weight"
+        )
+    )
+    return convert_to_ug_m3(
+        values=[reading.entered_concentration_value for reading in readings],
+        units=[reading.entered_concentration_unit for reading in readings],
+        molecular_weights=[
+            molecular_weights[reading.compound_id] or np.nan for reading in readings
+        ],
+    )
+
+
+def get_rule_location_ids(rule: AlertRule):
+    """
+    Returns the ids of locations in scope of a rule, or None for all locations.
+    """
+    if not (rule.location_id or rule.tag_id or rule.center is not None):
+        return ALL_LOCATIONS
+
+    locations = Location.objects.all()
+    if rule.location_id:
+        locations = locations.filter(pk=rule.location_id)
+    if rule.tag_id:
+        locations = locations.filter(tag_ids__contains=[rule.tag_id])
+    if rule.center is not None and rule.radius_km is not None:
+        locations = locations.filter(
+            coordinates__dwithin=(rule.center, D(km=rule.radius_km))
+        )
+    return list(locations.values_list("id", flat=True))
+
+
+def build_rule_index():
+    """
+    Compiles active rules into lists keyed by (location id, compound id).
+    """
+    index = defaultdict(list)
+    for rule in AlertRule.objects.filter(is_active=True).select_related("compound"):
+        [unit_factor] = convert_to_ug_m3(
+            [1.0], [rule.unit], [rule.compound.molecular_weight or np.nan]
+        )
+        if np.isnan(unit_factor):
+            logger.error(
+                "Alert rule %s uses %s without a compound molecular weight.",
+                rule.pk,
+                rule.unit,
+            )
+            continue
+
+        compiled_rule = CompiledRule(
+            id=rule.pk,
+            name=rule.name,
+            threshold=rule.threshold,
+            unit=rule.unit,
+            unit_factor=float(unit_factor),
+            window=timedelta(minutes=rule.window_minutes),
+            cooldown=timedelta(minutes=rule.cooldown_minutes),
+        )
+        location_ids = get_rule_location_ids(rule)
+        if location_ids is ALL_LOCATIONS:
+            index[(ALL_LOCATIONS, rule.compound_id)].append(compiled_rule)
+            continue
+        for location_id in location_ids:
+            index[(location_id, rule.compound_id)].append(compiled_rule)
+    return dict(index)
+
+
+alert_engine = AlertEngine()
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AirQualityConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.air_quality"
+
+    def ready(self):
+        from apps.air_quality import signals  # noqa: F401
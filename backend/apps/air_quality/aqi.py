@@ -0,0 +1,335 @@
+from datetime import timedelta
+
+import numpy as np
+from apps.air_quality.conversions import get_qs_with_converted_concentration
+from apps.air_quality.models import AirCompoundReading, Compound, LocationAQI
+from django.conf import settings
+from django.db.models import Avg
+from django.utils import timezone
+
+EPA_SCALE = "epa"
+CAQI_SCALE = "caqi"
+
+DEFAULT_AQI = {
+    "SCALE": EPA_SCALE,
+    "MAX_AGE_HOURS": 3,
+    "SCALES": {
+        EPA_SCALE: {
+            "COMPOUNDS": {
+                "PM2.5": {
+                    "unit": "ug_m3",
+                    "hours": 24,
+                    "breakpoints": [
+                        (0.0, 9.0, 0, 50),
+                        (9.1, 35.4, 51, 100),
+                        (35.5, 55.4, 101, 150),
+                        (55.5, 125.4, 151, 200),
+                        (125.5, 225.4, 201, 300),
+                        (225.5, 325.4, 301, 500),
+                    ],
+                },
+                "PM10": {
+                    "unit": "ug_m3",
+                    "hours": 24,
+                    "breakpoints": [
+                        (0, 54, 0, 50),
+                        (55, 154, 51, 100),
+                        (155, 254, 101, 150),
+                        (255, 354, 151, 200),
+                        (355, 424, 201, 300),
+                        (425, 604, 301, 500),
+                    ],
+                },
+                "O₃": {
+                    "unit": "ppb",
+                    "hours": 8,
+                    "breakpoints": [
+                        (0, 54, 0, 50),
+                        (55, 70, 51, 100),
+                        (71, 85, 101, 150),
+                        (86, 105, 151, 200),
+                        (106, 200, 201, 300),
+                    ],
+                },
+                "CO": {
+                    "unit": "ppm",
+                    "hours": 8,
+                    "breakpoints": [
+                        (0.0, 4.4, 0, 50),
+                        (4.5, 9.4, 51, 100),
+                        (9.5, 12.4, 101, 150),
+                        (12.5, 15.4, 151, 200),
+                        (15.5, 30.4, 201, 300),
+                        (30.5, 50.4, 301, 500),
+                    ],
+                },
+                "SO₂": {
+                    "unit": "ppb",
+                    "hours": 1,
+                    "breakpoints": [
+                        (0, 35, 0, 50),
+                        (36, 75, 51, 100),
+                        (76, 185, 101, 150),
+                        (186, 304, 151, 200),
+                        (305, 604, 201, 300),
+                        (605, 1004, 301, 500),
+                    ],
+                },
+                "NO₂": {
+                    "unit": "ppb",
+                    "hours": 1,
+                    "breakpoints": [
+                        (0, 53, 0, 50),
+                        (54, 100, 51, 100),
+                        (101, 360, 101, 150),
+                        (361, 649, 151, 200),
+                        (650, 1249, 201, 300),
+                        (1250, 2049, 301, 500),
+                    ],
+                },
+            },
+            "CATEGORIES": [
+                (50, "Good"),
+                (100, "Moderate"),
+                (150, "Unhealthy for Sensitive Groups"),
+                (200, "Unhealthy"),
+                (300, "Very Unhealthy"),
+                (500, "Hazardous"),
+            ],
+        },
+        CAQI_SCALE: {
+            "COMPOUNDS": {
+                "NO₂": {
+                    "unit": "ug_m3",
+                    "hours": 1,
+                    "breakpoints": [
+                        (0, 50, 0, 25),
+                        (50, 100, 25, 50),
+                        (100, 200, 50, 75),
+                        (200, 400, 75, 100),
+                    ],
+                },
+                "PM10": {
+                    "unit": "ug_m3",
+                    "hours": 1,
+                    "breakpoints": [
+                        (0, 25, 0, 25),
+                        (25, 50, 25, 50),
+                        (50, 90, 50, 75),
+                        (90, 180, 75, 100),
+                    ],
+                },
+                "PM2.5": {
+                    "unit": "ug_m3",
+                    "hours": 1,
+                    "breakpoints": [
+                        (0, 15, 0, 25),
+                        (15, 30, 25, 50),
+                        (30, 55, 50, 75),
+                        (55, 110, 75, 100),
+                    ],
+                },
+                "O₃": {
+                    "unit": "ug_m3",
+                    "hours": 1,
+                    "breakpoints": [
+                        (0, 60, 0, 25),
+                        (60, 120, 25, 50),
+                        (120, 180, 50, 75),
+                        (180, 240, 75, 100),
+                    ],
+                },
+                "CO": {
+                    "unit": "ug_m3",
+                    "hours": 8,
+                    "breakpoints": [
+                        (0, 5000, 0, 25),
+                        (5000, 7500, 25, 50),
+                        (7500, 10000, 50, 75),
+                        (10000, 20000, 75, 100),
+                    ],
+                },
+            },
+            "CATEGORIES": [
+                (25, "Very low"),
+                (50, "Low"),
+                (75, "Medium"),
+                (100, "High"),
+                (float("inf"), "Very high"),
+            ],
+        },
+    },
+}
+"""
+Default AQI configuration, overridden by settings.AIR_QUALITY_AQI.
+
+Each scale maps compound symbols to the unit and averaging period of its
+breakpoints, given as (low concentration, high concentration, low index,
+high index) bands, and lists the upper index bound of each category.
+"""
+
+
+def get_aqi_config():
+    """
+    Returns the AQI configuration merged with defaults.
+    """
+    return {**DEFAULT_AQI, **getattr(settings, "AIR_QUALITY_AQI", {})}
+
+
+def compute_sub_indexes(concentrations, breakpoints):
+    """
+    Returns the sub-indexes of concentrations by linear interpolation within
+    their breakpoint band.
+
+    Concentrations above the last band are extrapolated along its slope and
+    missing concentrations yield NaN.
+    """
+    concentrations = np.asarray(concentrations, dtype=float)
+    c_low, c_high, i_low, i_high = np.array(breakpoints, dtype=float).T
+
+    bands = np.minimum(
+        np.searchsorted(c_high, concentrations, side="left"), len(breakpoints) - 1
+    )
+    clipped = np.maximum(concentrations, c_low[bands])
+    sub_indexes = i_low[bands] + (i_high[bands] - i_low[bands]) * (
+        clipped - c_low[bands]
+    ) / (c_high[bands] - c_low[bands])
+    return np.where(np.isnan(concentrations), np.nan, np.round(sub_indexes))
+
+
+def get_category(aqi: float, categories) -> str:
+    """
+    Returns the label of the category an index falls into.
+    """
+    for upper_bound, label in categories:
+        if aqi <= upper_bound:
+            return label
+    return categories[-1][1]
+
+
+def get_window_means(compound: Compound, table: dict, hour, location_ids=None):
+    """
+    Returns mean concentrations per location id over the averaging period of a
+    breakpoint table ending with the given hour, optionally of some locations.
+    """
+    end = hour + timedelta(hours=1)
+    queryset = AirCompoundReading.objects.filter(
+        compound=compound,
+        timestamp__gte=end - timedelta(hours=table["hours"]),
+        timestamp__lt=end,
+        is_flagged=False,
+    )
+    if location_ids is not None:
+        queryset = queryset.filter(location_id__in=location_ids)
+    rows = (
+        get_qs_with_converted_concentration(
+            queryset=queryset, target_unit=table["unit"]
+        )
+        .values("location_id")
+        .annotate(mean=Avg("concentration_value"))
+        .order_by()
+    )
+    return {row["location_id"]: row["mean"] for row in rows}
+
+
+def compute_location_aqi(hour, scale: str = None, location_ids=None):
+    """
+    Computes and stores the AQI of every location with readings for one hour,
+    or only of the given locations.
+
+    Each compound of the scale runs one aggregate query over its averaging
+    period; sub-indexes are then computed in batch and the highest one per
+    location becomes its AQI. Existing values for the hour are replaced.
+
+    Returns the stored LocationAQI instances.
+    """
+    config = get_aqi_config()
+    scale = scale or config["SCALE"]
+    scale_config = config["SCALES"][scale]
+    hour = hour.replace(minute=0, second=0, microsecond=0)
+
+    compounds = Compound.objects.filter(symbol__in=scale_config["COMPOUNDS"])
+    location_ids = []
+    compound_ids = []
+    sub_indexes = []
+    for compound in compounds:
+        table = scale_config["COMPOUNDS"][compound.symbol]
+        means = get_window_means(compound, table, hour, location_ids)
+        location_ids.extend(means)
+        compound_ids.extend([compound.pk] * len(means))
+        sub_indexes.append(
+            compute_sub_indexes(list(means.values()), table["breakpoints"])
+        )
+    if not location_ids:
+        return []
+
+    location_ids = np.array(location_ids)
+    compound_ids = np.array(compound_ids)
+    sub_indexes = np.concatenate(sub_indexes)
+    valid = ~np.isnan(sub_indexes)
+    location_ids, compound_ids, sub_indexes = (
+        location_ids[valid],
+        compound_ids[valid],
+        sub_indexes[valid],
+    )
+
+    order = np.lexsort((-sub_indexes, location_ids))
+    first = np.unique(location_ids[order], return_index=True)[1]
+    dominant = order[first]
+
+    aqis = [
+        LocationAQI(
+            location_id=int(location_ids[index]),
+            scale=scale,
+            hour=hour,
+            aqi=int(sub_indexes[index]),
+            category=get_category(sub_indexes[index], scale_config["CATEGORIES"]),
+            dominant_compound_id=int(compound_ids[index]),
+        )
+        for index in dominant
+    ]
+    return LocationAQI.objects.bulk_create(
+        aqis,
+        update_conflicts=True,
+        unique_fields=["location", "scale", "hour"],
+        update_fields=["aqi", "category", "dominant_compound", "computed_at"],
+    )
+
+
+def recompute_location_aqi(location_ids, start, end):
+    """
+    Recomputes the stored AQI values of locations whose averaging windows
+    overlap readings changed between start and end.
+
+    Stored values of these locations are removed first, so hours left without
+    readings do not keep a stale index.
+    """
+    location_ids = list(location_ids)
+    scales = get_aqi_config()["SCALES"]
+    first_hour = start.replace(minute=0, second=0, microsecond=0)
+    for scale, scale_config in scales.items():
+        max_hours = max(table["hours"] for table in scale_config["COMPOUNDS"].values())
+        stale = LocationAQI.objects.filter(
+            location_id__in=location_ids,
+            scale=scale,
+            hour__gte=first_hour,
+            hour__lt=end + timedelta(hours=max_hours - 1),
+        )
+        hours = sorted(set(stale.values_list("hour", flat=True)))
+        stale.delete()
+        for hour in hours:
+            compute_location_aqi(hour, scale, location_ids)
+
+
+def get_latest_location_aqi(scale: str):
+    """
+    Returns the most recent AQI of every location computed within the maximum
+    age, in a single query.
+    """
+    since = timezone.now() - timedelta(hours=get_aqi_config()["MAX_AGE_HOURS"])
+    return (
+        LocationAQI.objects.filter(scale=scale, hour__gte=since)
+        .select_related("location", "dominant_compound")
+        .order_by("location_id", "-hour")
+        .distinct("location_id")
+    )
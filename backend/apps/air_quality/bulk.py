@@ -0,0 +1,154 @@
+from datetime import timedelta
+
+from apps.air_quality.aqi import recompute_location_aqi
+from apps.air_quality.conditional import bump_table_version
+from apps.air_quality.models import AirCompoundReading
+from apps.air_quality.recent import invalidate_recent_index
+from apps.air_quality.validation import FLAG_ACTION, validate_readings
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Max, Min
+from django.utils import timezone
+
+DEFAULT_BULK_OPERATIONS = {
+    "BATCH_SIZE": 5000,
+}
+"""
+Default bulk operation configuration, overridden by
+settings.AIR_QUALITY_BULK_OPERATIONS.
+"""
+
+
+def get_bulk_config():
+    """
+    Returns the bulk operation configuration merged with defaults.
+    """
+    return {
+        **DEFAULT_BULK_OPERATIONS,
+        **getattr(settings, "AIR_QUALITY_BULK_OPERATIONS", {}),
+    }
+
+
+def iter_id_batches(queryset, batch_size: int):
+    """
+    Yields the primary keys of a queryset in ascending batches.
+
+    Batches are read by keyset, so each one is an index range scan and rows
+    changed by a previous batch are never visited again.
+    """
+    ids = queryset.order_by("pk").values_list("pk", flat=True)
+    last_id = 0
+    while True:
+        batch = list(ids.filter(pk__gt=last_id)[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]
+
+
+def get_affected_span(queryset):
+    """
+    Returns the location ids and the time span of the readings of a queryset.
+    """
+    span = queryset.order_by().aggregate(start=Min("timestamp"), end=Max("timestamp"))
+    location_ids = set(
+        queryset.order_by().values_list("location_id", flat=True).distinct()
+    )
+    return location_ids, span["start"], span["end"]
+
+
+def apply_to_readings(queryset, operation, batch_size=None) -> int:
+    """
+    Runs an operation on the readings of a queryset in committed batches.
+
+    ``operation`` receives a list of reading ids and returns the number of rows
+    it changed. Each batch bumps the table version. Once the batches are done,
+    or one of them failed, stored AQI values whose windows overlap the
+    readings are recomputed, only for the hours already stored, and the recent
+    readings index of every process is reloaded on next use.
+    """
+    batch_size = batch_size or get_bulk_config()["BATCH_SIZE"]
+    location_ids, start, end = get_affected_span(queryset)
+    if start is None:
+        return 0
+
+    changed = 0
+    try:
+        for ids in iter_id_batches(queryset, batch_size):
+            with transaction.atomic():
+                changed += operation(ids)
+                bump_table_version(AirCompoundReading)
+    finally:
+        with transaction.atomic():
+            recompute_location_aqi(location_ids, start, end + timedelta(hours=1))
+            transaction.on_commit(invalidate_recent_index)
+    return changed
+
+
+def revalidate_readings(ids):
+    """
+    Runs the validation pipeline again on stored readings and saves the flags
+    that changed. Readings are flagged, never quarantined, and are not counted
+    as new observations.
+    """
+    readings = list(
+        AirCompoundReading.objects.filter(pk__in=ids).select_related("compound")
+    )
+    flags = {
+        reading.pk: (reading.is_flagged, reading.flag_reason) for reading in readings
+    }
+    validate_readings(readings, action=FLAG_ACTION, observe=False)
+    AirCompoundReading.objects.bulk_update(
+        [
+            reading
+            for reading in readings
+            if (reading.is_flagged, reading.flag_reason) != flags[reading.pk]
+        ],
+        ["is_flagged", "flag_reason"],
+    )
+
+
+def correct_readings(queryset, scale=1.0, offset=0.0, unit=None, batch_size=None):
+    """
+    Rescales, offsets and optionally re-labels the unit of readings.
+
+    Values become ``value * scale + offset`` in a single UPDATE per batch,
+    after which the flags of the batch are validated again, so readings that
+    only failed because of the miscalibration are accepted.
+
+    Returns the number of updated readings.
+    """
+    changes = {
+        "entered_concentration_value": F("entered_concentration_value") * scale
+        + offset,
+        "updated_at": timezone.now(),
+    }
+    if unit:
+        changes["entered_concentration_unit"] = unit
+
+    def update(ids):
+        updated = AirCompoundReading.objects.filter(pk__in=ids).update(**changes)
+        revalidate_readings(ids)
+        return updated
+
+    return apply_to_readings(queryset, update, batch_size)
+
+
+def delete_readings(queryset, batch_size=None):
+    """
+    Deletes readings with a single DELETE per batch.
+
+    Nothing references readings, so rows are deleted without collecting them
+    or sending a delete signal per row.
+
+    Returns the number of deleted readings.
+    """
+    table = connection.ops.quote_name(AirCompoundReading._meta.db_table)
+    sql = f"DELETE FROM {table} WHERE id = ANY(%s)"
+
+    def delete(ids):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [ids])
+            return cursor.rowcount
+
+    return apply_to_readings(queryset, delete, batch_size)
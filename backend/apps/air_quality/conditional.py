@@ -0,0 +1,116 @@
+import hashlib
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework.response import Response
+
+
+def get_table_version_cache_key(model) -> str:
+    """
+    Returns the cache key holding the version of a model table.
+    """
+    return f"air_quality:table_version:{model._meta.label_lower}"
+
+
+def get_table_version(model) -> str:
+    """
+    Returns the current version token of a model table.
+
+    Versions are random tokens rather than counters, so a cold or evicted cache
+    yields a new version and never a stale match.
+    """
+    cache_key = get_table_version_cache_key(model)
+    version = cache.get(cache_key)
+    if version is None:
+        cache.add(cache_key, uuid4().hex, None)
+        version = cache.get(cache_key)
+    return version
+
+
+def bump_table_version(model):
+    """
+    Marks the content of a model table as changed.
+
+    The version is bumped again once the current transaction commits, so an
+    ETag computed while the change was not visible yet cannot stay valid.
+    """
+    cache_key = get_table_version_cache_key(model)
+    cache.set(cache_key, uuid4().hex, None)
+    transaction.on_commit(lambda: cache.set(cache_key, uuid4().hex, None))
+
+
+def conditional_responses_enabled() -> bool:
+    """
+    Returns whether table versions can be trusted to validate responses.
+
+    A local memory cache only holds the versions bumped by its own process, so
+    conditional responses are off with one unless
+    settings.AIR_QUALITY_CONDITIONAL_RESPONSES forces them, e.g. for a server
+    running a single process.
+    """
+    forced = getattr(settings, "AIR_QUALITY_CONDITIONAL_RESPONSES", None)
+    if forced is not None:
+        return forced
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+class ConditionalListMixin:
+    """
+    Adds ETag validation to list responses.
+
+    The ETag combines the request, the version tokens of ``conditional_models``
+    and the max primary key of the filtered queryset, aggregated in the
+    database without loading any row. Rows are not counted: every write bumps
+    a table version anyway, and the paginator counts the rows itself.
+
+    No Last-Modified date is sent: rows carry no time of their last write, and
+    corrections or deletions of older rows would not advance any date the
+    list could report. Without a shared cache, lists are served
+    unconditionally.
+    """
+
+    conditional_models = ()
+
+    def list(self, request, *args, **kwargs):
+        if not conditional_responses_enabled():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        etag = self.get_list_etag(request, queryset)
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        else:
+            serializer = self.get_serializer(queryset, many=True)
+            response = Response(serializer.data)
+
+        response["ETag"] = etag
+        return response
+
+    def get_list_etag(self, request, queryset):
+        """
+        Returns the ETag of a filtered list.
+        """
+        max_pk = queryset.order_by().aggregate(max_pk=Max("pk"))["max_pk"]
+
+        parts = [
+            request.get_full_path(),
+            request.META.get("HTTP_ACCEPT", ""),
+            str(max_pk),
+            *(get_table_version(model) for model in self.conditional_models),
+        ]
+        etag = quote_etag(hashlib.sha1("|".join(parts).encode()).hexdigest())
+        return etag
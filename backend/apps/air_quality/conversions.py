@@ -1,42 +1,57 @@
+from functools import partial
+
+import numpy as np
 from django.db.models import Case, ExpressionWrapper, F, FloatField, When
 
+MOLAR_VOLUME = 24.45
+"""
+Molar volume of an ideal gas in liters at 25 °C and 1 atm.
+"""
+
+UG_M3_FACTORS = {
+    "ug_m3": 1.0,
+    "mg_m3": 1000.0,
+    "ppm": 1000.0 / MOLAR_VOLUME,
+    "ppb": 1.0 / MOLAR_VOLUME,
+}
+"""
+Factors converting each unit to micrograms per cubic meter. Volume ratios
+(ppm, ppb) are additionally multiplied by the compound molecular weight.
+"""
+
+VOLUME_RATIO_UNITS = ("ppm", "ppb")
+
+CONVERSION_FACTORS = {
+    (from_unit, to_unit): (
+        UG_M3_FACTORS[from_unit] / UG_M3_FACTORS[to_unit],
+        (from_unit in VOLUME_RATIO_UNITS) - (to_unit in VOLUME_RATIO_UNITS),
+    )
+    for from_unit in UG_M3_FACTORS
+    for to_unit in UG_M3_FACTORS
+}
+"""
+Conversions between units as (factor, molecular weight exponent), derived from
+UG_M3_FACTORS: value * factor * molecular_weight ** exponent.
+"""
+
+
+def get_conversion_expression(from_unit, to_unit):
+    """
+    Returns the database expression of a conversion from CONVERSION_FACTORS.
+    """
+    factor, exponent = CONVERSION_FACTORS[(from_unit, to_unit)]
+    expression = F("entered_concentration_value")
+    if factor != 1:
+        expression = expression * factor
+    if exponent > 0:
+        expression = expression * F("compound__molecular_weight")
+    elif exponent < 0:
+        expression = expression / F("compound__molecular_weight")
+    return expression
+
+
 CONVERSION_RULES = {
-    ("ug_m3", "ug_m3"): lambda: F("entered_concentration_value"),
-    ("ug_m3", "mg_m3"): lambda: F("entered_concentration_value") / 1000,
-    ("ug_m3", "ppm"): lambda: F("entered_concentration_value")
-    * F("compound__molecular_weight")
-    / 24.45
-    / 1000,
-    ("ug_m3", "ppb"): lambda: F("entered_concentration_value")
-    * F("compound__molecular_weight")
-    / 24.45,
-    ("mg_m3", "mg_m3"): lambda: F("entered_concentration_value"),
-    ("mg_m3", "ug_m3"): lambda: F("entered_concentration_value") * 1000,
-    ("mg_m3", "ppm"): lambda: F("entered_concentration_value")
-    * 24.45
-    / F("compound__molecular_weight"),
-    ("mg_m3", "ppb"): lambda: F("entered_concentration_value")
-    * 1000
-    * 24.45
-    / F("compound__molecular_weight"),
-    ("ppm", "ppm"): lambda: F("entered_concentration_value"),
-    ("ppm", "ppb"): lambda: F("entered_concentration_value") * 1000,
-    ("ppm", "mg_m3"): lambda: F("entered_concentration_value")
-    * F("compound__molecular_weight")
-    / 24.45,
-    ("ppm", "ug_m3"): lambda: F("entered_concentration_value")
-    * F("compound__molecular_weight")
-    / 24.45
-    * 1000,
-    ("ppb", "ppb"): lambda: F("entered_concentration_value"),
-    ("ppb", "ppm"): lambda: F("entered_concentration_value") / 1000,
-    ("ppb", "mg_m3"): lambda: F("entered_concentration_value")
-    / 1000
-    * F("compound__molecular_weight")
-    / 24.45,
-    ("ppb", "ug_m3"): lambda: F("entered_concentration_value")
-    * F("compound__molecular_weight")
-    / 24.45,
+    units: partial(get_conversion_expression, *units) for units in CONVERSION_FACTORS
 }
 """
 Dictionary mapping concentration unit conversion rules.
@@ -55,7 +70,7 @@ def get_qs_with_converted_concentration(queryset, target_unit):
         condition_kwargs = {"entered_concentration_unit": from_unit}
 
         gas_check_required = (
-            any(unit in ("ppm", "ppb") for unit in (from_unit, to_unit))
+            any(unit in VOLUME_RATIO_UNITS for unit in (from_unit, to_unit))
             and from_unit != to_unit
         )
         if gas_check_required:
@@ -75,3 +90,22 @@ def get_qs_with_converted_concentration(queryset, target_unit):
             )
         }
     )
+
+
+def convert_to_ug_m3(values, units, molecular_weights):
+    """
+    Converts arrays of concentration values to micrograms per cubic meter.
+
+    Volume ratios of compounds without a molecular weight convert to NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    units = np.asarray(units, dtype=object)
+    molecular_weights = np.asarray(molecular_weights, dtype=float)
+
+    factors = np.full(values.shape, np.nan)
+    for unit, factor in UG_M3_FACTORS.items():
+        factors[units == unit] = factor
+
+    is_volume_ratio = np.isin(units, VOLUME_RATIO_UNITS)
+    factors[is_volume_ratio] *= molecular_weights[is_volume_ratio]
+    return values * factors
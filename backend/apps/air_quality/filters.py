@@ -1,31 +1,128 @@
+from datetime import timedelta
+
 from apps.air_quality.conversions import get_qs_with_converted_concentration
 from apps.air_quality.models import AirCompoundReading, Compound, Location, Tag
+from apps.air_quality.neighbors import get_nearby_filter
+from apps.air_quality.spatial import as_planar, parse_bbox, parse_polygon
 from django.contrib.gis.geos import Point
 from django.contrib.gis.measure import D
+from django.utils import timezone
 from django_filters.rest_framework import FilterSet, filters
 from rest_framework.exceptions import ValidationError
 
+MAX_LAST_MINUTES = 7 * 24 * 60
+
 
-class LocationFilterSet(FilterSet):
+class SpatialFilterSet(FilterSet):
+    """
+    Base FilterSet with bounding box, GeoJSON polygon and nearby station filters.
+    """
+
+    spatial_field = "coordinates"
+    location_field = "pk"
+    non_narrowing_filters = ("within_km",)
+
+    bbox = filters.CharFilter(method="filter_by_bbox")
+    polygon = filters.CharFilter(method="filter_by_polygon")
+    near = filters.ModelChoiceFilter(
+        queryset=Location.objects.all(), to_field_name="name", method="filter_near"
+    )
+    within_km = filters.NumberFilter(method="filter_near")
+
+    def get_narrowing_filters(self):
+        """
+        Returns the names of the bound filters that restrict the rows.
+
+        Blank values and filters that only modify the rows or qualify another
+        filter are left out.
+        """
+        return [
+            name
+            for name, value in self.form.cleaned_data.items()
+            if name not in self.non_narrowing_filters
+            and value is not None
+            and value != ""
+            and not (hasattr(value, "__len__") and len(value) == 0)
+        ]
+
+    def filter_by_bbox(self, queryset, name, value):
+        """
+        Filters objects whose coordinates fall within a bounding box.
+
+        Coordinates are compared as geometry, so the box edges follow
+        parallels.
+        """
+        try:
+            bbox = parse_bbox(value)
+        except ValidationError as e:
+            raise ValidationError({name: e.detail})
+        return queryset.alias(bbox_coordinates=as_planar(self.spatial_field)).filter(
+            bbox_coordinates__coveredby=bbox
+        )
+
+    def filter_by_polygon(self, queryset, name, value):
+        """
+        Filters objects whose coordinates intersect a GeoJSON polygon.
+        """
+        try:
+            polygon = parse_polygon(value)
+        except ValidationError as e:
+            raise ValidationError({name: e.detail})
+        return queryset.filter(**{f"{self.spatial_field}__intersects": polygon})
+
+    def filter_near(self, queryset, name, value):
+        """
+        Filters objects of a location and of the locations within `within_km`
+        of it, looked up in the precomputed neighbor table.
+        """
+        if name != "near":
+            return queryset
+
+        radius_km = self.form.cleaned_data.get("within_km")
+        if radius_km is None or radius_km < 0:
+            raise ValidationError(
+                {"within_km": "A positive distance is required with 'near'."}
+            )
+        return queryset.filter(
+            get_nearby_filter(value, float(radius_km), field=self.location_field)
+        )
+
+
+class LocationFilterSet(SpatialFilterSet):
     """
     FilterSet for Location objects.
     """
 
     name = filters.CharFilter(lookup_expr="icontains")
     tag = filters.ModelMultipleChoiceFilter(
-        queryset=Tag.objects.all(), to_field_name="name", field_name="tags__name"
+        queryset=Tag.objects.all(), to_field_name="name", method="filter_by_tags"
     )
 
+    def filter_by_tags(self, queryset, name, value):
+        """
+        Filters locations having any of the given tags.
+        """
+        return queryset.filter(tag_ids__overlap=[tag.pk for tag in value])
+
 
-class AirCompoundReadingFilterSet(FilterSet):
+class AirCompoundReadingFilterSet(SpatialFilterSet):
     """
     FilterSet for AirCompoundReading objects.
     """
 
+    spatial_field = "location__coordinates"
+    location_field = "location"
+    non_narrowing_filters = (
+        "within_km",
+        "concentration_unit",
+        "longitude",
+        "latitude",
+    )
+
     tag = filters.ModelMultipleChoiceFilter(
         queryset=Tag.objects.all(),
         to_field_name="name",
-        field_name="location__tags__name",
+        method="filter_by_tags",
     )
     compound = filters.ModelMultipleChoiceFilter(
         queryset=Compound.objects.all(),
@@ -40,6 +137,11 @@ class AirCompoundReadingFilterSet(FilterSet):
     concentration_unit = filters.ChoiceFilter(
         choices=AirCompoundReading.CONCENTRATION_UNITS, method="convert_to_target_unit"
     )
+    start = filters.IsoDateTimeFilter(field_name="timestamp", lookup_expr="gte")
+    end = filters.IsoDateTimeFilter(field_name="timestamp", lookup_expr="lt")
+    since_id = filters.NumberFilter(field_name="id", lookup_expr="gt")
+    last_minutes = filters.NumberFilter(method="filter_last_minutes")
+    flagged = filters.BooleanFilter(field_name="is_flagged")
     longitude = filters.NumberFilter(method="filter_by_radius")
     latitude = filters.NumberFilter(method="filter_by_radius")
     radius = filters.NumberFilter(method="filter_by_radius")
@@ -50,6 +152,27 @@ class AirCompoundReadingFilterSet(FilterSet):
         """
         return get_qs_with_converted_concentration(queryset=queryset, target_unit=value)
 
+    def filter_by_tags(self, queryset, name, value):
+        """
+        Filters readings from locations having any of the given tags.
+        """
+        return queryset.filter(location__tag_ids__overlap=[tag.pk for tag in value])
+
+    def filter_last_minutes(self, queryset, name, value):
+        """
+        Filters readings taken in the last given number of minutes.
+
+        The window start is computed here rather than with NOW() in SQL so the
+        planner sees a constant it can match against the timestamp index.
+        """
+        if not 0 < value <= MAX_LAST_MINUTES:
+            raise ValidationError(
+                {name: f"Must be between 0 and {MAX_LAST_MINUTES} minutes."}
+            )
+        return queryset.filter(
+            timestamp__gte=timezone.now() - timedelta(minutes=float(value))
+        )
+
     def filter_by_radius(self, queryset, name, value):
         """
         Filters readings within a specified radius from a given point.
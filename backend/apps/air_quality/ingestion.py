@@ -0,0 +1,316 @@
+import logging
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from apps.air_quality.alerts import alert_engine
+from apps.air_quality.conditional import bump_table_version
+from apps.air_quality.models import AirCompoundReading, QueuedReading
+from apps.air_quality.recent import (
+    get_recent_index_config,
+    invalidate_recent_index,
+    recent_index,
+)
+from apps.air_quality.streaming import publish_readings
+from apps.air_quality.validation import validate_readings
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.db.models import Min
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SYNC_MODE = "sync"
+QUEUED_MODE = "queued"
+
+DEFAULT_INGESTION = {
+    "MODE": SYNC_MODE,
+    "MAX_QUEUE_DEPTH": 100_000,
+    "BATCH_SIZE": 500,
+    "MAX_ATTEMPTS": 5,
+    "RETRY_DELAY_SECONDS": 10,
+}
+"""
+Default ingestion configuration, overridden by settings.AIR_QUALITY_INGESTION.
+"""
+
+READING_UNIQUE_FIELDS = ("location", "compound", "timestamp")
+"""
+Natural key of a reading, used to make repeated submissions idempotent.
+"""
+
+QUEUE_DEPTH_CACHE_KEY = "air_quality:ingestion_queue_depth"
+QUEUE_DEPTH_CACHE_SECONDS = 1
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of one drained ingestion batch.
+    """
+
+    stored: int = 0
+    retried: int = 0
+    dead: int = 0
+    lag_seconds: float = 0.0
+
+    @property
+    def processed(self) -> int:
+        return self.stored + self.retried + self.dead
+
+
+def get_ingestion_config():
+    """
+    Returns the ingestion configuration merged with defaults.
+    """
+    return {**DEFAULT_INGESTION, **getattr(settings, "AIR_QUALITY_INGESTION", {})}
+
+
+def is_queued_mode() -> bool:
+    """
+    Returns whether readings are acknowledged before being written.
+    """
+    return get_ingestion_config()["MODE"] == QUEUED_MODE
+
+
+def deduplicate_readings(readings):
+    """
+    Returns readings with only the last one kept for each natural key.
+    """
+    unique_readings = {
+        (reading.location_id, reading.compound_id, reading.timestamp): reading
+        for reading in readings
+    }
+    return list(unique_readings.values())
+
+
+def has_stored_readings(readings) -> bool:
+    """
+    Returns whether any reading is already stored under its natural key.
+    """
+    keys = {
+        (reading.location_id, reading.compound_id, reading.timestamp)
+        for reading in readings
+    }
+    if not keys:
+        return False
+    candidates = AirCompoundReading.objects.filter(
+        location_id__in={location_id for location_id, _, _ in keys},
+        compound_id__in={compound_id for _, compound_id, _ in keys},
+        timestamp__in={timestamp for _, _, timestamp in keys},
+    ).values_list("location_id", "compound_id", "timestamp")
+    return any(key in keys for key in candidates.iterator())
+
+
+def store_readings(readings):
+    """
+    Upserts readings in a single statement.
+
+    A reading already stored for the same location, compound and timestamp is
+    overwritten, so retried or duplicated submissions do not create new rows;
+    when the recent readings index is enabled, overwrites reload it in every
+    process.
+    Readings go through the validation pipeline first: failing ones are
+    flagged, or moved to the queue as quarantined entries.
+    """
+    readings, quarantined = validate_readings(deduplicate_readings(readings))
+    if quarantined:
+        quarantine_readings(quarantined)
+
+    overwrites = get_recent_index_config()["ENABLED"] and has_stored_readings(readings)
+    readings = AirCompoundReading.objects.bulk_create(
+        readings,
+        update_conflicts=True,
+        unique_fields=READING_UNIQUE_FIELDS,
+        update_fields=[
+            "entered_concentration_value",
+            "entered_concentration_unit",
+            "is_flagged",
+            "flag_reason",
+            "updated_at",
+        ],
+    )
+    bump_table_version(AirCompoundReading)
+    if overwrites:
+        transaction.on_commit(invalidate_recent_index)
+    evaluate_alerts(readings)
+    transaction.on_commit(lambda: publish_readings(readings))
+    transaction.on_commit(lambda: recent_index.add(readings))
+    return readings
+
+
+def evaluate_alerts(readings):
+    """
+    Raises alerts for stored readings without failing the ingestion on errors.
+    """
+    try:
+        with transaction.atomic():
+            alert_engine.evaluate(readings)
+    except Exception:
+        logger.exception("Unable to evaluate alerts for %d readings.", len(readings))
+
+
+def quarantine_readings(readings):
+    """
+    Keeps readings that failed validation in the queue for manual review.
+    """
+    return QueuedReading.objects.bulk_create(
+        [
+            QueuedReading(
+                location_id=reading.location_id,
+                compound_id=reading.compound_id,
+                entered_concentration_value=reading.entered_concentration_value,
+                entered_concentration_unit=reading.entered_concentration_unit,
+                timestamp=reading.timestamp,
+                status=QueuedReading.QUARANTINED,
+                last_error=reading.flag_reason,
+            )
+            for reading in readings
+        ]
+    )
+
+
+def get_queue_depth() -> int:
+    """
+    Returns the number of pending queue entries, cached for a short time.
+    """
+    depth = cache.get(QUEUE_DEPTH_CACHE_KEY)
+    if depth is None:
+        depth = QueuedReading.objects.filter(status=QueuedReading.PENDING).count()
+        cache.set(QUEUE_DEPTH_CACHE_KEY, depth, QUEUE_DEPTH_CACHE_SECONDS)
+    return depth
+
+
+def queue_is_full() -> bool:
+    """
+    Returns whether the queue reached its maximum depth.
+    """
+    return get_queue_depth() >= get_ingestion_config()["MAX_QUEUE_DEPTH"]
+
+
+def enqueue_readings(validated_readings):
+    """
+    Adds validated reading data to the ingestion queue.
+    """
+    return QueuedReading.objects.bulk_create(
+        [
+            QueuedReading(
+                location=data["location"],
+                compound=data["compound"],
+                entered_concentration_value=data["entered_concentration_value"],
+                entered_concentration_unit=data["entered_concentration_unit"],
+                timestamp=data.get("timestamp") or timezone.now(),
+            )
+            for data in validated_readings
+        ]
+    )
+
+
+def get_queue_stats() -> dict:
+    """
+    Returns the queue depth, dead letters, quarantined readings and age of the
+    oldest pending entry.
+    """
+    pending = QueuedReading.objects.filter(status=QueuedReading.PENDING)
+    oldest = pending.aggregate(oldest=Min("enqueued_at"))["oldest"]
+    return {
+        "pending": pending.count(),
+        "dead": QueuedReading.objects.filter(status=QueuedReading.DEAD).count(),
+        "quarantined": QueuedReading.objects.filter(
+            status=QueuedReading.QUARANTINED
+        ).count(),
+        "lag_seconds": (timezone.now() - oldest).total_seconds() if oldest else 0.0,
+    }
+
+
+def drain_batch(batch_size=None) -> BatchResult:
+    """
+    Writes one batch of pending queue entries.
+
+    Entries are locked with SKIP LOCKED so several workers can drain concurrently.
+    When the batch insert fails, entries are retried one by one to isolate the
+    failing ones, which are rescheduled with a delay or dead-lettered.
+    """
+    config = get_ingestion_config()
+    batch_size = batch_size or config["BATCH_SIZE"]
+    result = BatchResult()
+
+    with transaction.atomic():
+        batch = list(
+            QueuedReading.objects.select_for_update(skip_locked=True)
+            .filter(status=QueuedReading.PENDING, available_at__lte=timezone.now())
+            .order_by("id")[:batch_size]
+        )
+        if not batch:
+            return result
+
+        result.lag_seconds = (
+            timezone.now() - min(entry.enqueued_at for entry in batch)
+        ).total_seconds()
+
+        try:
+            with transaction.atomic():
+                store_readings([entry.to_reading() for entry in batch])
+            stored, failed = batch, []
+        except DatabaseError:
+            stored, failed = [], []
+            for entry in batch:
+                try:
+                    with transaction.atomic():
+                        store_readings([entry.to_reading()])
+                    stored.append(entry)
+                except DatabaseError as e:
+                    entry.last_error = str(e)
+                    failed.append(entry)
+
+        QueuedReading.objects.filter(id__in=[entry.id for entry in stored]).delete()
+        result.stored = len(stored)
+
+        for entry in failed:
+            entry.attempts += 1
+            if entry.attempts >= config["MAX_ATTEMPTS"]:
+                entry.status = QueuedReading.DEAD
+                result.dead += 1
+            else:
+                entry.available_at = timezone.now() + timedelta(
+                    seconds=config["RETRY_DELAY_SECONDS"] * entry.attempts
+                )
+                result.retried += 1
+        QueuedReading.objects.bulk_update(
+            failed, fields=["attempts", "status", "available_at", "last_error"]
+        )
+
+    return result
+
+
+def run_worker(batch_size=None, poll_interval=1.0, until_empty=False) -> BatchResult:
+    """
+    Drains the queue continuously and logs throughput and lag.
+    """
+    totals = BatchResult()
+    while True:
+        start = time.perf_counter()
+        result = drain_batch(batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+
+        if not result.processed:
+            if until_empty:
+                return totals
+            time.sleep(poll_interval)
+            continue
+
+        totals.stored += result.stored
+        totals.retried += result.retried
+        totals.dead += result.dead
+        totals.lag_seconds = result.lag_seconds
+        logger.info(
+            "Ingested %d readings (%d retried, %d dead) in %.3fs: "
+            "%.0f readings/s, lag %.1fs",
+            result.stored,
+            result.retried,
+            result.dead,
+            elapsed,
+            result.stored / elapsed if elapsed else 0.0,
+            result.lag_seconds,
+        )
@@ -0,0 +1,212 @@
+import hashlib
+
+import numpy as np
+from apps.air_quality.conditional import get_table_version
+from apps.air_quality.conversions import get_qs_with_converted_concentration
+from apps.air_quality.models import AirCompoundReading, Location
+from apps.air_quality.spatial import as_planar
+from django.conf import settings
+from django.contrib.gis.geos import Polygon
+from django.core.cache import cache
+from django.db.models import Avg
+from django.utils import timezone
+from scipy.spatial import cKDTree
+
+DEFAULT_INTERPOLATION = {
+    "POWER": 2.0,
+    "NEIGHBORS": 8,
+    "SEARCH_MARGIN": 0.25,
+    "CACHE_TIMEOUT": 300,
+    "LIVE_BUCKET_SECONDS": 60,
+}
+"""
+Default interpolation configuration, overridden by
+settings.AIR_QUALITY_INTERPOLATION. SEARCH_MARGIN is the fraction of the
+bounding box size stations are also searched beyond its edges.
+LIVE_BUCKET_SECONDS is how long a grid of a window still receiving readings
+is reused.
+"""
+
+MAX_RESOLUTION = 1024
+"""
+Maximum number of grid cells along each axis.
+"""
+
+
+def get_interpolation_config():
+    """
+    Returns the interpolation configuration merged with defaults.
+    """
+    return {
+        **DEFAULT_INTERPOLATION,
+        **getattr(settings, "AIR_QUALITY_INTERPOLATION", {}),
+    }
+
+
+def get_search_area(bbox: Polygon, margin: float) -> Polygon:
+    """
+    Returns the bounding box grown by a fraction of its size on every side.
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox.extent
+    lon_margin = (max_lon - min_lon) * margin
+    lat_margin = (max_lat - min_lat) * margin
+    area = Polygon.from_bbox(
+        (
+            max(min_lon - lon_margin, -180),
+            max(min_lat - lat_margin, -90),
+            min(max_lon + lon_margin, 180),
+            min(max_lat + lat_margin, 90),
+        )
+    )
+    area.srid = 4326
+    return area
+
+
+def get_station_means(data, margin: float):
+    """
+    Returns longitudes, latitudes and mean concentrations of the locations
+    around the bounding box, aggregated in a single query.
+    """
+    queryset = AirCompoundReading.objects.alias(
+        search_coordinates=as_planar("location__coordinates")
+    ).filter(
+        compound=data["compound"],
+        timestamp__gte=data["start_date"],
+        timestamp__lt=data["end_date"],
+        search_coordinates__coveredby=get_search_area(data["bbox"], margin),
+    )
+    if data.get("exclude_flagged", True):
+        queryset = queryset.filter(is_flagged=False)
+
+    rows = [
+        (row["location__coordinates"].x, row["location__coordinates"].y, row["mean"])
+        for row in get_qs_with_converted_concentration(
+            queryset=queryset, target_unit=data["concentration_unit"]
+        )
+        .values("location_id", "location__coordinates")
+        .annotate(mean=Avg("concentration_value"))
+        .order_by()
+        if row["mean"] is not None
+    ]
+    lons, lats, means = np.array(rows, dtype=float).reshape(-1, 3).T
+    return lons, lats, means
+
+
+def get_grid_shape(extent, resolution: int):
+    """
+    Returns the grid height and width, with cells about square on the ground.
+    """
+    min_lon, min_lat, max_lon, max_lat = extent
+    aspect = (max_lat - min_lat) / (
+        (max_lon - min_lon) * np.cos(np.radians((min_lat + max_lat) / 2))
+    )
+    height = int(np.clip(round(resolution * aspect), 1, MAX_RESOLUTION))
+    return height, resolution
+
+
+def interpolate_idw(lons, lats, values, extent, shape, power, neighbors):
+    """
+    Returns inverse-distance-weighted values at the cell centers of a grid.
+
+    Each cell only weights its nearest stations, found with a KD-tree on
+    coordinates scaled to about equal distances along both axes. The first
+    grid row is the northern edge.
+    """
+    min_lon, min_lat, max_lon, max_lat = extent
+    height, width = shape
+    lon_scale = np.cos(np.radians((min_lat + max_lat) / 2))
+
+    cell_lons = min_lon + (np.arange(width) + 0.5) * (max_lon - min_lon) / width
+    cell_lats = max_lat - (np.arange(height) + 0.5) * (max_lat - min_lat) / height
+    grid_x, grid_y = np.meshgrid(cell_lons * lon_scale, cell_lats)
+
+    tree = cKDTree(np.column_stack([lons * lon_scale, lats]))
+    distances, indexes = tree.query(
+        np.column_stack([grid_x.ravel(), grid_y.ravel()]),
+        k=min(neighbors, len(values)),
+    )
+    distances = distances.reshape(len(distances), -1)
+    indexes = indexes.reshape(len(indexes), -1)
+
+    exact = distances == 0
+    with np.errstate(divide="ignore"):
+        weights = 1.0 / distances**power
+    on_station = exact.any(axis=1)
+    weights[on_station] = exact[on_station]
+
+    grid = (weights * values[indexes]).sum(axis=1) / weights.sum(axis=1)
+    return grid.reshape(height, width).astype(np.float32)
+
+
+def get_interpolation_cache_key(data, live_bucket_seconds: int) -> str:
+    """
+    Returns the cache key of an interpolation request.
+
+    Every ingest bumps the reading table version, so keys do not include it.
+    A window ending in the future is keyed by the current time bucket, so new
+    readings show within a bucket; changes to older readings show once the
+    cached grid expires. Keys include the location table version, so moved
+    locations never serve a stale grid.
+    """
+    now = timezone.now()
+    bucket = (
+        str(int(now.timestamp() // live_bucket_seconds))
+        if data["end_date"] > now
+        else "closed"
+    )
+    parts = [
+        *(f"{value:.6f}" for value in data["bbox"].extent),
+        str(data["resolution"]),
+        str(data["compound"].pk),
+        data["concentration_unit"],
+        data["start_date"].isoformat(),
+        data["end_date"].isoformat(),
+        str(data.get("exclude_flagged", True)),
+        bucket,
+        get_table_version(Location),
+    ]
+    return f"air_quality:idw:{hashlib.sha1('|'.join(parts).encode()).hexdigest()}"
+
+
+def get_interpolated_grid(data):
+    """
+    Returns the cached interpolated concentration grid of a bounding box.
+
+    Grid values are None when no station around the box has readings.
+    """
+    config = get_interpolation_config()
+    cache_key = get_interpolation_cache_key(data, config["LIVE_BUCKET_SECONDS"])
+    grid = cache.get(cache_key)
+    if grid is not None:
+        return grid
+
+    extent = data["bbox"].extent
+    height, width = get_grid_shape(extent, data["resolution"])
+    lons, lats, means = get_station_means(data, margin=config["SEARCH_MARGIN"])
+
+    values = None
+    if len(means):
+        values = np.round(
+            interpolate_idw(
+                lons,
+                lats,
+                means,
+                extent=extent,
+                shape=(height, width),
+                power=config["POWER"],
+                neighbors=config["NEIGHBORS"],
+            ),
+            4,
+        )
+
+    grid = {
+        "bbox": list(extent),
+        "width": width,
+        "height": height,
+        "stations": len(means),
+        "min": float(values.min()) if values is not None else None,
+        "max": float(values.max()) if values is not None else None,
+        "values": values,
+    }
+    cache.set(cache_key, grid, config["CACHE_TIMEOUT"])
+    return grid
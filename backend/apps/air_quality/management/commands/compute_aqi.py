@@ -0,0 +1,82 @@
+import time
+from datetime import datetime, timedelta
+
+from apps.air_quality.aqi import compute_location_aqi, get_aqi_config
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    """
+    Computes the hourly air quality index of every location.
+
+    Stored values are only refreshed by this command, so it must run on a
+    schedule: from cron, or as a long-running process with --interval.
+    """
+
+    help = "Computes and caches location AQI values for recent hours."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hour",
+            default=None,
+            help="ISO 8601 hour to compute; defaults to the current hour.",
+        )
+        parser.add_argument(
+            "--hours",
+            type=int,
+            default=1,
+            help="Number of hours to compute, ending with --hour.",
+        )
+        parser.add_argument(
+            "--scale",
+            action="append",
+            default=None,
+            help="Scale to compute; repeatable, defaults to the configured scale.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=None,
+            help="Recompute the latest --hours every given number of seconds.",
+        )
+
+    def handle(self, *args, **options):
+        config = get_aqi_config()
+        scales = options["scale"] or [config["SCALE"]]
+        unknown = set(scales) - set(config["SCALES"])
+        if unknown:
+            raise CommandError(f"Unknown AQI scales: {', '.join(sorted(unknown))}.")
+
+        if options["interval"] is not None and options["hour"]:
+            raise CommandError("--hour cannot be combined with --interval.")
+
+        hour = timezone.now()
+        if options["hour"]:
+            try:
+                hour = datetime.fromisoformat(options["hour"])
+            except ValueError:
+                raise CommandError("--hour must be an ISO 8601 datetime.")
+            if timezone.is_naive(hour):
+                hour = timezone.make_aware(hour)
+
+        while True:
+            self.compute(hour, scales, options["hours"])
+            if options["interval"] is None:
+                return
+            time.sleep(options["interval"])
+            hour = timezone.now()
+
+    def compute(self, hour, scales, hours):
+        """
+        Computes the AQI of each scale for the hours ending with the given one.
+        """
+        for scale in scales:
+            for offset in range(hours - 1, -1, -1):
+                computed = compute_location_aqi(
+                    hour - timedelta(hours=offset), scale=scale
+                )
+                self.stdout.write(
+                    f"Computed {scale} AQI of {len(computed)} locations for "
+                    f"{(hour - timedelta(hours=offset)):%Y-%m-%d %H}:00."
+                )
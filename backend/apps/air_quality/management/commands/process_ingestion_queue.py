@@ -0,0 +1,43 @@
+from apps.air_quality.ingestion import run_worker
+from apps.air_quality.models import QueuedReading
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    """
+    Runs the worker writing queued readings in batches.
+    """
+
+    help = "Drains the reading ingestion queue in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--poll-interval", type=float, default=1.0)
+        parser.add_argument(
+            "--until-empty",
+            action="store_true",
+            help="Exit once no pending entry is left.",
+        )
+        parser.add_argument(
+            "--requeue-dead",
+            action="store_true",
+            help="Move dead letters back to the pending queue before draining.",
+        )
+
+    def handle(self, *args, **options):
+        if options["requeue_dead"]:
+            requeued = QueuedReading.objects.filter(status=QueuedReading.DEAD).update(
+                status=QueuedReading.PENDING, attempts=0, available_at=timezone.now()
+            )
+            self.stdout.write(f"Requeued {requeued} dead letters.")
+
+        totals = run_worker(
+            batch_size=options["batch_size"],
+            poll_interval=options["poll_interval"],
+            until_empty=options["until_empty"],
+        )
+        self.stdout.write(
+            f"Stored {totals.stored} readings, {totals.retried} retried, "
+            f"{totals.dead} dead-lettered."
+        )
@@ -0,0 +1,17 @@
+from apps.air_quality.neighbors import get_neighbors_config, refresh_location_neighbors
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the location neighbor table.
+    """
+
+    help = "Recomputes the distances between every pair of nearby locations."
+
+    def handle(self, *args, **options):
+        pairs = refresh_location_neighbors()
+        self.stdout.write(
+            f"Stored {pairs} neighbor pairs within "
+            f"{get_neighbors_config()['MAX_RADIUS_KM']} km."
+        )
@@ -0,0 +1,81 @@
+# Generated by Django 5.1.5 on 2026-10-19 10:04
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_quality", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueuedReading",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("entered_concentration_value", models.FloatField()),
+                (
+                    "entered_concentration_unit",
+                    models.CharField(
+                        choices=[
+                            ("ug_m3", "Micrograms per cubic meter"),
+                            ("mg_m3", "Milligrams per cubic meter"),
+                            ("ppm", "Parts per million"),
+                            ("ppb", "Parts per billion"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "Pending"), ("dead", "Dead letter")],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+                ("enqueued_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "available_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "compound",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="queued_readings",
+                        to="air_quality.compound",
+                    ),
+                ),
+                (
+                    "location",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="queued_readings",
+                        to="air_quality.location",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["status", "available_at", "id"],
+                        name="queued_reading_poll_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.5 on 2026-10-19 13:41
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_quality", "0002_queuedreading"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="location",
+            name="tag_ids",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.BigIntegerField(),
+                blank=True,
+                default=list,
+                editable=False,
+                help_text="Denormalized ids of the location tags, kept in sync with tags",
+                size=None,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="location",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["tag_ids"], name="location_tag_ids_gin"
+            ),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE air_quality_location AS location
+                SET tag_ids = ARRAY(
+                    SELECT location_tags.tag_id
+                    FROM air_quality_location_tags AS location_tags
+                    WHERE location_tags.location_id = location.id
+                    ORDER BY location_tags.tag_id
+                )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
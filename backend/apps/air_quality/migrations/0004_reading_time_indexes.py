@@ -0,0 +1,31 @@
+# Generated by Django 5.1.5 on 2026-10-19 11:02
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("air_quality", "0003_location_tag_ids"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="aircompoundreading",
+            index=models.Index(fields=["timestamp"], name="reading_timestamp_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="aircompoundreading",
+            index=models.Index(
+                fields=["compound", "timestamp"], name="reading_compound_time_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="aircompoundreading",
+            index=models.Index(
+                fields=["location", "timestamp"], name="reading_location_time_idx"
+            ),
+        ),
+    ]
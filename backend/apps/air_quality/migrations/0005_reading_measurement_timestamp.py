@@ -0,0 +1,60 @@
+# Generated by Django 5.1.5 on 2026-10-19 11:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+DELETE_DUPLICATES_SQL = """
+DELETE FROM air_quality_aircompoundreading AS duplicate
+USING air_quality_aircompoundreading AS newer
+WHERE duplicate.location_id = newer.location_id
+  AND duplicate.compound_id = newer.compound_id
+  AND duplicate.timestamp = newer.timestamp
+  AND duplicate.id < newer.id
+"""
+
+
+def delete_duplicate_readings(apps, schema_editor):
+    """
+    Deletes readings repeating a measurement, keeping the last stored one of
+    each (location, compound, timestamp) as upserts will from now on, and
+    reports how many were deleted.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(DELETE_DUPLICATES_SQL)
+        deleted = cursor.rowcount
+    if deleted:
+        print(f"\n  Deleted {deleted} duplicate readings, keeping the last stored.")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_quality", "0004_reading_time_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="aircompoundreading",
+            name="timestamp",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                help_text="Time at which the reading was measured",
+            ),
+        ),
+        migrations.AddField(
+            model_name="queuedreading",
+            name="timestamp",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(
+            delete_duplicate_readings, reverse_code=migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name="aircompoundreading",
+            constraint=models.UniqueConstraint(
+                fields=("location", "compound", "timestamp"),
+                name="unique_reading_measurement",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.5 on 2026-10-19 12:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_quality", "0005_reading_measurement_timestamp"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="aircompoundreading",
+            name="is_flagged",
+            field=models.BooleanField(
+                default=False,
+                help_text="Whether the reading failed ingestion validation",
+            ),
+        ),
+        migrations.AddField(
+            model_name="aircompoundreading",
+            name="flag_reason",
+            field=models.CharField(blank=True, max_length=32),
+        ),
+        migrations.AlterField(
+            model_name="queuedreading",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("dead", "Dead letter"),
+                    ("quarantined", "Quarantined"),
+                ],
+                default="pending",
+                max_length=12,
+            ),
+        ),
+    ]
@@ -0,0 +1,160 @@
+# Generated by Django 5.1.5 on 2026-10-19 12:50
+
+import django.contrib.gis.db.models.fields
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_quality", "0006_reading_validation_flags"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AlertRule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                (
+                    "threshold",
+                    models.FloatField(
+                        validators=[django.core.validators.MinValueValidator(0)]
+                    ),
+                ),
+                (
+                    "unit",
+                    models.CharField(
+                        choices=[
+                            ("ug_m3", "Micrograms per cubic meter"),
+                            ("mg_m3", "Milligrams per cubic meter"),
+                            ("ppm", "Parts per million"),
+                            ("ppb", "Parts per billion"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "center",
+                    django.contrib.gis.db.models.fields.PointField(
+                        blank=True, geography=True, null=True, srid=4326
+                    ),
+                ),
+                (
+                    "radius_km",
+                    models.FloatField(
+                        blank=True,
+                        null=True,
+                        validators=[django.core.validators.MinValueValidator(0)],
+                    ),
+                ),
+                (
+                    "window_minutes",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text=(
+                            "Rolling mean window; 0 compares each reading to the "
+                            "threshold"
+                        ),
+                    ),
+                ),
+                ("cooldown_minutes", models.PositiveIntegerField(default=60)),
+                ("is_active", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "compound",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="alert_rules",
+                        to="air_quality.compound",
+                    ),
+                ),
+                (
+                    "location",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="alert_rules",
+                        to="air_quality.location",
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="alert_rules",
+                        to="air_quality.tag",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="Alert",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "value",
+                    models.FloatField(
+                        help_text="Reading or rolling mean in the rule unit"
+                    ),
+                ),
+                ("threshold", models.FloatField()),
+                (
+                    "unit",
+                    models.CharField(
+                        choices=[
+                            ("ug_m3", "Micrograms per cubic meter"),
+                            ("mg_m3", "Milligrams per cubic meter"),
+                            ("ppm", "Parts per million"),
+                            ("ppb", "Parts per billion"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("measured_at", models.DateTimeField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "location",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="alerts",
+                        to="air_quality.location",
+                    ),
+                ),
+                (
+                    "rule",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="alerts",
+                        to="air_quality.alertrule",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["-created_at"], name="alert_created_idx")
+                ],
+            },
+        ),
+    ]
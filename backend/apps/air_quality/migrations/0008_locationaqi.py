@@ -0,0 +1,60 @@
+# Generated by Django 5.1.5 on 2026-10-19 13:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_quality", "0007_alertrule_alert"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LocationAQI",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("scale", models.CharField(max_length=10)),
+                ("hour", models.DateTimeField()),
+                ("aqi", models.PositiveIntegerField()),
+                ("category", models.CharField(max_length=50)),
+                ("computed_at", models.DateTimeField(auto_now=True)),
+                (
+                    "dominant_compound",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="aqi_values",
+                        to="air_quality.compound",
+                    ),
+                ),
+                (
+                    "location",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="aqi_values",
+                        to="air_quality.location",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["scale", "hour"], name="location_aqi_hour_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("location", "scale", "hour"),
+                        name="unique_location_aqi",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.1.5 on 2026-10-19 14:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_neighbors(apps, schema_editor):
+    """
+    Computes the neighbor pairs of existing locations.
+    """
+    max_radius_km = getattr(settings, "AIR_QUALITY_LOCATION_NEIGHBORS", {}).get(
+        "MAX_RADIUS_KM", 100
+    )
+    schema_editor.execute(
+        """
+        INSERT INTO air_quality_locationneighbor (location_id, neighbor_id, distance_km)
+        SELECT
+            origin.id,
+            neighbor.id,
+            ST_Distance(origin.coordinates, neighbor.coordinates) / 1000
+        FROM air_quality_location AS origin
+        JOIN air_quality_location AS neighbor
+            ON neighbor.id <> origin.id
+            AND ST_DWithin(origin.coordinates, neighbor.coordinates, %s)
+        """,
+        params=[max_radius_km * 1000],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_quality", "0008_locationaqi"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LocationNeighbor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("distance_km", models.FloatField()),
+                (
+                    "location",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="neighbor_links",
+                        to="air_quality.location",
+                    ),
+                ),
+                (
+                    "neighbor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="air_quality.location",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["location", "distance_km"],
+                        name="location_neighbor_dist_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("location", "neighbor"),
+                        name="unique_location_neighbor",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_neighbors, migrations.RunPython.noop),
+    ]
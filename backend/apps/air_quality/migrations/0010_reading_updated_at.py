@@ -0,0 +1,28 @@
+# Generated by Django 5.1.5 on 2026-10-19 16:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_quality", "0009_locationneighbor"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="aircompoundreading",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+                help_text="Time at which the reading was last written",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="aircompoundreading",
+            index=models.Index(fields=["updated_at"], name="reading_updated_idx"),
+        ),
+    ]
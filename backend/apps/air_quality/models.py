@@ -1,6 +1,11 @@
 from django.contrib.gis.db import models as gis_models
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models import OuterRef
+from django.utils import timezone
 
 
 class Tag(models.Model):
@@ -28,10 +33,30 @@ class Location(gis_models.Model):
     )
     coordinates = gis_models.PointField(geography=True, srid=4326)
     tags = models.ManyToManyField(to=Tag, related_name="anemometers", blank=True)
+    tag_ids = ArrayField(
+        models.BigIntegerField(),
+        default=list,
+        blank=True,
+        editable=False,
+        help_text="Denormalized ids of the location tags, kept in sync with tags",
+    )
+
+    class Meta:
+        indexes = [GinIndex(fields=["tag_ids"], name="location_tag_ids_gin")]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def sync_tag_ids(cls, location_ids):
+        """
+        Recomputes the denormalized tag ids of the given locations in one query.
+        """
+        tag_ids = cls.tags.through.objects.filter(location_id=OuterRef("pk"))
+        cls.objects.filter(pk__in=location_ids).update(
+            tag_ids=ArraySubquery(tag_ids.order_by("tag_id").values("tag_id"))
+        )
+
 
 class Compound(models.Model):
     """
@@ -47,6 +72,18 @@ class Compound(models.Model):
         return self.symbol
 
 
+class AirCompoundReadingQuerySet(models.QuerySet):
+    """
+    QuerySet for AirCompoundReading objects.
+    """
+
+    def with_related(self):
+        """
+        Joins the compound and location needed to serialize readings.
+        """
+        return self.select_related("compound", "location")
+
+
 class AirCompoundReading(models.Model):
     """
     Model for air compound concentration readings.
@@ -73,4 +110,206 @@ class AirCompoundReading(models.Model):
         choices=CONCENTRATION_UNITS,
         help_text="Concentration of the entered concentration value",
     )
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(
+        default=timezone.now, help_text="Time at which the reading was measured"
+    )
+    is_flagged = models.BooleanField(
+        default=False, help_text="Whether the reading failed ingestion validation"
+    )
+    flag_reason = models.CharField(max_length=32, blank=True)
+    updated_at = models.DateTimeField(
+        auto_now=True, help_text="Time at which the reading was last written"
+    )
+
+    objects = AirCompoundReadingQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["location", "compound", "timestamp"],
+                name="unique_reading_measurement",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["timestamp"], name="reading_timestamp_idx"),
+            models.Index(
+                fields=["compound", "timestamp"], name="reading_compound_time_idx"
+            ),
+            models.Index(
+                fields=["location", "timestamp"], name="reading_location_time_idx"
+            ),
+            models.Index(fields=["updated_at"], name="reading_updated_idx"),
+        ]
+
+
+class QueuedReading(models.Model):
+    """
+    Model for validated readings waiting to be written by the ingestion worker.
+    """
+
+    PENDING = "pending"
+    DEAD = "dead"
+    QUARANTINED = "quarantined"
+    STATUSES = (
+        (PENDING, "Pending"),
+        (DEAD, "Dead letter"),
+        (QUARANTINED, "Quarantined"),
+    )
+    location = models.ForeignKey(
+        to=Location, on_delete=models.CASCADE, related_name="queued_readings"
+    )
+    compound = models.ForeignKey(
+        to=Compound, on_delete=models.CASCADE, related_name="queued_readings"
+    )
+    entered_concentration_value = models.FloatField()
+    entered_concentration_unit = models.CharField(
+        max_length=10, choices=AirCompoundReading.CONCENTRATION_UNITS
+    )
+    status = models.CharField(max_length=12, choices=STATUSES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    enqueued_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "available_at", "id"], name="queued_reading_poll_idx"
+            ),
+        ]
+
+    def to_reading(self) -> AirCompoundReading:
+        """
+        Returns the unsaved reading described by this queue entry.
+        """
+        return AirCompoundReading(
+            location_id=self.location_id,
+            compound_id=self.compound_id,
+            entered_concentration_value=self.entered_concentration_value,
+            entered_concentration_unit=self.entered_concentration_unit,
+            timestamp=self.timestamp,
+        )
+
+
+class AlertRule(gis_models.Model):
+    """
+    Model for concentration thresholds raising alerts when exceeded.
+
+    Rules are scoped to a location, a tag, a radius around a point, or any
+    combination of them; a rule without scope applies to every location.
+    """
+
+    name = models.CharField(max_length=100)
+    compound = models.ForeignKey(
+        to=Compound, on_delete=models.CASCADE, related_name="alert_rules"
+    )
+    threshold = models.FloatField(validators=[MinValueValidator(0)])
+    unit = models.CharField(
+        max_length=10, choices=AirCompoundReading.CONCENTRATION_UNITS
+    )
+    location = models.ForeignKey(
+        to=Location,
+        on_delete=models.CASCADE,
+        related_name="alert_rules",
+        null=True,
+        blank=True,
+    )
+    tag = models.ForeignKey(
+        to=Tag,
+        on_delete=models.CASCADE,
+        related_name="alert_rules",
+        null=True,
+        blank=True,
+    )
+    center = gis_models.PointField(geography=True, srid=4326, null=True, blank=True)
+    radius_km = models.FloatField(
+        null=True, blank=True, validators=[MinValueValidator(0)]
+    )
+    window_minutes = models.PositiveIntegerField(
+        default=0,
+        help_text="Rolling mean window; 0 compares each reading to the threshold",
+    )
+    cooldown_minutes = models.PositiveIntegerField(default=60)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+class Alert(models.Model):
+    """
+    Model for threshold exceedances detected on ingested readings.
+    """
+
+    rule = models.ForeignKey(
+        to=AlertRule, on_delete=models.CASCADE, related_name="alerts"
+    )
+    location = models.ForeignKey(
+        to=Location, on_delete=models.CASCADE, related_name="alerts"
+    )
+    value = models.FloatField(help_text="Reading or rolling mean in the rule unit")
+    threshold = models.FloatField()
+    unit = models.CharField(
+        max_length=10, choices=AirCompoundReading.CONCENTRATION_UNITS
+    )
+    measured_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["-created_at"], name="alert_created_idx")]
+
+
+class LocationAQI(models.Model):
+    """
+    Model caching the air quality index of a location for one hour.
+    """
+
+    location = models.ForeignKey(
+        to=Location, on_delete=models.CASCADE, related_name="aqi_values"
+    )
+    scale = models.CharField(max_length=10)
+    hour = models.DateTimeField()
+    aqi = models.PositiveIntegerField()
+    category = models.CharField(max_length=50)
+    dominant_compound = models.ForeignKey(
+        to=Compound, on_delete=models.CASCADE, related_name="aqi_values"
+    )
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["location", "scale", "hour"], name="unique_location_aqi"
+            )
+        ]
+        indexes = [models.Index(fields=["scale", "hour"], name="location_aqi_hour_idx")]
+
+
+class LocationNeighbor(models.Model):
+    """
+    Model for the precomputed geodesic distance between two nearby locations.
+
+    Pairs are stored in both directions, up to the configured maximum radius.
+    """
+
+    location = models.ForeignKey(
+        to=Location, on_delete=models.CASCADE, related_name="neighbor_links"
+    )
+    neighbor = models.ForeignKey(
+        to=Location, on_delete=models.CASCADE, related_name="+"
+    )
+    distance_km = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["location", "neighbor"], name="unique_location_neighbor"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["location", "distance_km"], name="location_neighbor_dist_idx"
+            )
+        ]
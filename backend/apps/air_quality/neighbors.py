@@ -0,0 +1,91 @@
+from apps.air_quality.models import Location, LocationNeighbor
+from django.conf import settings
+from django.contrib.gis.measure import D
+from django.db import connection, transaction
+from django.db.models import Q
+
+DEFAULT_LOCATION_NEIGHBORS = {
+    "MAX_RADIUS_KM": 100,
+}
+"""
+Default neighbor table configuration, overridden by
+settings.AIR_QUALITY_LOCATION_NEIGHBORS.
+"""
+
+INSERT_NEIGHBORS_SQL = """
+INSERT INTO {neighbor_table} (location_id, neighbor_id, distance_km)
+SELECT
+    origin.id,
+    neighbor.id,
+    ST_Distance(origin.coordinates, neighbor.coordinates) / 1000
+FROM {location_table} AS origin
+JOIN {location_table} AS neighbor
+    ON neighbor.id <> origin.id
+    AND ST_DWithin(origin.coordinates, neighbor.coordinates, %s)
+{where}
+ON CONFLICT (location_id, neighbor_id)
+    DO UPDATE SET distance_km = EXCLUDED.distance_km
+"""
+"""
+Inserts the pairs of locations within a distance in meters, measured on the
+spheroid like geography dwithin lookups. Pairs inserted meanwhile by a
+concurrent refresh of a nearby location are overwritten.
+"""
+
+
+def get_neighbors_config():
+    """
+    Returns the neighbor table configuration merged with defaults.
+    """
+    return {
+        **DEFAULT_LOCATION_NEIGHBORS,
+        **getattr(settings, "AIR_QUALITY_LOCATION_NEIGHBORS", {}),
+    }
+
+
+def refresh_location_neighbors(location_ids=None):
+    """
+    Recomputes the neighbor pairs involving the given locations, or every
+    pair when no ids are given, in one statement.
+    """
+    where = ""
+    params = [get_neighbors_config()["MAX_RADIUS_KM"] * 1000]
+    pairs = LocationNeighbor.objects.all()
+    if location_ids is not None:
+        location_ids = list(location_ids)
+        where = "WHERE origin.id = ANY(%s) OR neighbor.id = ANY(%s)"
+        params += [location_ids, location_ids]
+        pairs = pairs.filter(
+            Q(location_id__in=location_ids) | Q(neighbor_id__in=location_ids)
+        )
+    sql = INSERT_NEIGHBORS_SQL.format(
+        neighbor_table=connection.ops.quote_name(LocationNeighbor._meta.db_table),
+        location_table=connection.ops.quote_name(Location._meta.db_table),
+        where=where,
+    )
+
+    with transaction.atomic():
+        pairs.delete()
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+
+def get_nearby_filter(location: Location, radius_km: float, field: str = "pk") -> Q:
+    """
+    Returns a filter on `field` matching a location and the locations within a
+    distance of it.
+
+    Distances up to MAX_RADIUS_KM are an indexed lookup in the neighbor table;
+    larger ones fall back to a geography dwithin scan.
+    """
+    if radius_km > get_neighbors_config()["MAX_RADIUS_KM"]:
+        nearby = Location.objects.filter(
+            coordinates__dwithin=(location.coordinates, D(km=radius_km))
+        ).values("pk")
+        return Q(**{f"{field}__in": nearby})
+
+    nearby = LocationNeighbor.objects.filter(
+        location=location, distance_km__lte=radius_km
+    ).values("neighbor_id")
+    return Q(**{f"{field}__in": nearby}) | Q(**{field: location.pk})
@@ -0,0 +1,138 @@
+import json
+
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
+
+EXACT_COUNT = "exact"
+NO_COUNT = "none"
+ESTIMATED_COUNT = "estimate"
+
+
+def estimate_count(queryset) -> int:
+    """
+    Returns the query planner estimate of the number of rows of a queryset.
+
+    An unfiltered table is estimated from ``pg_class.reltuples``, anything else
+    from the row estimate of its ``EXPLAIN`` plan.
+    """
+    queryset = queryset.order_by()
+    if not queryset.query.where:
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            [reltuples] = cursor.fetchone()
+        # Tables never vacuumed nor analyzed report -1.
+        if reltuples >= 0:
+            return int(reltuples)
+
+    plan = json.loads(queryset.explain(format="json"))
+    if isinstance(plan, list):
+        plan = plan[0]
+    return int(plan["Plan"]["Plan Rows"])
+
+
+class UncountedPage(Page):
+    """
+    Page knowing whether a next page exists without a count of all rows.
+    """
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class UncountedPaginator(Paginator):
+    """
+    Paginator fetching one row past the page instead of counting all rows.
+    """
+
+    count = None
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+
+        has_next = len(rows) > self.per_page
+        self.known_pages = number + has_next
+        return UncountedPage(rows[: self.per_page], number, self, has_next)
+
+    @property
+    def num_pages(self):
+        """
+        Returns the pages known to exist up to the page after the last fetched.
+        """
+        return getattr(self, "known_pages", 1)
+
+
+class EstimatedCountPaginator(UncountedPaginator):
+    """
+    Uncounted paginator reporting the planner estimate as its count.
+    """
+
+    @cached_property
+    def count(self):
+        return estimate_count(self.object_list)
+
+
+class CountModePagination(PageNumberPagination):
+    """
+    Page number pagination with a per-request ``count`` mode.
+
+    ``exact`` counts the rows, ``none`` skips the count and ``estimate`` reports
+    the planner estimate. Without an exact count, ``next`` is known from one
+    extra row fetched past the page.
+    """
+
+    count_query_param = "count"
+    count_paginator_classes = {
+        EXACT_COUNT: Paginator,
+        NO_COUNT: UncountedPaginator,
+        ESTIMATED_COUNT: EstimatedCountPaginator,
+    }
+
+    def get_count_mode(self, request):
+        """
+        Returns the count mode requested by the client.
+        """
+        mode = request.query_params.get(self.count_query_param) or EXACT_COUNT
+        if mode not in self.count_paginator_classes:
+            raise ValidationError(
+                {
+                    self.count_query_param: (
+                        f"Count must be one of: "
+                        f"{', '.join(self.count_paginator_classes)}."
+                    )
+                }
+            )
+        return mode
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.django_paginator_class = self.count_paginator_classes[
+            self.get_count_mode(request)
+        ]
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_page_number(self, request, paginator):
+        if isinstance(paginator, UncountedPaginator):
+            return request.query_params.get(self.page_query_param) or 1
+        return super().get_page_number(request, paginator)
@@ -0,0 +1,508 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from uuid import uuid4
+
+import numpy as np
+from apps.air_quality.conditional import get_table_version
+from apps.air_quality.conversions import CONVERSION_FACTORS
+from apps.air_quality.models import AirCompoundReading, Compound, Location
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+DEFAULT_RECENT_INDEX = {
+    "ENABLED": False,
+    "HOURS": 48,
+    "REFRESH_SECONDS": 5,
+    "REFRESH_LOOKBACK_SECONDS": 60,
+}
+"""
+Default recent readings index configuration, overridden by
+settings.AIR_QUALITY_RECENT_INDEX. REFRESH_LOOKBACK_SECONDS is how long
+before a refresh rows are pulled again, longer than any ingesting transaction
+and any clock skew between servers.
+"""
+
+UNITS = [unit for unit, _ in AirCompoundReading.CONCENTRATION_UNITS]
+UNIT_CODES = {unit: code for code, unit in enumerate(UNITS)}
+UNIT_FACTORS, MOLECULAR_WEIGHT_EXPONENTS = np.array(
+    [
+        [CONVERSION_FACTORS[(from_unit, to_unit)] for to_unit in UNITS]
+        for from_unit in UNITS
+    ]
+).transpose(2, 0, 1)
+IS_VOLUME_RATIO = np.array([unit in ("ppm", "ppb") for unit in UNITS])
+
+EARTH_RADIUS_KM = 6371.0088
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+GENERATION_CACHE_KEY = "air_quality:recent_index:generation"
+
+READING_COLUMNS = (
+    "id",
+    "location_id",
+    "compound_id",
+    "entered_concentration_value",
+    "entered_concentration_unit",
+    "timestamp",
+    "is_flagged",
+)
+
+
+def get_recent_index_config():
+    """
+    Returns the recent readings index configuration merged with defaults.
+    """
+    return {
+        **DEFAULT_RECENT_INDEX,
+        **getattr(settings, "AIR_QUALITY_RECENT_INDEX", {}),
+    }
+
+
+def get_recent_index_generation() -> str:
+    """
+    Returns the token of the current generation of recent readings.
+
+    Tokens are random, so a cold or evicted cache starts a new generation and
+    never leaves a stale index in use.
+    """
+    generation = cache.get(GENERATION_CACHE_KEY)
+    if generation is None:
+        cache.add(GENERATION_CACHE_KEY, uuid4().hex, None)
+        generation = cache.get(GENERATION_CACHE_KEY)
+    return generation
+
+
+def invalidate_recent_index():
+    """
+    Makes the recent readings index of every process reload on next use.
+
+    Indexes only pull new readings, so changes to stored readings must be
+    published this way.
+    """
+    cache.set(GENERATION_CACHE_KEY, uuid4().hex, None)
+
+
+def to_microseconds(value: datetime) -> int:
+    """
+    Returns an aware datetime as microseconds since the epoch.
+    """
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def from_microseconds(value: int) -> datetime:
+    """
+    Returns the aware datetime of microseconds since the epoch.
+    """
+    return EPOCH + timedelta(microseconds=value)
+
+
+@dataclass
+class ReadingColumns:
+    """
+    Column arrays of the readings held by the index.
+    """
+
+    location_ids: np.ndarray
+    compound_ids: np.ndarray
+    values: np.ndarray
+    units: np.ndarray
+    timestamps: np.ndarray
+
+    def __len__(self):
+        return len(self.values)
+
+    def select(self, mask):
+        return ReadingColumns(
+            location_ids=self.location_ids[mask],
+            compound_ids=self.compound_ids[mask],
+            values=self.values[mask],
+            units=self.units[mask],
+            timestamps=self.timestamps[mask],
+        )
+
+
+class ReferenceTable:
+    """
+    Attributes of a small model table cached as arrays indexed by primary key,
+    reloaded when the table version changes.
+    """
+
+    model = None
+
+    def __init__(self):
+        self.version = None
+        self.names = {}
+
+    def get(self):
+        version = get_table_version(self.model)
+        if version != self.version:
+            self.load()
+            self.version = version
+        return self
+
+    def load(self):
+        raise NotImplementedError
+
+
+class LocationTable(ReferenceTable):
+    model = Location
+
+    def load(self):
+        rows = list(Location.objects.values_list("pk", "name", "coordinates"))
+        size = max((pk for pk, _, _ in rows), default=0) + 1
+        longitudes = np.full(size, np.nan)
+        latitudes = np.full(size, np.nan)
+        for pk, _, coordinates in rows:
+            longitudes[pk], latitudes[pk] = coordinates.x, coordinates.y
+        self.longitudes, self.latitudes = longitudes, latitudes
+        self.names = {pk: name for pk, name, _ in rows}
+
+
+class CompoundTable(ReferenceTable):
+    model = Compound
+
+    def load(self):
+        rows = list(
+            Compound.objects.values_list(
+                "pk", "symbol", "molecular_weight", "is_gaseous"
+            )
+        )
+        size = max((pk for pk, _, _, _ in rows), default=0) + 1
+        molecular_weights = np.full(size, np.nan)
+        is_gaseous = np.zeros(size, dtype=bool)
+        for pk, _, molecular_weight, gaseous in rows:
+            molecular_weights[pk] = (
+                molecular_weight if molecular_weight is not None else np.nan
+            )
+            is_gaseous[pk] = gaseous
+        self.molecular_weights, self.is_gaseous = molecular_weights, is_gaseous
+        self.names = {pk: symbol for pk, symbol, _, _ in rows}
+
+
+class RecentReadingsIndex:
+    """
+    In-process columnar index of the unflagged readings of the last hours.
+
+    Readings are appended from the ingest path of this process and rows
+    written by other processes are pulled by write time every REFRESH_SECONDS,
+    so a reading is visible to every worker within that delay. Ids and write
+    times are assigned before commit, so rows committing out of order would be
+    skipped by a strict cursor; each refresh pulls again the rows written
+    within REFRESH_LOOKBACK_SECONDS of the previous one, and pulled copies
+    replace the ones held. Upserted, corrected and deleted readings also start
+    a new generation, which every process reloads.
+    Values are kept as entered and converted at query time with the same rules
+    as the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.locations = LocationTable()
+        self.compounds = CompoundTable()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            self.since = None
+            self.generation = None
+
+    def _reset(self):
+        self._ids = np.empty(0, dtype=np.int64)
+        self._columns = ReadingColumns(
+            location_ids=np.empty(0, dtype=np.int64),
+            compound_ids=np.empty(0, dtype=np.int64),
+            values=np.empty(0, dtype=float),
+            units=np.empty(0, dtype=np.int8),
+            timestamps=np.empty(0, dtype=np.int64),
+        )
+        self.watermark = None
+        self._refreshed_at = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self.since is not None
+
+    def covers(self, start) -> bool:
+        """
+        Returns whether every reading from start on is held by the index.
+        """
+        return self.loaded and start >= self.since
+
+    def warm_up(self, hours: int, generation=None):
+        """
+        Loads the readings of the last hours of a generation from the database.
+        """
+        with self._refresh_lock:
+            started = timezone.now()
+            since = started - timedelta(hours=hours)
+            rows = list(
+                AirCompoundReading.objects.filter(
+                    timestamp__gte=since, is_flagged=False
+                )
+                .values_list(*READING_COLUMNS)
+                .iterator(chunk_size=10_000)
+            )
+            with self._lock:
+                self._reset()
+                self._append(rows)
+                self.watermark = started
+                self.since = since
+                self.generation = generation
+                self._refreshed_at = time.monotonic()
+
+    def refresh(self, hours: int, refresh_seconds: float, lookback_seconds: float):
+        """
+        Pulls readings written since shortly before the last refresh and
+        evicts old ones; pulled readings that are now flagged are removed.
+
+        Refreshes run one at a time, so concurrent requests wait for the
+        running one instead of pulling the same rows again.
+        """
+        with self._refresh_lock:
+            if time.monotonic() - self._refreshed_at < refresh_seconds:
+                return
+            started = timezone.now()
+            since = started - timedelta(hours=hours)
+            written_since = self.watermark - timedelta(seconds=lookback_seconds)
+            rows = list(
+                AirCompoundReading.objects.filter(
+                    updated_at__gte=written_since, timestamp__gte=since
+                ).values_list(*READING_COLUMNS)
+            )
+            with self._lock:
+                self._remove([row[0] for row in rows if row[-1]])
+                self._append([row for row in rows if not row[-1]])
+                keep = self._columns.timestamps >= to_microseconds(since)
+                if not keep.all():
+                    self._ids = self._ids[keep]
+                    self._columns = self._columns.select(keep)
+                self.watermark = started
+                self.since = since
+                self._refreshed_at = time.monotonic()
+
+    def add(self, readings):
+        """
+        Adds or replaces stored readings; flagged readings are removed.
+        """
+        if not self.loaded:
+            return
+        with self._lock:
+            self._remove([reading.pk for reading in readings])
+            self._append(
+                [
+                    (
+                        reading.pk,
+                        reading.location_id,
+                        reading.compound_id,
+                        reading.entered_concentration_value,
+                        reading.entered_concentration_unit,
+                        reading.timestamp,
+                        reading.is_flagged,
+                    )
+                    for reading in readings
+                    if not reading.is_flagged and reading.timestamp >= self.since
+                ]
+            )
+
+    def discard(self, ids):
+        """
+        Removes readings by id.
+        """
+        if not self.loaded:
+            return
+        with self._lock:
+            self._remove(ids)
+
+    def columns(self) -> ReadingColumns:
+        """
+        Returns the current columns; arrays are replaced, never mutated, so the
+        returned snapshot stays consistent.
+        """
+        with self._lock:
+            return self._columns
+
+    def _append(self, rows):
+        if not rows:
+            return
+        # Rows already held, or repeated within the batch, replace older copies.
+        rows = list({row[0]: row for row in rows}.values())
+        self._remove([row[0] for row in rows])
+        ids, location_ids, compound_ids, values, units, timestamps, _ = zip(*rows)
+        self._ids = np.concatenate([self._ids, np.array(ids, dtype=np.int64)])
+        self._columns = ReadingColumns(
+            location_ids=np.concatenate([self._columns.location_ids, location_ids]),
+            compound_ids=np.concatenate([self._columns.compound_ids, compound_ids]),
+            values=np.concatenate([self._columns.values, values]),
+            units=np.concatenate(
+                [
+                    self._columns.units,
+                    np.array([UNIT_CODES[unit] for unit in units], dtype=np.int8),
+                ]
+            ),
+            timestamps=np.concatenate(
+                [
+                    self._columns.timestamps,
+                    np.array([to_microseconds(value) for value in timestamps]),
+                ]
+            ),
+        )
+
+    def _remove(self, ids):
+        keep = ~np.isin(self._ids, np.asarray(ids, dtype=np.int64))
+        if not keep.all():
+            self._ids = self._ids[keep]
+            self._columns = self._columns.select(keep)
+
+
+recent_index = RecentReadingsIndex()
+
+
+def get_recent_index(start):
+    """
+    Returns the warm index when it is enabled and holds every reading from
+    start on, or None to query the database.
+    """
+    config = get_recent_index_config()
+    if not config["ENABLED"]:
+        return None
+    generation = get_recent_index_generation()
+    if not recent_index.loaded or recent_index.generation != generation:
+        recent_index.warm_up(config["HOURS"], generation)
+    else:
+        recent_index.refresh(
+            config["HOURS"],
+            config["REFRESH_SECONDS"],
+            config["REFRESH_LOOKBACK_SECONDS"],
+        )
+    return recent_index if recent_index.covers(start) else None
+
+
+def convert_values(index: RecentReadingsIndex, columns: ReadingColumns, target_unit):
+    """
+    Returns column values converted to the target unit, NaN where the
+    database conversion yields no value.
+    """
+    compounds = index.compounds.get()
+    molecular_weights = compounds.molecular_weights[columns.compound_ids]
+    is_gaseous = compounds.is_gaseous[columns.compound_ids]
+
+    target = UNIT_CODES[target_unit]
+    from_volume = IS_VOLUME_RATIO[columns.units]
+    to_volume = IS_VOLUME_RATIO[target]
+
+    factors = (
+        UNIT_FACTORS[columns.units, target]
+        * molecular_weights ** MOLECULAR_WEIGHT_EXPONENTS[columns.units, target]
+    )
+    convertible = (columns.units == target) | ~((from_volume | to_volume) & ~is_gaseous)
+    return np.where(convertible, columns.values * factors, np.nan)
+
+
+def get_location_ids_within(index: RecentReadingsIndex, longitude, latitude, km):
+    """
+    Returns the ids of locations within a great-circle distance of a point.
+    """
+    locations = index.locations.get()
+    lons = np.radians(locations.longitudes)
+    lats = np.radians(locations.latitudes)
+    lon, lat = np.radians(longitude), np.radians(latitude)
+    haversine = (
+        np.sin((lats - lat) / 2) ** 2
+        + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    )
+    distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(haversine, 0, 1)))
+    return np.flatnonzero(distances <= km)
+
+
+def get_radius_stats(index: RecentReadingsIndex, data):
+    """
+    Returns min, max and mean concentrations of a compound within a radius.
+    """
+    columns = index.columns()
+    location_ids = get_location_ids_within(
+        index, data["longitude"], data["latitude"], data["radius"]
+    )
+    selected = columns.select(
+        (columns.compound_ids == data["compound"].pk)
+        & np.isin(columns.location_ids, location_ids)
+        & (columns.timestamps >= to_microseconds(data["start_date"]))
+        & (columns.timestamps <= to_microseconds(data["end_date"]))
+    )
+    values = convert_values(index, selected, data["concentration_unit"])
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {
+            "min_concentration": None,
+            "max_concentration": None,
+            "mean_concentration": None,
+        }
+    return {
+        "min_concentration": round(float(values.min()), 4),
+        "max_concentration": round(float(values.max()), 4),
+        "mean_concentration": round(float(values.mean()), 4),
+    }
+
+
+def get_latest_values(index: RecentReadingsIndex, data, since):
+    """
+    Returns the latest reading of each location and compound since a date.
+    """
+    columns = index.columns()
+    mask = columns.timestamps >= to_microseconds(since)
+    if data.get("compound"):
+        mask &= np.isin(columns.compound_ids, [c.pk for c in data["compound"]])
+    if data.get("location"):
+        mask &= np.isin(columns.location_ids, [loc.pk for loc in data["location"]])
+    selected = columns.select(mask)
+
+    order = np.lexsort(
+        (-selected.timestamps, selected.compound_ids, selected.location_ids)
+    )
+    keys = np.column_stack([selected.location_ids, selected.compound_ids])[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = np.any(keys[1:] != keys[:-1], axis=1)
+    latest = selected.select(order[first])
+
+    values = convert_values(index, latest, data["concentration_unit"])
+    location_names = index.locations.get().names
+    compound_names = index.compounds.get().names
+    return [
+        {
+            "location": location_names[location_id],
+            "compound": compound_names[compound_id],
+            "timestamp": from_microseconds(timestamp),
+            "concentration_value": None if np.isnan(value) else round(value, 4),
+        }
+        for location_id, compound_id, timestamp, value in zip(
+            latest.location_ids.tolist(),
+            latest.compound_ids.tolist(),
+            latest.timestamps.tolist(),
+            values.tolist(),
+        )
+    ]
+
+
+def get_series(index: RecentReadingsIndex, data):
+    """
+    Returns timestamps and values of one location and compound in time order.
+    """
+    columns = index.columns()
+    selected = columns.select(
+        (columns.location_ids == data["location"].pk)
+        & (columns.compound_ids == data["compound"].pk)
+        & (columns.timestamps >= to_microseconds(data["start_date"]))
+        & (columns.timestamps < to_microseconds(data["end_date"]))
+    )
+    selected = selected.select(np.argsort(selected.timestamps, kind="stable"))
+    values = convert_values(index, selected, data["concentration_unit"])
+    return [
+        (from_microseconds(timestamp), None if np.isnan(value) else round(value, 4))
+        for timestamp, value in zip(selected.timestamps.tolist(), values.tolist())
+    ]
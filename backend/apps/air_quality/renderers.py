@@ -0,0 +1,167 @@
+import struct
+import zlib
+
+import numpy as np
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+
+from core.renderers import ORJSONRenderer
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def to_columnar(data, dictionary_encoded_fields=()):
+    """
+    Converts a list of rows, or a paginated payload, into parallel column arrays.
+
+    Values of ``dictionary_encoded_fields`` are replaced by indexes into a
+    per-field list of distinct values. Other payloads are returned unchanged.
+    """
+    if isinstance(data, dict) and isinstance(data.get("results"), list):
+        payload = {key: value for key, value in data.items() if key != "results"}
+        return {**payload, **to_columnar(data["results"], dictionary_encoded_fields)}
+    if not isinstance(data, list):
+        return data
+
+    field_names = list(data[0].keys()) if data else []
+    columns = {name: [row.get(name) for row in data] for name in field_names}
+
+    dictionaries = {}
+    for name in dictionary_encoded_fields:
+        if name not in columns:
+            continue
+        indexes = {}
+        columns[name] = [
+            indexes.setdefault(value, len(indexes)) for value in columns[name]
+        ]
+        dictionaries[name] = list(indexes)
+
+    return {"length": len(data), "columns": columns, "dictionaries": dictionaries}
+
+
+class ColumnarJSONRenderer(ORJSONRenderer):
+    """
+    Renderer serializing reading lists as dictionary-encoded JSON columns.
+    """
+
+    media_type = "application/vnd.airquality.columnar+json"
+    format = "columnar"
+    dictionary_encoded_fields = ("location", "compound", "concentration_unit")
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(
+            to_columnar(data, self.dictionary_encoded_fields),
+            accepted_media_type=accepted_media_type,
+            renderer_context=renderer_context,
+        )
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer serializing responses with MessagePack.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=str)
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Renderer negotiating server-sent event streams; errors are sent as JSON.
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return ORJSONRenderer().render(data)
+
+
+class NDJSONRenderer(EventStreamRenderer):
+    """
+    Renderer negotiating newline-delimited JSON streams; errors are sent as JSON.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+def encode_png(pixels: np.ndarray) -> bytes:
+    """
+    Encodes an 8-bit (height, width, channels) array as a PNG image.
+    """
+    height, width, channels = pixels.shape
+    color_type = {1: 0, 2: 4, 3: 2, 4: 6}[channels]
+    scanlines = np.insert(pixels.reshape(height, width * channels), 0, 0, axis=1)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + kind
+            + data
+            + struct.pack(">I", zlib.crc32(kind + data))
+        )
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(scanlines.astype(np.uint8).tobytes()))
+        + chunk(b"IEND", b"")
+    )
+
+
+class GridPNGRenderer(BaseRenderer):
+    """
+    Renderer drawing interpolated grids as grayscale PNG images scaled between
+    the grid minimum and maximum, sent in X-Value-Min and X-Value-Max headers.
+    Errors are sent as JSON.
+    """
+
+    media_type = "image/png"
+    format = "png"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if not isinstance(data, dict) or "values" not in data:
+            return ORJSONRenderer().render(data)
+
+        values = data["values"]
+        if values is None:
+            return encode_png(np.zeros((data["height"], data["width"], 2)))
+
+        span = (data["max"] - data["min"]) or 1.0
+        levels = np.round(np.nan_to_num((values - data["min"]) / span * 255))
+        alpha = np.where(np.isnan(values), 0, 255)
+
+        response = (renderer_context or {}).get("response")
+        if response is not None:
+            response["X-Value-Min"] = str(data["min"])
+            response["X-Value-Max"] = str(data["max"])
+        return encode_png(np.stack([levels, alpha], axis=-1))
+
+
+READING_RENDERER_CLASSES = [
+    *api_settings.DEFAULT_RENDERER_CLASSES,
+    ColumnarJSONRenderer,
+    *([MessagePackRenderer] if msgpack is not None else []),
+]
+"""
+Renderers negotiated on reading endpoints; MessagePack requires the msgpack package.
+"""
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from itertools import islice
+
+import orjson
+from apps.air_quality.conversions import get_qs_with_converted_concentration
+from apps.air_quality.models import AirCompoundReading, Location
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.models import Avg
+from django.db.models.functions import TruncHour
+
+FETCH_SIZE = 2000
+
+ROLLING_MEAN_SQL = """
+SELECT location.name, rolling.hour, rolling.rolling_mean, rolling.hours
+FROM (
+    SELECT
+        hourly.location_id,
+        hourly.hour,
+        AVG(hourly.mean) OVER window_hours AS rolling_mean,
+        COUNT(hourly.mean) OVER window_hours AS hours
+    FROM ({hourly_sql}) AS hourly
+    WINDOW window_hours AS (
+        PARTITION BY hourly.location_id
+        ORDER BY hourly.hour
+        RANGE BETWEEN %s PRECEDING AND CURRENT ROW
+    )
+) AS rolling
+JOIN {location_table} AS location ON location.id = rolling.location_id
+WHERE rolling.hour >= %s
+ORDER BY location.name, rolling.hour
+"""
+"""
+Rolling mean of hourly means over the preceding hours of each location,
+computed after the hourly aggregation so the window sees the hours preceding
+the requested start.
+"""
+
+
+def get_hourly_means(data, since):
+    """
+    Returns a queryset of hourly mean concentrations per location.
+    """
+    queryset = AirCompoundReading.objects.filter(
+        compound=data["compound"],
+        timestamp__gte=since,
+        timestamp__lt=data["end_date"],
+    )
+    if data.get("location"):
+        queryset = queryset.filter(location__in=data["location"])
+    if data.get("exclude_flagged", True):
+        queryset = queryset.filter(is_flagged=False)
+
+    return (
+        get_qs_with_converted_concentration(
+            queryset=queryset, target_unit=data["concentration_unit"]
+        )
+        .annotate(hour=TruncHour("timestamp"))
+        .values("location_id", "hour")
+        .annotate(mean=Avg("concentration_value"))
+        .order_by()
+    )
+
+
+def iter_rolling_means(data):
+    """
+    Yields rolling means of hourly concentrations streamed from the database.
+
+    Rows are read in chunks from a server-side cursor so memory stays flat
+    regardless of the requested period.
+    """
+    window = timedelta(hours=data["window_hours"] - 1)
+    start = data["start_date"].replace(minute=0, second=0, microsecond=0)
+    hourly = get_hourly_means(data, since=start - window)
+    hourly_sql, hourly_params = hourly.query.sql_with_params()
+
+    sql = ROLLING_MEAN_SQL.format(
+        hourly_sql=hourly_sql,
+        location_table=connections[hourly.db].ops.quote_name(Location._meta.db_table),
+    )
+    with connections[hourly.db].chunked_cursor() as cursor:
+        cursor.execute(sql, (*hourly_params, window, start))
+        while rows := cursor.fetchmany(FETCH_SIZE):
+            for location, hour, rolling_mean, hours in rows:
+                yield {
+                    "location": location,
+                    "hour": hour,
+                    "rolling_mean": (
+                        round(rolling_mean, 4) if rolling_mean is not None else None
+                    ),
+                    "hours": hours,
+                }
+
+
+async def stream_rolling_means(data):
+    """
+    Yields rolling means as newline-delimited JSON chunks.
+
+    Database reads run in the thread-sensitive executor one chunk at a time,
+    so ASGI servers stream the response instead of buffering it.
+    """
+    rows = iter_rolling_means(data)
+    next_chunk = sync_to_async(
+        lambda: list(islice(rows, FETCH_SIZE)), thread_sensitive=True
+    )
+    try:
+        while chunk := await next_chunk():
+            yield b"".join(
+                orjson.dumps(row, option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE)
+                for row in chunk
+            )
+    finally:
+        await sync_to_async(rows.close, thread_sensitive=True)()
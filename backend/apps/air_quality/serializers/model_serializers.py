@@ -1,8 +1,26 @@
-from apps.air_quality.models import AirCompoundReading, Compound, Location, Tag
+from datetime import timedelta
+
+from apps.air_quality.ingestion import store_readings
+from apps.air_quality.models import (
+    AirCompoundReading,
+    Compound,
+    Location,
+    LocationAQI,
+    Tag,
+)
+from apps.air_quality.sparse import SparseFieldsetSerializerMixin
+from apps.air_quality.validation import FLAG_ACTION, validate_readings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework_gis.serializers import GeoFeatureModelSerializer
 
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+"""
+Tolerated difference between sensor clocks and the server clock.
+"""
+
 
 class TagSerializer(serializers.ModelSerializer):
     """
@@ -24,7 +42,7 @@ class CompoundSerializer(serializers.ModelSerializer):
         fields = ("symbol", "full_name", "is_gaseous")
 
 
-class LocationSerializer(GeoFeatureModelSerializer):
+class LocationSerializer(SparseFieldsetSerializerMixin, GeoFeatureModelSerializer):
     """
     Serializer for Location model with geographical data.
     """
@@ -38,6 +56,23 @@ class LocationSerializer(GeoFeatureModelSerializer):
         geo_field = "coordinates"
         fields = ("id", "name", "coordinates", "tags")
 
+    def to_representation(self, instance):
+        """
+        Serializes the location, with a null geometry when coordinates are not selected.
+        """
+        if self.Meta.geo_field in self.fields:
+            return super().to_representation(instance)
+
+        properties = [
+            field for name, field in self.fields.items() if name != self.Meta.id_field
+        ]
+        return {
+            "id": instance.pk,
+            "type": "Feature",
+            "geometry": None,
+            "properties": self.get_properties(instance, properties),
+        }
+
     @staticmethod
     def validate_coordinates(value):
         """
@@ -56,7 +91,9 @@ class LocationSerializer(GeoFeatureModelSerializer):
         return value
 
 
-class AirCompoundReadingSerializer(serializers.ModelSerializer):
+class AirCompoundReadingSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     """
     Serializer for AirCompoundReading model.
     """
@@ -122,19 +159,78 @@ class CreateAirCompoundReadingSerializer(serializers.ModelSerializer):
             "entered_concentration_unit",
             "timestamp",
         )
+        validators = []
+
+    @staticmethod
+    def validate_timestamp(value):
+        """
+        Validates that the measurement time is not in the future.
+        """
+        if value > timezone.now() + MAX_CLOCK_SKEW:
+            raise ValidationError("Timestamp cannot be in the future.")
+        return value
 
     def validate(self, attrs):
         """
         Validates compound and concentration unit compatibility.
         """
         error_messages = []
-        compound = attrs.get("compound")
-        unit = attrs.get("entered_concentration_unit")
+        compound = attrs.get("compound", getattr(self.instance, "compound", None))
+        unit = attrs.get(
+            "entered_concentration_unit",
+            getattr(self.instance, "entered_concentration_unit", None),
+        )
         if not compound.is_gaseous and unit in ("ppm", "ppb"):
             error_messages.append(
                 "Non-gaseous compound cannot be expressed in ppm or ppb."
             )
 
         if error_messages:
-            return ValidationError(error_messages)
+            raise ValidationError(error_messages)
         return attrs
+
+    def create(self, validated_data):
+        """
+        Upserts the reading on its location, compound and timestamp.
+
+        A quarantined reading is not stored and is returned unsaved, without a
+        primary key.
+        """
+        reading = AirCompoundReading(**validated_data)
+        stored = store_readings([reading])
+        return stored[0] if stored else reading
+
+    def update(self, instance, validated_data):
+        """
+        Updates the reading, rejecting changes that would duplicate another one.
+
+        The changed reading goes through the validation pipeline again, so its
+        flag follows the new value. Stored readings are flagged, never
+        quarantined, and edits are not counted as new observations.
+        """
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        validate_readings([instance], action=FLAG_ACTION, observe=False)
+
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError:
+            raise ValidationError(
+                "A reading already exists for this location, compound and timestamp."
+            )
+
+
+class LocationAQISerializer(serializers.ModelSerializer):
+    """
+    Serializer for the cached air quality index of a location.
+    """
+
+    location = serializers.SlugRelatedField(read_only=True, slug_field="name")
+    dominant_compound = serializers.SlugRelatedField(
+        read_only=True, slug_field="symbol"
+    )
+
+    class Meta:
+        model = LocationAQI
+        fields = ("location", "scale", "hour", "aqi", "category", "dominant_compound")
@@ -1,4 +1,9 @@
-from apps.air_quality.models import AirCompoundReading, Compound
+from datetime import timedelta
+
+from apps.air_quality.aqi import get_aqi_config
+from apps.air_quality.interpolation import MAX_RESOLUTION
+from apps.air_quality.models import AirCompoundReading, Compound, Location, Tag
+from apps.air_quality.spatial import parse_bbox
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
@@ -9,10 +14,22 @@ class AirCompoundRadiusQuerySerializer(serializers.Serializer):
     """
 
     longitude = serializers.FloatField(
-        min_value=-180, max_value=180, help_text="Longitude of the center point"
+        min_value=-180,
+        max_value=180,
+        required=False,
+        help_text="Longitude of the center point",
     )
     latitude = serializers.FloatField(
-        min_value=-90, max_value=90, help_text="Latitude of the center point"
+        min_value=-90,
+        max_value=90,
+        required=False,
+        help_text="Latitude of the center point",
+    )
+    location = serializers.SlugRelatedField(
+        queryset=Location.objects.all(),
+        slug_field="name",
+        required=False,
+        help_text="Location used as center point instead of coordinates",
     )
     radius = serializers.FloatField(
         min_value=0, max_value=100, help_text="radius in km"
@@ -26,10 +43,14 @@ class AirCompoundRadiusQuerySerializer(serializers.Serializer):
     )
     start_date = serializers.DateTimeField()
     end_date = serializers.DateTimeField()
+    exclude_flagged = serializers.BooleanField(
+        default=True, help_text="Exclude readings flagged by ingestion validation"
+    )
 
     def validate(self, attrs):
         """
-        Validates that start_date is not greater than end_date.
+        Validates that start_date is not greater than end_date and that the
+        center is given by coordinates or by a location.
         """
         error_messages = []
         start_date = attrs.get("start_date")
@@ -38,7 +59,276 @@ class AirCompoundRadiusQuerySerializer(serializers.Serializer):
         if start_date > end_date:
             error_messages.append("'start_date' cannot be greater than 'end_date'.")
 
+        if attrs.get("location") is not None:
+            attrs.setdefault("longitude", attrs["location"].coordinates.x)
+            attrs.setdefault("latitude", attrs["location"].coordinates.y)
+        elif "longitude" not in attrs or "latitude" not in attrs:
+            error_messages.append(
+                "Either 'longitude' and 'latitude' or 'location' must be given."
+            )
+
         if error_messages:
             raise ValidationError(error_messages)
 
         return attrs
+
+
+class RollingMeanQuerySerializer(serializers.Serializer):
+    """
+    Serializer for query parameters of rolling mean concentrations.
+    """
+
+    MAX_PERIOD = timedelta(days=366)
+
+    compound = serializers.SlugRelatedField(
+        queryset=Compound.objects.all(),
+        slug_field="symbol",
+    )
+    location = serializers.ListField(
+        child=serializers.SlugRelatedField(
+            queryset=Location.objects.all(), slug_field="name"
+        ),
+        required=False,
+    )
+    concentration_unit = serializers.ChoiceField(
+        choices=AirCompoundReading.CONCENTRATION_UNITS,
+    )
+    window_hours = serializers.IntegerField(
+        min_value=1,
+        max_value=72,
+        default=8,
+        help_text="Number of hourly means averaged, e.g. 8 or 24",
+    )
+    start_date = serializers.DateTimeField()
+    end_date = serializers.DateTimeField()
+    exclude_flagged = serializers.BooleanField(
+        default=True, help_text="Exclude readings flagged by ingestion validation"
+    )
+
+    def validate(self, attrs):
+        """
+        Validates that start_date is before end_date within the maximum period.
+        """
+        if attrs["start_date"] >= attrs["end_date"]:
+            raise ValidationError("'start_date' must be before 'end_date'.")
+        if attrs["end_date"] - attrs["start_date"] > self.MAX_PERIOD:
+            raise ValidationError(
+                f"The period cannot exceed {self.MAX_PERIOD.days} days."
+            )
+        return attrs
+
+
+class InterpolationQuerySerializer(serializers.Serializer):
+    """
+    Serializer for query parameters of interpolated concentration grids.
+    """
+
+    bbox = serializers.CharField(help_text="min_lon,min_lat,max_lon,max_lat")
+    resolution = serializers.IntegerField(
+        min_value=2,
+        max_value=MAX_RESOLUTION,
+        default=256,
+        help_text="Number of grid cells along the longitude axis",
+    )
+    compound = serializers.SlugRelatedField(
+        queryset=Compound.objects.all(),
+        slug_field="symbol",
+    )
+    concentration_unit = serializers.ChoiceField(
+        choices=AirCompoundReading.CONCENTRATION_UNITS,
+    )
+    start_date = serializers.DateTimeField()
+    end_date = serializers.DateTimeField()
+    exclude_flagged = serializers.BooleanField(
+        default=True, help_text="Exclude readings flagged by ingestion validation"
+    )
+
+    @staticmethod
+    def validate_bbox(value):
+        """
+        Parses the bounding box into a polygon.
+        """
+        return parse_bbox(value)
+
+    def validate(self, attrs):
+        """
+        Validates that start_date is before end_date.
+        """
+        if attrs["start_date"] >= attrs["end_date"]:
+            raise ValidationError("'start_date' must be before 'end_date'.")
+        return attrs
+
+
+class LocationAQIQuerySerializer(serializers.Serializer):
+    """
+    Serializer for query parameters of location air quality indexes.
+    """
+
+    scale = serializers.CharField(
+        required=False, help_text="Breakpoint scale, e.g. epa or caqi"
+    )
+
+    def validate_scale(self, value):
+        """
+        Validates that the scale is configured.
+        """
+        if value not in get_aqi_config()["SCALES"]:
+            raise ValidationError(f"Unknown AQI scale '{value}'.")
+        return value
+
+
+class LatestReadingsQuerySerializer(serializers.Serializer):
+    """
+    Serializer for query parameters of the latest reading of each location.
+    """
+
+    compound = serializers.ListField(
+        child=serializers.SlugRelatedField(
+            queryset=Compound.objects.all(), slug_field="symbol"
+        ),
+        required=False,
+    )
+    location = serializers.ListField(
+        child=serializers.SlugRelatedField(
+            queryset=Location.objects.all(), slug_field="name"
+        ),
+        required=False,
+    )
+    concentration_unit = serializers.ChoiceField(
+        choices=AirCompoundReading.CONCENTRATION_UNITS,
+    )
+    hours = serializers.IntegerField(
+        min_value=1,
+        max_value=168,
+        default=24,
+        help_text="Only consider readings of the last hours",
+    )
+
+
+class ReadingSeriesQuerySerializer(serializers.Serializer):
+    """
+    Serializer for query parameters of the readings of one location and compound.
+    """
+
+    MAX_PERIOD = timedelta(days=7)
+
+    location = serializers.SlugRelatedField(
+        queryset=Location.objects.all(), slug_field="name"
+    )
+    compound = serializers.SlugRelatedField(
+        queryset=Compound.objects.all(), slug_field="symbol"
+    )
+    concentration_unit = serializers.ChoiceField(
+        choices=AirCompoundReading.CONCENTRATION_UNITS,
+    )
+    start_date = serializers.DateTimeField()
+    end_date = serializers.DateTimeField()
+
+    def validate(self, attrs):
+        """
+        Validates that start_date is before end_date within the maximum period.
+        """
+        if attrs["start_date"] >= attrs["end_date"]:
+            raise ValidationError("'start_date' must be before 'end_date'.")
+        if attrs["end_date"] - attrs["start_date"] > self.MAX_PERIOD:
+            raise ValidationError(
+                f"The period cannot exceed {self.MAX_PERIOD.days} days."
+            )
+        return attrs
+
+
+class ReadingStreamQuerySerializer(serializers.Serializer):
+    """
+    Serializer for query parameters of the live reading stream subscription.
+    """
+
+    compound = serializers.ListField(
+        child=serializers.SlugRelatedField(
+            queryset=Compound.objects.all(), slug_field="symbol"
+        ),
+        required=False,
+    )
+    location = serializers.ListField(
+        child=serializers.SlugRelatedField(
+            queryset=Location.objects.all(), slug_field="name"
+        ),
+        required=False,
+    )
+    tag = serializers.ListField(
+        child=serializers.SlugRelatedField(
+            queryset=Tag.objects.all(), slug_field="name"
+        ),
+        required=False,
+    )
+    longitude = serializers.FloatField(min_value=-180, max_value=180, required=False)
+    latitude = serializers.FloatField(min_value=-90, max_value=90, required=False)
+    radius = serializers.FloatField(
+        min_value=0, max_value=100, required=False, help_text="radius in km"
+    )
+
+    @staticmethod
+    def validate_radius(value):
+        """
+        Validates that the radius is positive, as an empty radius would not
+        restrict the subscription.
+        """
+        if value <= 0:
+            raise ValidationError("Radius must be greater than 0.")
+        return value
+
+    def validate(self, attrs):
+        """
+        Validates that longitude, latitude and radius are given together.
+        """
+        radius_fields = ("longitude", "latitude", "radius")
+        given = [name for name in radius_fields if name in attrs]
+        if given and len(given) != len(radius_fields):
+            raise ValidationError(
+                "'longitude', 'latitude' and 'radius' must be given together."
+            )
+        return attrs
+
+
+class BulkReadingDeleteSerializer(serializers.Serializer):
+    """
+    Serializer for the body of a bulk deletion of filtered readings.
+    """
+
+    dry_run = serializers.BooleanField(
+        default=False, help_text="Only count the matching readings"
+    )
+
+
+class BulkReadingUpdateSerializer(BulkReadingDeleteSerializer):
+    """
+    Serializer for the body of a bulk correction of filtered readings.
+    """
+
+    scale = serializers.FloatField(
+        default=1.0, help_text="Factor applied to concentration values"
+    )
+    offset = serializers.FloatField(
+        default=0.0, help_text="Offset added to scaled concentration values"
+    )
+    unit = serializers.ChoiceField(
+        choices=AirCompoundReading.CONCENTRATION_UNITS,
+        required=False,
+        help_text="Unit the concentration values are re-labeled with",
+    )
+
+    @staticmethod
+    def validate_scale(value):
+        """
+        Validates that the scale factor is positive.
+        """
+        if value <= 0:
+            raise ValidationError("Scale must be positive.")
+        return value
+
+    def validate(self, attrs):
+        """
+        Validates that at least one correction is given.
+        """
+        if attrs["scale"] == 1 and attrs["offset"] == 0 and "unit" not in attrs:
+            raise ValidationError("No correction given.")
+        return attrs
@@ -19,4 +19,26 @@ class AirCompoundRadiusResponseSerializer(AirCompoundRadiusQuerySerializer):
     Serializer for response of air compound readings within a radius.
     """
 
+    location = None
     stats = RadiusStatsResponseSerializer()
+
+
+class IngestionQueueStatsSerializer(serializers.Serializer):
+    """
+    Serializer for depth and lag of the reading ingestion queue.
+    """
+
+    pending = serializers.IntegerField()
+    dead = serializers.IntegerField()
+    quarantined = serializers.IntegerField()
+    lag_seconds = serializers.FloatField()
+
+
+class BulkReadingResultSerializer(serializers.Serializer):
+    """
+    Serializer for the outcome of a bulk operation on filtered readings.
+    """
+
+    matched = serializers.IntegerField()
+    changed = serializers.IntegerField()
+    dry_run = serializers.BooleanField()
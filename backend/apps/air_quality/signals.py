@@ -0,0 +1,100 @@
+from apps.air_quality.conditional import bump_table_version
+from apps.air_quality.models import (
+    AirCompoundReading,
+    AlertRule,
+    Compound,
+    Location,
+    Tag,
+)
+from apps.air_quality.neighbors import refresh_location_neighbors
+from apps.air_quality.recent import invalidate_recent_index, recent_index
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=Compound)
+@receiver(post_delete, sender=Compound)
+@receiver(post_save, sender=AirCompoundReading)
+@receiver(post_delete, sender=AirCompoundReading)
+@receiver(post_save, sender=AlertRule)
+@receiver(post_delete, sender=AlertRule)
+def bump_version_on_change(sender, **kwargs):
+    """
+    Bumps the table version of a saved or deleted instance.
+    """
+    bump_table_version(sender)
+
+
+@receiver(post_save, sender=Location)
+def refresh_neighbors_on_move(sender, instance, created, update_fields, **kwargs):
+    """
+    Recomputes the neighbors of a created or possibly moved location.
+    """
+    if update_fields is not None and "coordinates" not in update_fields:
+        return
+    transaction.on_commit(lambda: refresh_location_neighbors([instance.pk]))
+
+
+@receiver(post_save, sender=AirCompoundReading)
+def add_to_recent_index(sender, instance, created, **kwargs):
+    """
+    Adds a saved reading to the recent readings index once committed.
+
+    Other processes only pull new readings, so an update also invalidates
+    their indexes.
+    """
+    transaction.on_commit(lambda: recent_index.add([instance]))
+    if not created:
+        transaction.on_commit(invalidate_recent_index)
+
+
+@receiver(post_delete, sender=AirCompoundReading)
+def discard_from_recent_index(sender, instance, **kwargs):
+    """
+    Removes a deleted reading from the recent readings index once committed,
+    and invalidates the indexes of other processes.
+    """
+    pk = instance.pk
+    transaction.on_commit(lambda: recent_index.discard([pk]))
+    transaction.on_commit(invalidate_recent_index)
+
+
+@receiver(m2m_changed, sender=Location.tags.through)
+def sync_location_tag_ids(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keeps the denormalized location tag ids in sync with location tags.
+    """
+    if action == "pre_clear" and reverse:
+        instance._cleared_location_ids = list(
+            instance.anemometers.values_list("pk", flat=True)
+        )
+        return
+    if not action.startswith("post_"):
+        return
+
+    if not reverse:
+        location_ids = [instance.pk]
+    elif action == "post_clear":
+        location_ids = instance.__dict__.pop("_cleared_location_ids", [])
+    else:
+        location_ids = pk_set
+
+    Location.sync_tag_ids(location_ids)
+    if not reverse:
+        instance.refresh_from_db(fields=["tag_ids"])
+    bump_table_version(Location)
+
+
+@receiver(post_delete, sender=Tag)
+def remove_deleted_tag_ids(sender, instance, **kwargs):
+    """
+    Removes a deleted tag from the denormalized tag ids of its locations.
+    """
+    Location.sync_tag_ids(
+        Location.objects.filter(tag_ids__contains=[instance.pk]).values("pk")
+    )
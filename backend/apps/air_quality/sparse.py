@@ -0,0 +1,89 @@
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldsetMixin:
+    """
+    Lets list and detail requests select the serialized fields with ``fields``.
+
+    ``sparse_fields`` maps each selectable serializer field to the model field
+    paths it reads. Only those columns are loaded, and relations that no
+    selected field needs are neither joined nor prefetched. The primary key is
+    always returned.
+    """
+
+    sparse_fields = {}
+    sparse_fields_param = "fields"
+    sparse_actions = ("list", "retrieve")
+
+    def get_sparse_fields(self):
+        """
+        Returns the selected serializer field names, or None when not restricted.
+        """
+        if self.request is None or self.action not in self.sparse_actions:
+            return None
+        value = self.request.query_params.get(self.sparse_fields_param)
+        if not value:
+            return None
+
+        selected = {name.strip() for name in value.split(",") if name.strip()}
+        unknown = selected - set(self.sparse_fields)
+        if unknown:
+            raise ValidationError(
+                {
+                    self.sparse_fields_param: (
+                        f"Unknown fields: {', '.join(sorted(unknown))}. "
+                        f"Available fields: {', '.join(self.sparse_fields)}."
+                    )
+                }
+            )
+        return selected | {"id"}
+
+    def filter_queryset(self, queryset):
+        """
+        Restricts the loaded columns and relations to the selected fields.
+        """
+        queryset = super().filter_queryset(queryset)
+        selected = self.get_sparse_fields()
+        if selected is None:
+            return queryset
+
+        model_meta = queryset.model._meta
+        columns, joins, prefetches = {model_meta.pk.name}, set(), set()
+        for name in selected:
+            for path in self.sparse_fields[name]:
+                relation, _, _ = path.partition("__")
+                if model_meta.get_field(relation).many_to_many:
+                    prefetches.add(relation)
+                    continue
+                columns.add(path)
+                if path != relation:
+                    columns.add(relation)
+                    joins.add(relation)
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if joins:
+            queryset = queryset.select_related(*joins)
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset.only(*columns)
+
+    def get_serializer_context(self):
+        """
+        Adds the selected fields to the serializer context.
+        """
+        context = super().get_serializer_context()
+        context["fields"] = self.get_sparse_fields()
+        return context
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Serializes only the fields listed in the ``fields`` serializer context.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.context.get("fields")
+        if selected is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
@@ -0,0 +1,137 @@
+from functools import lru_cache
+
+from django.contrib.gis.db.models import GeometryField
+from django.contrib.gis.geos import GEOSException, GEOSGeometry, Polygon
+from django.db.models.functions import Cast
+from rest_framework.exceptions import ValidationError
+
+MAX_GEOJSON_LENGTH = 200_000
+"""
+Maximum length of a GeoJSON polygon passed as a query parameter.
+"""
+
+MAX_POLYGON_VERTICES = 500
+"""
+Number of vertices above which polygons are simplified before querying.
+"""
+
+SIMPLIFY_TOLERANCE = 0.0001
+"""
+Initial simplification tolerance in degrees (about 11 m at the equator).
+"""
+
+MAX_SIMPLIFY_ITERATIONS = 16
+"""
+Number of tolerance doublings tried before a polygon is rejected.
+"""
+
+POLYGON_CACHE_SIZE = 256
+
+
+def validate_bounds(longitude: float, latitude: float):
+    """
+    Validates that a coordinate pair is within WGS84 bounds.
+    """
+    if not -180 <= longitude <= 180:
+        raise ValidationError("Longitude must be between -180 and 180.")
+    if not -90 <= latitude <= 90:
+        raise ValidationError("Latitude must be between -90 and 90.")
+
+
+def as_planar(field: str) -> Cast:
+    """
+    Returns a geography field cast to geometry.
+
+    Geography polygon edges follow great circles, so lookups against a lat/lon
+    box are made on geometry, whose edges follow the parallels of the box.
+    """
+    return Cast(field, GeometryField(srid=4326))
+
+
+def parse_bbox(value: str) -> Polygon:
+    """
+    Returns the polygon of a "min_lon,min_lat,max_lon,max_lat" bounding box.
+    """
+    bbox = Polygon.from_bbox(parse_bbox_extent(value))
+    bbox.srid = 4326
+    return bbox
+
+
+@lru_cache(maxsize=POLYGON_CACHE_SIZE)
+def parse_bbox_extent(value: str) -> tuple:
+    """
+    Returns the validated (min_lon, min_lat, max_lon, max_lat) of a bounding box.
+    """
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in value.split(","))
+    except ValueError:
+        raise ValidationError(
+            "Bounding box must be four comma separated numbers: "
+            "min_lon,min_lat,max_lon,max_lat."
+        )
+
+    validate_bounds(min_lon, min_lat)
+    validate_bounds(max_lon, max_lat)
+    if min_lon >= max_lon or min_lat >= max_lat:
+        raise ValidationError("Bounding box minimums must be lower than maximums.")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def simplify_polygon(geometry: GEOSGeometry) -> GEOSGeometry:
+    """
+    Simplifies a polygon until it has at most MAX_POLYGON_VERTICES vertices.
+
+    Topology-preserving simplification keeps at least four coordinates per
+    ring, so geometries with too many parts or holes cannot be reduced and are
+    rejected.
+    """
+    tolerance = SIMPLIFY_TOLERANCE
+    for _ in range(MAX_SIMPLIFY_ITERATIONS):
+        if geometry.num_coords <= MAX_POLYGON_VERTICES:
+            return geometry
+        geometry = geometry.simplify(tolerance, preserve_topology=True)
+        tolerance *= 2
+    if geometry.num_coords > MAX_POLYGON_VERTICES:
+        raise ValidationError(
+            f"Polygon cannot be simplified to {MAX_POLYGON_VERTICES} vertices; "
+            "use fewer parts or holes."
+        )
+    return geometry
+
+
+def parse_polygon(value: str) -> GEOSGeometry:
+    """
+    Returns the simplified geometry of a GeoJSON Polygon or MultiPolygon.
+
+    Parsed geometries are cached as WKB so repeated dashboard queries on the
+    same area skip parsing, validation and simplification, while every caller
+    gets its own geometry.
+    """
+    return GEOSGeometry(memoryview(parse_polygon_wkb(value)), srid=4326)
+
+
+@lru_cache(maxsize=POLYGON_CACHE_SIZE)
+def parse_polygon_wkb(value: str) -> bytes:
+    """
+    Returns the WKB of the validated and simplified geometry of a GeoJSON
+    Polygon or MultiPolygon.
+    """
+    if len(value) > MAX_GEOJSON_LENGTH:
+        raise ValidationError(
+            f"Polygon must be at most {MAX_GEOJSON_LENGTH} characters long."
+        )
+
+    try:
+        geometry = GEOSGeometry(value)
+    except (GEOSException, TypeError, ValueError):
+        raise ValidationError("Polygon must be a valid GeoJSON geometry.")
+
+    if geometry.geom_type not in ("Polygon", "MultiPolygon"):
+        raise ValidationError("Polygon must be a GeoJSON Polygon or MultiPolygon.")
+    if not geometry.valid:
+        raise ValidationError(f"Polygon is invalid: {geometry.valid_reason}.")
+
+    for longitude, latitude in geometry.extent[:2], geometry.extent[2:]:
+        validate_bounds(longitude, latitude)
+
+    return bytes(simplify_polygon(geometry).wkb)
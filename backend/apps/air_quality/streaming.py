@@ -0,0 +1,211 @@
+import asyncio
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+
+import orjson
+from apps.air_quality.models import Compound, Location
+from django.conf import settings
+
+DEFAULT_READING_STREAM = {
+    "MAX_PENDING_EVENTS": 100,
+    "KEEPALIVE_SECONDS": 15,
+    "RETRY_MILLISECONDS": 5000,
+}
+"""
+Default live reading stream configuration, overridden by settings.READING_STREAM.
+"""
+
+
+def get_stream_config():
+    """
+    Returns the live reading stream configuration merged with defaults.
+    """
+    return {**DEFAULT_READING_STREAM, **getattr(settings, "READING_STREAM", {})}
+
+
+@dataclass(frozen=True)
+class Subscription:
+    """
+    Compounds and locations a stream subscriber is interested in; None matches
+    everything.
+    """
+
+    compound_ids: frozenset = None
+    location_ids: frozenset = None
+
+    def matches(self, location_id: int, compound_id: int) -> bool:
+        return (self.compound_ids is None or compound_id in self.compound_ids) and (
+            self.location_ids is None or location_id in self.location_ids
+        )
+
+
+class Subscriber:
+    """
+    Bounded queue of events waiting to be sent to one stream client.
+
+    When the client falls behind, the oldest events are dropped so a slow
+    consumer cannot grow memory or delay other subscribers.
+    """
+
+    def __init__(self, subscription: Subscription, max_pending: int):
+        self.subscription = subscription
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        self.dropped = 0
+
+    def deliver(self, event: bytes):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+def deliver_events(deliveries):
+    """
+    Hands events to their subscribers from the subscribers event loop.
+    """
+    for subscriber, event in deliveries:
+        subscriber.deliver(event)
+
+
+class ReadingBroker:
+    """
+    In-process publish/subscribe of new readings to stream subscribers.
+
+    Subscribers are indexed by location so publishing a reading only visits
+    the subscribers of its location and those listening to every location.
+    Events published from other threads are handed to each event loop with a
+    single thread-safe callback per published batch.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_location = defaultdict(set)
+        self._all_locations = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._all_locations) + len(
+                set().union(*self._by_location.values())
+            )
+
+    def subscribe(self, subscription: Subscription, max_pending: int) -> Subscriber:
+        """
+        Registers a subscriber on the running event loop.
+        """
+        subscriber = Subscriber(subscription, max_pending=max_pending)
+        with self._lock:
+            if subscription.location_ids is None:
+                self._all_locations.add(subscriber)
+            for location_id in subscription.location_ids or ():
+                self._by_location[location_id].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            self._all_locations.discard(subscriber)
+            for location_id in subscriber.subscription.location_ids or ():
+                subscribers = self._by_location.get(location_id)
+                if subscribers is not None:
+                    subscribers.discard(subscriber)
+                    if not subscribers:
+                        del self._by_location[location_id]
+
+    def has_subscribers(self) -> bool:
+        with self._lock:
+            return bool(self._all_locations or self._by_location)
+
+    def publish(self, events):
+        """
+        Fans (location id, compound id, event) tuples out to matching subscribers.
+        """
+        deliveries = defaultdict(list)
+        with self._lock:
+            for location_id, compound_id, event in events:
+                for subscribers in (
+                    self._by_location.get(location_id, ()),
+                    self._all_locations,
+                ):
+                    for subscriber in subscribers:
+                        if subscriber.subscription.matches(location_id, compound_id):
+                            deliveries[subscriber.loop].append((subscriber, event))
+
+        for loop, loop_deliveries in deliveries.items():
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(deliver_events, loop_deliveries)
+
+
+reading_broker = ReadingBroker()
+
+
+def format_event(reading, location_name: str, compound_name: str) -> bytes:
+    """
+    Returns the server-sent event describing a new reading.
+    """
+    data = orjson.dumps(
+        {
+            "id": reading.pk,
+            "location": location_name,
+            "compound": compound_name,
+            "concentration_unit": reading.entered_concentration_unit,
+            "concentration_value": round(reading.entered_concentration_value, 4),
+            "timestamp": reading.timestamp,
+        },
+        option=orjson.OPT_UTC_Z,
+    )
+    return b"id: %d\nevent: reading\ndata: %s\n\n" % (reading.pk, data)
+
+
+def publish_readings(readings):
+    """
+    Publishes stored readings to live stream subscribers.
+    """
+    readings = [reading for reading in readings if not reading.is_flagged]
+    if not readings or not reading_broker.has_subscribers():
+        return
+
+    location_names = dict(
+        Location.objects.filter(
+            id__in={reading.location_id for reading in readings}
+        ).values_list("id", "name")
+    )
+    compound_names = dict(
+        Compound.objects.filter(
+            id__in={reading.compound_id for reading in readings}
+        ).values_list("id", "full_name")
+    )
+    reading_broker.publish(
+        (
+            reading.location_id,
+            reading.compound_id,
+            format_event(
+                reading,
+                location_names[reading.location_id],
+                compound_names[reading.compound_id],
+            ),
+        )
+        for reading in readings
+    )
+
+
+async def stream_events(subscription: Subscription):
+    """
+    Yields server-sent events of new readings matching a subscription.
+    """
+    config = get_stream_config()
+    subscriber = reading_broker.subscribe(
+        subscription, max_pending=config["MAX_PENDING_EVENTS"]
+    )
+    try:
+        yield b"retry: %d\n\n" % config["RETRY_MILLISECONDS"]
+        while True:
+            try:
+                yield await asyncio.wait_for(
+                    subscriber.queue.get(), timeout=config["KEEPALIVE_SECONDS"]
+                )
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+    finally:
+        reading_broker.unsubscribe(subscriber)
@@ -1,8 +1,10 @@
 import random
+from datetime import timedelta
 
 import factory
 from apps.air_quality.models import AirCompoundReading, Compound, Location, Tag
 from django.contrib.gis.geos import Point
+from django.utils import timezone
 
 
 class TagFactory(factory.django.DjangoModelFactory):
@@ -46,3 +48,4 @@ class AirCompoundReadingFactory(factory.django.DjangoModelFactory):
     entered_concentration_unit = factory.LazyFunction(
         lambda: random.choice(["ug_m3", "mg_m3", "ppm", "ppb"])
     )
+    timestamp = factory.Sequence(lambda n: timezone.now() + timedelta(microseconds=n))
@@ -0,0 +1,225 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from apps.air_quality import ingestion
+from apps.air_quality.alerts import RollingWindow, alert_engine
+from apps.air_quality.models import AirCompoundReading, Alert, AlertRule
+from apps.air_quality.tests.factories import (
+    CompoundFactory,
+    LocationFactory,
+    TagFactory,
+)
+from django.contrib.gis.geos import Point
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+@pytest.fixture(autouse=True)
+def reset_alert_engine():
+    alert_engine.reset()
+    yield
+    alert_engine.reset()
+
+
+@pytest.fixture
+def compound():
+    return CompoundFactory(is_gaseous=True, molecular_weight=46)
+
+
+@pytest.fixture
+def location():
+    return LocationFactory()
+
+
+def ingest(location, compound, values, unit="ug_m3", minutes_apart=1):
+    start = timezone.now() - timedelta(minutes=minutes_apart * len(values))
+    return ingestion.store_readings(
+        [
+            AirCompoundReading(
+                location=location,
+                compound=compound,
+                entered_concentration_value=value,
+                entered_concentration_unit=unit,
+                timestamp=start + timedelta(minutes=minutes_apart * index),
+            )
+            for index, value in enumerate(values)
+        ]
+    )
+
+
+def make_rule(compound, **kwargs):
+    return AlertRule.objects.create(
+        **{
+            "name": "Limit",
+            "compound": compound,
+            "threshold": 50,
+            "unit": "ug_m3",
+            **kwargs,
+        }
+    )
+
+
+@pytest.mark.django_db
+class TestAlertEngine:
+    """Test suite for threshold alert evaluation on ingestion."""
+
+    def test_exceeding_reading_raises_alert(self, compound, location):
+        """Test that a reading above the threshold raises an alert."""
+        rule = make_rule(compound, location=location)
+
+        ingest(location, compound, [10.0, 75.0])
+
+        alert = Alert.objects.get()
+        assert (alert.rule, alert.location) == (rule, location)
+        assert (alert.value, alert.threshold, alert.unit) == (75.0, 50, "ug_m3")
+
+    def test_threshold_is_compared_in_rule_unit(self, compound, location):
+        """Test that readings and thresholds in different units are compared."""
+        make_rule(compound, threshold=0.05, unit="mg_m3")
+
+        ingest(location, compound, [40.0, 60.0])
+
+        alert = Alert.objects.get()
+        assert alert.value == pytest.approx(0.06)
+        assert alert.unit == "mg_m3"
+
+    def test_tag_and_radius_scopes(self, compound):
+        """Test that scoped rules only apply to locations in scope."""
+        tag = TagFactory()
+        tagged = LocationFactory(tags=[tag], coordinates=Point(10, 10))
+        nearby = LocationFactory(coordinates=Point(0.01, 0.01))
+        elsewhere = LocationFactory(coordinates=Point(20, 20))
+        tag_rule = make_rule(compound, tag=tag)
+        radius_rule = make_rule(compound, center=Point(0, 0, srid=4326), radius_km=5)
+
+        for location in (tagged, nearby, elsewhere):
+            ingest(location, compound, [100.0])
+
+        assert set(Alert.objects.values_list("rule_id", "location_id")) == {
+            (tag_rule.pk, tagged.pk),
+            (radius_rule.pk, nearby.pk),
+        }
+
+    def test_rolling_window_mean(self, compound, location):
+        """Test that windowed rules compare the rolling mean to the threshold."""
+        make_rule(compound, window_minutes=30, cooldown_minutes=0)
+
+        ingest(location, compound, [30.0, 60.0, 90.0], minutes_apart=10)
+
+        alert = Alert.objects.get()
+        assert alert.value == pytest.approx(60.0)
+
+    def test_evaluation_errors_do_not_fail_ingestion(
+        self, monkeypatch, compound, location
+    ):
+        """Test that readings are stored when alert evaluation fails."""
+        make_rule(compound)
+
+        def failing_evaluate(readings):
+            raise ValueError("broken rule")
+
+        monkeypatch.setattr(alert_engine, "evaluate", failing_evaluate)
+        ingest(location, compound, [100.0])
+
+        assert AirCompoundReading.objects.count() == 1
+
+    def test_cooldown_limits_repeated_alerts(self, compound, location):
+        """Test that a rule alerts once per location within its cooldown."""
+        make_rule(compound, cooldown_minutes=60)
+
+        ingest(location, compound, [80.0, 90.0, 100.0])
+
+        assert Alert.objects.count() == 1
+
+    def test_cooldown_starts_once_alerts_are_stored(
+        self, monkeypatch, compound, location, django_capture_on_commit_callbacks
+    ):
+        """Test that an alert that failed to be stored does not start a cooldown."""
+        make_rule(compound, cooldown_minutes=60)
+        bulk_create = Alert.objects.bulk_create
+
+        def failing_bulk_create(alerts):
+            raise DatabaseError("alert table unavailable")
+
+        monkeypatch.setattr(Alert.objects, "bulk_create", failing_bulk_create)
+        with django_capture_on_commit_callbacks(execute=True):
+            ingest(location, compound, [80.0])
+        monkeypatch.setattr(Alert.objects, "bulk_create", bulk_create)
+        with django_capture_on_commit_callbacks(execute=True):
+            ingest(location, compound, [90.0])
+
+        assert Alert.objects.get().value == 90.0
+
+    def test_index_follows_rule_changes(self, compound, location):
+        """Test that deactivated rules stop raising alerts."""
+        rule = make_rule(compound, cooldown_minutes=0)
+        ingest(location, compound, [80.0])
+
+        rule.is_active = False
+        rule.save()
+        ingest(location, compound, [90.0])
+
+        assert Alert.objects.count() == 1
+
+    def test_flagged_readings_are_ignored(self, compound, location):
+        """Test that readings failing validation do not raise alerts."""
+        make_rule(compound)
+
+        ingest(location, compound, [float("inf")])
+
+        assert not Alert.objects.exists()
+
+    def test_evaluation_queries_do_not_grow_with_batch_size(self, compound):
+        """Test that evaluating a batch runs a constant number of queries."""
+        make_rule(compound, cooldown_minutes=0)
+        ingest(LocationFactory(), compound, [1.0])
+
+        query_counts = []
+        for size in (5, 50):
+            location = LocationFactory()
+            ingest(location, compound, [1.0])
+            with CaptureQueriesContext(connection) as queries:
+                ingest(location, compound, [100.0] * size)
+            query_counts.append(len(queries))
+
+        assert query_counts[0] == query_counts[1]
+        assert Alert.objects.count() == 55
+
+
+class TestRollingWindow:
+    """Test suite for rolling window means of alert rules."""
+
+    START = datetime(2026, 1, 1, 12, tzinfo=dt_timezone.utc)
+    WINDOW = timedelta(minutes=30)
+
+    def test_retried_value_is_counted_once(self):
+        """Test that a value added again for its timestamp replaces the first."""
+        window = RollingWindow()
+
+        window.add(self.START, 40.0, self.WINDOW)
+        mean = window.add(self.START, 80.0, self.WINDOW)
+
+        assert mean == 80.0
+        assert window.total == 80.0
+
+    def test_backfilled_values_are_inserted_in_order(self):
+        """Test that an older value is kept in the window of later values."""
+        window = RollingWindow()
+        window.add(self.START + timedelta(minutes=20), 100.0, self.WINDOW)
+
+        backfilled = window.add(self.START, 10.0, self.WINDOW)
+        latest = window.add(self.START + timedelta(minutes=25), 40.0, self.WINDOW)
+        evicted = window.add(self.START + timedelta(minutes=31), 60.0, self.WINDOW)
+
+        assert backfilled == 10.0
+        assert latest == pytest.approx(50.0)
+        assert evicted == pytest.approx(200.0 / 3)
+
+    def test_values_older_than_the_window_are_ignored(self):
+        """Test that values outside the window of the latest one are skipped."""
+        window = RollingWindow()
+        window.add(self.START + timedelta(hours=1), 10.0, self.WINDOW)
+
+        assert window.add(self.START, 1000.0, self.WINDOW) is None
+        assert window.total == 10.0
@@ -0,0 +1,195 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+import pytest
+from apps.air_quality.aqi import (
+    DEFAULT_AQI,
+    compute_location_aqi,
+    compute_sub_indexes,
+    get_category,
+    recompute_location_aqi,
+)
+from apps.air_quality.models import LocationAQI
+from apps.air_quality.tests.factories import (
+    AirCompoundReadingFactory,
+    CompoundFactory,
+    LocationFactory,
+)
+from django.core.management import call_command
+from django.urls import reverse
+from freezegun import freeze_time
+from rest_framework import status
+
+from apps.users.tests.factories import UserFactory
+from core.tests.factories import APIClientFactory
+
+EPA = DEFAULT_AQI["SCALES"]["epa"]
+HOUR = datetime(2025, 1, 27, 10, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture
+def api_client():
+    return APIClientFactory(user=UserFactory())
+
+
+@pytest.fixture
+def pm25():
+    return CompoundFactory(symbol="PM2.5", full_name="Fine particulate matter")
+
+
+@pytest.fixture
+def no2():
+    return CompoundFactory(
+        symbol="NO₂", full_name="Nitrogen dioxide", is_gaseous=True, molecular_weight=46
+    )
+
+
+def add_readings(location, compound, values, unit="ug_m3", first_minute=0):
+    for minutes, value in enumerate(values, start=first_minute):
+        AirCompoundReadingFactory(
+            location=location,
+            compound=compound,
+            timestamp=HOUR + timedelta(minutes=minutes),
+            entered_concentration_value=value,
+            entered_concentration_unit=unit,
+        )
+
+
+class TestComputeSubIndexes:
+    """Test suite for breakpoint interpolation."""
+
+    def test_epa_pm25_sub_indexes(self):
+        """Test that concentrations are interpolated within their band."""
+        sub_indexes = compute_sub_indexes(
+            [0, 9.0, 9.05, 12.0, 35.4, 40.0, np.nan],
+            EPA["COMPOUNDS"]["PM2.5"]["breakpoints"],
+        )
+
+        np.testing.assert_array_equal(sub_indexes, [0, 50, 51, 56, 100, 112, np.nan])
+
+    def test_concentrations_above_last_band_are_extrapolated(self):
+        """Test that concentrations above the table keep the last band slope."""
+        [sub_index] = compute_sub_indexes(
+            [400.0], EPA["COMPOUNDS"]["PM2.5"]["breakpoints"]
+        )
+
+        assert sub_index == 649
+
+    def test_categories(self):
+        """Test that indexes map to the category of their upper bound."""
+        assert get_category(50, EPA["CATEGORIES"]) == "Good"
+        assert get_category(112, EPA["CATEGORIES"]) == (
+            "Unhealthy for Sensitive Groups"
+        )
+        assert get_category(649, EPA["CATEGORIES"]) == "Hazardous"
+
+
+@pytest.mark.django_db
+class TestComputeLocationAQI:
+    """Test suite for hourly location AQI computation."""
+
+    def test_highest_sub_index_is_stored(self, pm25, no2):
+        """Test that each location stores its dominant compound sub-index."""
+        first_location, second_location = LocationFactory(), LocationFactory()
+        add_readings(first_location, pm25, [10.0, 14.0])
+        add_readings(first_location, no2, [100.0], unit="ppb")
+        add_readings(second_location, pm25, [40.0])
+
+        compute_location_aqi(HOUR + timedelta(minutes=30), scale="epa")
+
+        aqis = {
+            aqi.location_id: aqi
+            for aqi in LocationAQI.objects.filter(scale="epa", hour=HOUR)
+        }
+        assert (
+            aqis[first_location.pk].aqi,
+            aqis[first_location.pk].category,
+            aqis[first_location.pk].dominant_compound_id,
+        ) == (100, "Moderate", no2.pk)
+        assert (
+            aqis[second_location.pk].aqi,
+            aqis[second_location.pk].dominant_compound_id,
+        ) == (112, pm25.pk)
+
+    def test_readings_outside_the_averaging_period_are_ignored(self, no2):
+        """Test that one-hour compounds only average readings of that hour."""
+        location = LocationFactory()
+        AirCompoundReadingFactory(
+            location=location,
+            compound=no2,
+            timestamp=HOUR - timedelta(minutes=1),
+            entered_concentration_value=2000.0,
+            entered_concentration_unit="ppb",
+        )
+        add_readings(location, no2, [53.0], unit="ppb")
+
+        [aqi] = compute_location_aqi(HOUR, scale="epa")
+
+        assert aqi.aqi == 50
+
+    def test_recomputing_an_hour_replaces_values(self, pm25):
+        """Test that computing an hour twice upserts its values."""
+        location = LocationFactory()
+        add_readings(location, pm25, [40.0])
+        compute_location_aqi(HOUR, scale="epa")
+        add_readings(location, pm25, [0.0, 0.0], first_minute=1)
+
+        call_command("compute_aqi", hour=HOUR.isoformat(), scale=["epa"])
+
+        assert LocationAQI.objects.get(location=location).aqi < 112
+
+    def test_recomputation_is_limited_to_changed_locations(self, pm25):
+        """Test that recomputing one location leaves the others untouched."""
+        changed, unchanged = LocationFactory(), LocationFactory()
+        add_readings(changed, pm25, [40.0])
+        add_readings(unchanged, pm25, [40.0])
+        compute_location_aqi(HOUR, scale="epa")
+        LocationAQI.objects.update(aqi=0)
+
+        recompute_location_aqi([changed.pk], HOUR, HOUR + timedelta(hours=1))
+
+        aqis = dict(LocationAQI.objects.values_list("location_id", "aqi"))
+        assert aqis == {changed.pk: 112, unchanged.pk: 0}
+
+
+@pytest.mark.django_db
+class TestLocationAQIView:
+    """Test suite for the locations AQI endpoint."""
+
+    @freeze_time("2025-01-27 12:30:00")
+    def test_latest_aqi_of_every_location(self, api_client, pm25):
+        """Test that only the latest recent value of each location is returned."""
+        current, stale = LocationFactory(), LocationFactory()
+        for location, hour, aqi in (
+            (current, HOUR, 40),
+            (current, HOUR + timedelta(hours=2), 60),
+            (stale, HOUR - timedelta(hours=5), 200),
+        ):
+            LocationAQI.objects.create(
+                location=location,
+                scale="epa",
+                hour=hour,
+                aqi=aqi,
+                category=get_category(aqi, EPA["CATEGORIES"]),
+                dominant_compound=pm25,
+            )
+
+        response = api_client.get(reverse("locations-get-aqi"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [
+            {
+                "location": current.name,
+                "scale": "epa",
+                "hour": "2025-01-27T12:00:00Z",
+                "aqi": 60,
+                "category": "Moderate",
+                "dominant_compound": "PM2.5",
+            }
+        ]
+
+    def test_unknown_scale(self, api_client):
+        """Test that unconfigured scales are rejected."""
+        response = api_client.get(reverse("locations-get-aqi"), {"scale": "unknown"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,282 @@
+from datetime import datetime, timezone as dt_timezone
+
+import pytest
+from apps.air_quality.aqi import compute_location_aqi
+from apps.air_quality.bulk import apply_to_readings, correct_readings
+from apps.air_quality.conditional import get_table_version
+from apps.air_quality.models import AirCompoundReading, LocationAQI
+from apps.air_quality.recent import get_recent_index_generation
+from apps.air_quality.tests.factories import (
+    AirCompoundReadingFactory,
+    CompoundFactory,
+    LocationFactory,
+)
+from django.urls import reverse
+from rest_framework import status
+
+from apps.users.tests.factories import UserFactory
+from core.tests.factories import APIClientFactory
+
+HOUR = datetime(2025, 1, 27, 10, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture
+def admin_client():
+    return APIClientFactory(user=UserFactory(is_staff=True))
+
+
+@pytest.fixture
+def location():
+    return LocationFactory(name="Miscalibrated")
+
+
+@pytest.fixture
+def readings(location):
+    return [
+        AirCompoundReadingFactory(
+            location=location,
+            entered_concentration_value=value,
+            entered_concentration_unit="ug_m3",
+        )
+        for value in (10.0, 20.0, 30.0)
+    ]
+
+
+@pytest.mark.django_db
+class TestBulkReadingUpdate:
+    """Test suite for bulk corrections of filtered readings."""
+
+    def test_matching_readings_are_corrected(self, admin_client, location, readings):
+        """Test that only readings matching the filters are rescaled."""
+        other = AirCompoundReadingFactory(entered_concentration_value=10.0)
+
+        response = admin_client.post(
+            f"{reverse('readings-bulk-update')}?location={location.name}",
+            {"scale": 2, "offset": 1},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"matched": 3, "changed": 3, "dry_run": False}
+        values = AirCompoundReading.objects.filter(location=location).values_list(
+            "entered_concentration_value", flat=True
+        )
+        assert sorted(values) == [21.0, 41.0, 61.0]
+        other.refresh_from_db()
+        assert other.entered_concentration_value == 10.0
+
+    def test_dry_run_only_counts(self, admin_client, location, readings):
+        """Test that a dry run reports the matching readings without changes."""
+        response = admin_client.post(
+            f"{reverse('readings-bulk-update')}?location={location.name}",
+            {"unit": "mg_m3", "dry_run": True},
+            format="json",
+        )
+
+        assert response.json() == {"matched": 3, "changed": 0, "dry_run": True}
+        assert not AirCompoundReading.objects.filter(
+            entered_concentration_unit="mg_m3"
+        ).exists()
+
+    def test_corrections_run_in_batches(self, location, readings):
+        """Test that batches smaller than the selection cover every reading."""
+        version = get_table_version(AirCompoundReading)
+
+        updated = correct_readings(
+            AirCompoundReading.objects.filter(location=location),
+            unit="mg_m3",
+            batch_size=2,
+        )
+
+        assert updated == 3
+        assert (
+            AirCompoundReading.objects.filter(
+                entered_concentration_unit="mg_m3"
+            ).count()
+            == 3
+        )
+        assert get_table_version(AirCompoundReading) != version
+
+    def test_stored_aqi_is_recomputed(self, location):
+        """Test that stored AQI values follow corrected readings."""
+        pm25 = CompoundFactory(symbol="PM2.5")
+        AirCompoundReadingFactory(
+            location=location,
+            compound=pm25,
+            timestamp=HOUR,
+            entered_concentration_value=9.0,
+            entered_concentration_unit="ug_m3",
+        )
+        compute_location_aqi(HOUR, "epa")
+
+        correct_readings(
+            AirCompoundReading.objects.filter(location=location), scale=0.5
+        )
+
+        assert LocationAQI.objects.get(location=location, scale="epa").aqi == 25
+
+    def test_negative_results_are_rejected(self, admin_client, location, readings):
+        """Test that an offset cannot make concentration values negative."""
+        response = admin_client.post(
+            f"{reverse('readings-bulk-update')}?location={location.name}",
+            {"offset": -15},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "offset" in response.json()
+        assert sorted(
+            AirCompoundReading.objects.values_list(
+                "entered_concentration_value", flat=True
+            )
+        ) == [10.0, 20.0, 30.0]
+
+    def test_flags_are_revalidated(self, settings, location):
+        """Test that corrected readings are no longer flagged as out of range."""
+        settings.AIR_QUALITY_READING_VALIDATION = {"MAX_CONCENTRATION_UG_M3": 100}
+        reading = AirCompoundReadingFactory(
+            location=location,
+            entered_concentration_value=1000.0,
+            entered_concentration_unit="ug_m3",
+            is_flagged=True,
+            flag_reason="out_of_range",
+        )
+
+        correct_readings(
+            AirCompoundReading.objects.filter(location=location), scale=0.01
+        )
+
+        reading.refresh_from_db()
+        assert (reading.is_flagged, reading.flag_reason) == (False, "")
+
+    def test_failed_batches_still_invalidate(
+        self, location, readings, django_capture_on_commit_callbacks
+    ):
+        """Test that batches committed before a failure reload recent indexes."""
+        generation = get_recent_index_generation()
+        batches = []
+
+        def fail_after_first_batch(ids):
+            batches.append(ids)
+            if len(batches) > 1:
+                raise RuntimeError("Batch failed")
+            return len(ids)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with pytest.raises(RuntimeError):
+                apply_to_readings(
+                    AirCompoundReading.objects.filter(location=location),
+                    fail_after_first_batch,
+                    batch_size=2,
+                )
+
+        assert get_recent_index_generation() != generation
+
+    def test_gaseous_units_are_checked(self, admin_client, location, readings):
+        """Test that particulate readings cannot be re-labeled as ppm or ppb."""
+        response = admin_client.post(
+            f"{reverse('readings-bulk-update')}?location={location.name}",
+            {"unit": "ppm"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "unit" in response.json()
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "",
+            "?compound=",
+            "?flagged=",
+            "?concentration_unit=ppm",
+            "?within_km=5",
+            "?longitude=1",
+            "?latitude=1&longitude=1",
+        ],
+    )
+    def test_narrowing_filters_are_required(self, admin_client, readings, query):
+        """Test that the whole table cannot be changed without a real filter."""
+        response = admin_client.post(
+            f"{reverse('readings-bulk-update')}{query}", {"scale": 2}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        values = AirCompoundReading.objects.values_list(
+            "entered_concentration_value", flat=True
+        )
+        assert sorted(values) == [10.0, 20.0, 30.0]
+
+    def test_false_boolean_filter_narrows(self, admin_client, readings):
+        """Test that a filter on a false value is a valid restriction."""
+        response = admin_client.post(
+            f"{reverse('readings-bulk-update')}?flagged=false",
+            {"scale": 2, "dry_run": True},
+            format="json",
+        )
+
+        assert response.json()["matched"] == 3
+
+    def test_admin_is_required(self, location, readings):
+        """Test that non-admin users cannot run bulk operations."""
+        api_client = APIClientFactory(user=UserFactory())
+
+        response = api_client.post(
+            f"{reverse('readings-bulk-update')}?location={location.name}",
+            {"scale": 2},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestBulkReadingDelete:
+    """Test suite for bulk deletion of filtered readings."""
+
+    def test_matching_readings_are_deleted(self, admin_client, location, readings):
+        """Test that only readings matching the filters are deleted."""
+        other = AirCompoundReadingFactory()
+
+        response = admin_client.post(
+            f"{reverse('readings-bulk-delete')}?location={location.name}",
+            format="json",
+        )
+
+        assert response.json() == {"matched": 3, "changed": 3, "dry_run": False}
+        assert list(AirCompoundReading.objects.values_list("pk", flat=True)) == [
+            other.pk
+        ]
+
+    def test_stale_aqi_is_removed(self, admin_client, location):
+        """Test that stored AQI values without readings left are removed."""
+        pm25 = CompoundFactory(symbol="PM2.5")
+        AirCompoundReadingFactory(
+            location=location,
+            compound=pm25,
+            timestamp=HOUR,
+            entered_concentration_value=9.0,
+            entered_concentration_unit="ug_m3",
+        )
+        compute_location_aqi(HOUR, "epa")
+
+        admin_client.post(
+            f"{reverse('readings-bulk-delete')}?location={location.name}",
+            format="json",
+        )
+
+        assert not LocationAQI.objects.filter(location=location).exists()
+
+    def test_recent_indexes_are_invalidated(
+        self, admin_client, location, readings, django_capture_on_commit_callbacks
+    ):
+        """Test that deletions make the recent index of every process reload."""
+        generation = get_recent_index_generation()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            admin_client.post(
+                f"{reverse('readings-bulk-delete')}?location={location.name}",
+                format="json",
+            )
+
+        assert get_recent_index_generation() != generation
@@ -0,0 +1,105 @@
+import time
+
+import pytest
+from apps.air_quality.tests.factories import (
+    AirCompoundReadingFactory,
+    LocationFactory,
+    TagFactory,
+)
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+
+from apps.users.tests.factories import UserFactory
+from core.tests.factories import APIClientFactory
+
+
+@pytest.fixture
+def api_client():
+    return APIClientFactory(user=UserFactory())
+
+
+@pytest.fixture(autouse=True)
+def conditional_responses(settings):
+    settings.AIR_QUALITY_CONDITIONAL_RESPONSES = True
+
+
+@pytest.mark.django_db
+class TestConditionalList:
+    """Test suite for conditional GET on list endpoints."""
+
+    @pytest.mark.parametrize(
+        "endpoint", ["locations-list", "readings-list", "compounds-list", "tags-list"]
+    )
+    def test_unchanged_list_returns_not_modified(self, api_client, endpoint):
+        """Test that a matching If-None-Match returns 304 without a body."""
+        AirCompoundReadingFactory(location=LocationFactory(tags=[TagFactory()]))
+        url = reverse(endpoint)
+
+        etag = api_client.get(url)["ETag"]
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+
+    def test_new_row_changes_etag(self, api_client):
+        """Test that creating a row invalidates the previous ETag."""
+        url = reverse("tags-list")
+        etag = api_client.get(url)["ETag"]
+
+        TagFactory()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_updated_row_changes_etag(self, api_client):
+        """Test that renaming a tag invalidates location lists showing it."""
+        tag = TagFactory()
+        LocationFactory(tags=[tag])
+        url = reverse("locations-list")
+        etag = api_client.get(url)["ETag"]
+
+        tag.name = "Renamed"
+        tag.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"]["features"][0]["properties"]["tags"] == [
+            "Renamed"
+        ]
+
+    def test_etag_depends_on_filters(self, api_client):
+        """Test that different query parameters get different ETags."""
+        url = reverse("readings-list")
+
+        first = api_client.get(url, {"concentration_unit": "ppm"})["ETag"]
+        second = api_client.get(url, {"concentration_unit": "ppb"})["ETag"]
+
+        assert first != second
+
+    def test_if_modified_since_does_not_hide_corrections(self, api_client):
+        """Test that a corrected older reading is served despite If-Modified-Since."""
+        reading = AirCompoundReadingFactory(entered_concentration_value=10.0)
+        url = reverse("readings-list")
+        response = api_client.get(url)
+        assert "Last-Modified" not in response
+
+        reading.entered_concentration_value = 20.0
+        reading.save()
+        response = api_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 3600)
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"][0]["concentration_value"] == 20.0
+
+    def test_local_cache_disables_conditional_responses(self, api_client, settings):
+        """Test that versions in a per-process cache are not used as ETags."""
+        del settings.AIR_QUALITY_CONDITIONAL_RESPONSES
+        url = reverse("tags-list")
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH="*")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "ETag" not in response
@@ -0,0 +1,303 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from apps.air_quality.filters import AirCompoundReadingFilterSet
+from apps.air_quality.models import AirCompoundReading, Location
+from apps.air_quality.spatial import (
+    MAX_POLYGON_VERTICES,
+    parse_polygon,
+    parse_polygon_wkb,
+)
+from apps.air_quality.tests.factories import (
+    AirCompoundReadingFactory,
+    CompoundFactory,
+    LocationFactory,
+    TagFactory,
+)
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from django.db import connection, transaction
+from django.urls import reverse
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+
+from apps.users.tests.factories import UserFactory
+from core.tests.factories import APIClientFactory
+
+
+@pytest.fixture
+def api_client():
+    return APIClientFactory(user=UserFactory())
+
+
+def explain_without_seqscan(queryset) -> str:
+    """Returns the query plan of a queryset when sequential scans are disabled."""
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+
+@pytest.fixture
+def tags():
+    return TagFactory.create_batch(3)
+
+
+@pytest.mark.django_db
+class TestLocationTagIds:
+    """Test suite for the denormalized location tag ids."""
+
+    def test_tag_ids_follow_location_tag_changes(self, tags):
+        """Test that adding, removing and clearing tags updates tag ids."""
+        location = LocationFactory()
+
+        location.tags.add(tags[0], tags[1])
+        assert location.tag_ids == [tags[0].pk, tags[1].pk]
+
+        location.tags.remove(tags[0])
+        assert location.tag_ids == [tags[1].pk]
+
+        location.tags.clear()
+        assert location.tag_ids == []
+
+    def test_tag_ids_follow_reverse_changes(self, tags):
+        """Test that changes made from the tag side update tag ids."""
+        locations = LocationFactory.create_batch(2)
+
+        tags[0].anemometers.add(*locations)
+        assert set(
+            Location.objects.filter(tag_ids__contains=[tags[0].pk]).values_list(
+                "pk", flat=True
+            )
+        ) == {location.pk for location in locations}
+
+        tags[0].anemometers.clear()
+        assert not Location.objects.filter(tag_ids__contains=[tags[0].pk]).exists()
+
+    def test_deleted_tag_is_removed_from_tag_ids(self, tags):
+        """Test that deleting a tag removes it from tag ids."""
+        location = LocationFactory(tags=tags[:2])
+
+        tags[0].delete()
+        location.refresh_from_db()
+
+        assert location.tag_ids == [tags[1].pk]
+
+
+@pytest.mark.django_db
+class TestTagFilters:
+    """Test suite for tag filters on locations and readings."""
+
+    def test_readings_matching_several_tags_are_not_duplicated(self, api_client, tags):
+        """Test that a reading matching two requested tags is listed once."""
+        reading = AirCompoundReadingFactory(location=LocationFactory(tags=tags[:2]))
+        AirCompoundReadingFactory(location=LocationFactory(tags=[tags[2]]))
+
+        response = api_client.get(
+            reverse("readings-list"), {"tag": [tags[0].name, tags[1].name]}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["id"] for row in response.json()["results"]] == [reading.pk]
+
+    def test_locations_filtered_by_tag(self, api_client, tags):
+        """Test filtering locations by tag name."""
+        location = LocationFactory(tags=[tags[0]])
+        LocationFactory(tags=[tags[1]])
+
+        response = api_client.get(reverse("locations-list"), {"tag": tags[0].name})
+
+        features = response.json()["results"]["features"]
+        assert [feature["id"] for feature in features] == [location.pk]
+
+    def test_unknown_tag_is_rejected(self, api_client):
+        """Test that unknown tag names are reported as invalid."""
+        response = api_client.get(reverse("readings-list"), {"tag": "unknown"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestSpatialFilters:
+    """Test suite for bounding box and polygon filters."""
+
+    @pytest.fixture
+    def locations(self):
+        return [
+            LocationFactory(coordinates=Point(2.35, 48.85)),
+            LocationFactory(coordinates=Point(4.83, 45.76)),
+            LocationFactory(coordinates=Point(-0.12, 51.5)),
+        ]
+
+    def test_locations_filtered_by_bbox(self, api_client, locations):
+        """Test that only locations within the bounding box are listed."""
+        response = api_client.get(reverse("locations-list"), {"bbox": "0,44,6,50"})
+
+        assert response.status_code == status.HTTP_200_OK
+        features = response.json()["results"]["features"]
+        assert {feature["id"] for feature in features} == {
+            locations[0].pk,
+            locations[1].pk,
+        }
+
+    def test_wide_bbox_follows_parallels(self, api_client):
+        """Test that bbox edges are parallels rather than great circles."""
+        inside = LocationFactory(coordinates=Point(0, 41))
+        LocationFactory(coordinates=Point(0, 55))
+
+        response = api_client.get(reverse("locations-list"), {"bbox": "-60,40,60,50"})
+
+        features = response.json()["results"]["features"]
+        assert [feature["id"] for feature in features] == [inside.pk]
+
+    def test_readings_filtered_by_polygon(self, api_client, locations):
+        """Test that only readings within the polygon are listed."""
+        reading = AirCompoundReadingFactory(location=locations[0])
+        AirCompoundReadingFactory(location=locations[2])
+        polygon = {
+            "type": "Polygon",
+            "coordinates": [[[2, 48], [3, 48], [3, 49], [2, 49], [2, 48]]],
+        }
+
+        response = api_client.get(
+            reverse("readings-list"), {"polygon": json.dumps(polygon)}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["id"] for row in response.json()["results"]] == [reading.pk]
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"bbox": "0,44,6"},
+            {"bbox": "6,44,0,50"},
+            {"bbox": "0,-100,6,50"},
+            {"polygon": "not json"},
+            {"polygon": json.dumps({"type": "Point", "coordinates": [0, 0]})},
+        ],
+    )
+    def test_invalid_spatial_filters(self, api_client, params):
+        """Test that malformed bounding boxes and polygons are rejected."""
+        response = api_client.get(reverse("locations-list"), params)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert set(response.json()) == set(params)
+
+
+class TestParsePolygon:
+    """Test suite for GeoJSON polygon parsing."""
+
+    def test_large_polygons_are_simplified(self):
+        """Test that polygons with many vertices are simplified."""
+        circle = Point(2.35, 48.85).buffer(0.5, quadsegs=1000)
+
+        polygon = parse_polygon(circle.geojson)
+
+        assert polygon.num_coords <= MAX_POLYGON_VERTICES
+        assert polygon.srid == 4326
+        assert polygon.contains(Point(2.35, 48.85))
+
+    def test_polygons_with_too_many_parts_are_rejected(self):
+        """Test that geometries that cannot be simplified enough are rejected."""
+        squares = MultiPolygon(
+            *(
+                Polygon.from_bbox((x, 0, x + 0.5, 0.5))
+                for x in range(MAX_POLYGON_VERTICES // 4)
+            )
+        )
+
+        with pytest.raises(ValidationError):
+            parse_polygon(squares.geojson)
+
+    def test_parsed_polygons_are_cached_but_not_shared(self):
+        """Test that cached polygons are copied for every caller."""
+        geojson = Point(0, 0).buffer(1).geojson
+        first = parse_polygon(geojson)
+        first.srid = 3857
+
+        second = parse_polygon(geojson)
+
+        assert second is not first
+        assert second.srid == 4326
+        assert second.equals(first)
+        assert parse_polygon_wkb.cache_info().hits >= 1
+
+
+@pytest.mark.django_db
+class TestTimeRangeFilters:
+    """Test suite for time-range filters on readings."""
+
+    @pytest.fixture
+    def readings(self):
+        readings = []
+        for day in (1, 2, 3):
+            with freeze_time(datetime(2026, 1, day, tzinfo=timezone.utc)):
+                readings.append(AirCompoundReadingFactory())
+        return readings
+
+    def test_start_and_end_are_half_open(self, api_client, readings):
+        """Test that start is inclusive and end is exclusive."""
+        response = api_client.get(
+            reverse("readings-list"),
+            {"start": "2026-01-01T00:00:00Z", "end": "2026-01-03T00:00:00Z"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert {row["id"] for row in response.json()["results"]} == {
+            readings[0].pk,
+            readings[1].pk,
+        }
+
+    def test_since_id(self, api_client, readings):
+        """Test that since_id lists readings created after the given one."""
+        response = api_client.get(
+            reverse("readings-list"), {"since_id": readings[0].pk}
+        )
+
+        assert {row["id"] for row in response.json()["results"]} == {
+            readings[1].pk,
+            readings[2].pk,
+        }
+
+    @freeze_time("2026-01-03T00:30:00Z")
+    def test_last_minutes(self, api_client, readings):
+        """Test that last_minutes lists recent readings only."""
+        response = api_client.get(reverse("readings-list"), {"last_minutes": 60})
+
+        assert [row["id"] for row in response.json()["results"]] == [readings[2].pk]
+
+    @pytest.mark.parametrize("value", [0, -5, 10_081])
+    def test_invalid_last_minutes(self, api_client, value):
+        """Test that out of range last_minutes values are rejected."""
+        response = api_client.get(reverse("readings-list"), {"last_minutes": value})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "last_minutes" in response.json()
+
+    def test_time_range_composes_with_compound(self, api_client, readings):
+        """Test that time-range filters compose with other filters."""
+        response = api_client.get(
+            reverse("readings-list"),
+            {"start": "2026-01-02T00:00:00Z", "compound": readings[2].compound.symbol},
+        )
+
+        assert [row["id"] for row in response.json()["results"]] == [readings[2].pk]
+
+    def test_time_range_uses_timestamp_index(self):
+        """Test that a time range is resolved through the timestamp index."""
+        filterset = AirCompoundReadingFilterSet(
+            data={"start": "2026-01-01T00:00:00Z", "end": "2026-01-02T00:00:00Z"},
+            queryset=AirCompoundReading.objects.all(),
+        )
+
+        assert "reading_timestamp_idx" in explain_without_seqscan(filterset.qs)
+
+    def test_compound_time_range_uses_composite_index(self):
+        """Test that compound and time range use the composite index."""
+        compound = CompoundFactory()
+        queryset = AirCompoundReading.objects.filter(
+            compound=compound, timestamp__gte=datetime(2026, 1, 1, tzinfo=timezone.utc)
+        )
+
+        assert "reading_compound_time_idx" in explain_without_seqscan(queryset)
@@ -0,0 +1,238 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from apps.air_quality import ingestion
+from apps.air_quality.models import AirCompoundReading, QueuedReading
+from apps.air_quality.tests.factories import (
+    AirCompoundReadingFactory,
+    CompoundFactory,
+    LocationFactory,
+)
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.urls import reverse
+from rest_framework import status
+
+from apps.users.tests.factories import UserFactory
+from core.tests.factories import APIClientFactory
+
+
+@pytest.fixture
+def api_client():
+    return APIClientFactory(user=UserFactory())
+
+
+@pytest.fixture
+def queued_mode(settings):
+    settings.AIR_QUALITY_INGESTION = {
+        "MODE": ingestion.QUEUED_MODE,
+        "MAX_QUEUE_DEPTH": 10,
+        "MAX_ATTEMPTS": 2,
+        "RETRY_DELAY_SECONDS": 0,
+    }
+    cache.delete(ingestion.QUEUE_DEPTH_CACHE_KEY)
+
+
+@pytest.fixture
+def location():
+    return LocationFactory()
+
+
+@pytest.fixture
+def compound():
+    return CompoundFactory(is_gaseous=True, molecular_weight=28)
+
+
+@pytest.fixture
+def reading_data(location, compound):
+    return {
+        "compound": compound.full_name,
+        "location": location.name,
+        "entered_concentration_value": 42.0,
+        "entered_concentration_unit": "ug_m3",
+    }
+
+
+def queue_entries(location, compound, count, value=1.0):
+    return QueuedReading.objects.bulk_create(
+        [
+            QueuedReading(
+                location=location,
+                compound=compound,
+                entered_concentration_value=value,
+                entered_concentration_unit="ug_m3",
+            )
+            for _ in range(count)
+        ]
+    )
+
+
+@pytest.mark.django_db
+class TestQueuedIngestion:
+    """Test suite for the queued ingestion mode."""
+
+    def test_create_reading_is_acknowledged_and_queued(
+        self, api_client, queued_mode, reading_data
+    ):
+        """Test that readings are queued instead of written in queued mode."""
+        response = api_client.post(
+            reverse("readings-list"), reading_data, format="json"
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json()["status"] == QueuedReading.PENDING
+        assert QueuedReading.objects.count() == 1
+        assert not AirCompoundReading.objects.exists()
+
+    def test_invalid_reading_is_rejected_before_queueing(
+        self, api_client, queued_mode, reading_data
+    ):
+        """Test that validation still happens synchronously."""
+        reading_data["entered_concentration_unit"] = "invalid_unit"
+
+        response = api_client.post(
+            reverse("readings-list"), reading_data, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not QueuedReading.objects.exists()
+
+    def test_full_queue_applies_backpressure(
+        self, api_client, queued_mode, reading_data, location, compound
+    ):
+        """Test that a full queue rejects new readings with 429."""
+        queue_entries(location, compound, count=10)
+
+        response = api_client.post(
+            reverse("readings-list"), reading_data, format="json"
+        )
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert QueuedReading.objects.count() == 10
+
+    def test_queue_stats(self, api_client, location, compound):
+        """Test retrieving the queue depth and lag."""
+        queue_entries(location, compound, count=3)
+
+        response = api_client.get(reverse("readings-queue-stats"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["pending"] == 3
+        assert response.json()["dead"] == 0
+
+
+@pytest.mark.django_db
+class TestDrainBatch:
+    """Test suite for the ingestion worker."""
+
+    def test_batch_is_written_and_removed_from_queue(self, location, compound):
+        """Test that a batch is bulk inserted and dequeued."""
+        queue_entries(location, compound, count=5)
+
+        result = ingestion.drain_batch(batch_size=3)
+
+        assert result.stored == 3
+        assert AirCompoundReading.objects.count() == 3
+        assert QueuedReading.objects.count() == 2
+
+    def test_failing_entries_are_retried_then_dead_lettered(
+        self, queued_mode, monkeypatch, location, compound
+    ):
+        """Test that failing entries are isolated, retried and dead-lettered."""
+        queue_entries(location, compound, count=2, value=1.0)
+        [poisoned] = queue_entries(location, compound, count=1, value=-1.0)
+        store_readings = ingestion.store_readings
+
+        def failing_store_readings(readings):
+            if any(reading.entered_concentration_value < 0 for reading in readings):
+                raise DatabaseError("negative concentration")
+            return store_readings(readings)
+
+        monkeypatch.setattr(ingestion, "store_readings", failing_store_readings)
+
+        first = ingestion.drain_batch()
+        second = ingestion.drain_batch()
+        poisoned.refresh_from_db()
+
+        assert (first.stored, first.retried, first.dead) == (2, 1, 0)
+        assert (second.stored, second.retried, second.dead) == (0, 0, 1)
+        assert poisoned.status == QueuedReading.DEAD
+        assert "negative concentration" in poisoned.last_error
+        assert AirCompoundReading.objects.count() == 2
+
+
+@pytest.mark.django_db
+class TestIdempotentIngestion:
+    """Test suite for measurement timestamps and idempotent upserts."""
+
+    MEASURED_AT = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+
+    def test_retried_reading_is_upserted(self, api_client, reading_data):
+        """Test that posting the same measurement twice keeps one row."""
+        reading_data["timestamp"] = self.MEASURED_AT.isoformat()
+        first = api_client.post(reverse("readings-list"), reading_data, format="json")
+        reading_data["entered_concentration_value"] = 43.0
+        second = api_client.post(reverse("readings-list"), reading_data, format="json")
+
+        assert first.status_code == second.status_code == status.HTTP_201_CREATED
+        assert first.json()["id"] == second.json()["id"]
+        reading = AirCompoundReading.objects.get()
+        assert reading.timestamp == self.MEASURED_AT
+        assert reading.entered_concentration_value == 43.0
+
+    def test_future_timestamp_is_rejected(self, api_client, reading_data):
+        """Test that measurement times in the future are rejected."""
+        reading_data["timestamp"] = (
+            datetime.now(tz=timezone.utc) + timedelta(hours=1)
+        ).isoformat()
+
+        response = api_client.post(
+            reverse("readings-list"), reading_data, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "timestamp" in response.json()
+
+    def test_update_to_duplicate_measurement_is_rejected(
+        self, api_client, location, compound, reading_data
+    ):
+        """Test that an update cannot duplicate another measurement."""
+        existing = AirCompoundReadingFactory(location=location, compound=compound)
+        reading = AirCompoundReadingFactory(location=location, compound=compound)
+        reading_data["timestamp"] = existing.timestamp.isoformat()
+
+        response = api_client.put(
+            reverse("readings-detail", args=[reading.pk]), reading_data, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_duplicates_within_a_batch_are_collapsed(self, location, compound):
+        """Test that a batch with repeated measurements stores the last one."""
+        readings = [
+            AirCompoundReading(
+                location=location,
+                compound=compound,
+                entered_concentration_value=value,
+                entered_concentration_unit="ug_m3",
+                timestamp=self.MEASURED_AT,
+            )
+            for value in (1.0, 2.0)
+        ]
+
+        ingestion.store_readings(readings)
+
+        assert AirCompoundReading.objects.get().entered_concentration_value == 2.0
+
+    def test_queued_readings_keep_their_timestamp(
+        self, api_client, queued_mode, reading_data
+    ):
+        """Test that the measurement time survives the ingestion queue."""
+        reading_data["timestamp"] = self.MEASURED_AT.isoformat()
+        api_client.post(reverse("readings-list"), reading_data, format="json")
+        api_client.post(reverse("readings-list"), reading_data, format="json")
+
+        result = ingestion.drain_batch()
+
+        assert result.stored == 2
+        assert AirCompoundReading.objects.get().timestamp == self.MEASURED_AT
@@ -0,0 +1,196 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from apps.air_quality.interpolation import (
+    get_grid_shape,
+    get_interpolated_grid,
+    interpolate_idw,
+)
+from apps.air_quality.spatial import parse_bbox
+from apps.air_quality.tests.factories import (
+    AirCompoundReadingFactory,
+    CompoundFactory,
+    LocationFactory,
+)
+from django.contrib.gis.geos import Point
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework import status
+
+from apps.users.tests.factories import UserFactory
+from core.tests.factories import APIClientFactory
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def api_client():
+    return APIClientFactory(user=UserFactory())
+
+
+@pytest.fixture
+def compound():
+    return CompoundFactory(symbol="PM10")
+
+
+@pytest.fixture
+def stations(compound):
+    for longitude, value in ((0.25, 10.0), (1.75, 20.0)):
+        AirCompoundReadingFactory(
+            location=LocationFactory(coordinates=Point(longitude, 0.5, srid=4326)),
+            compound=compound,
+            entered_concentration_value=value,
+            entered_concentration_unit="ug_m3",
+        )
+
+
+def query_params(compound, **params):
+    now = timezone.now()
+    return {
+        "bbox": "0,0,2,1",
+        "resolution": 4,
+        "compound": compound.symbol,
+        "concentration_unit": "ug_m3",
+        "start_date": (now - timedelta(hours=1)).isoformat(),
+        "end_date": (now + timedelta(hours=1)).isoformat(),
+        **params,
+    }
+
+
+class TestInterpolateIDW:
+    """Test suite for inverse distance weighting."""
+
+    def test_cells_are_weighted_by_inverse_distance(self):
+        """Test that cells lean towards their closest station."""
+        grid = interpolate_idw(
+            lons=np.array([0.25, 1.75]),
+            lats=np.array([0.5, 0.5]),
+            values=np.array([10.0, 20.0]),
+            extent=(0, 0, 2, 1),
+            shape=(2, 4),
+            power=2,
+            neighbors=8,
+        )
+
+        assert grid.shape == (2, 4)
+        assert np.all(np.diff(grid, axis=1) > 0)
+        np.testing.assert_allclose(grid[:, 1] + grid[:, 2], 30.0, rtol=1e-6)
+
+    def test_cells_on_a_station_take_its_value(self):
+        """Test that a cell center on a station is not averaged."""
+        grid = interpolate_idw(
+            lons=np.array([0.5, 1.5]),
+            lats=np.array([0.5, 0.5]),
+            values=np.array([10.0, 20.0]),
+            extent=(0, 0, 2, 1),
+            shape=(1, 2),
+            power=2,
+            neighbors=1,
+        )
+
+        np.testing.assert_array_equal(grid, [[10.0, 20.0]])
+
+    def test_grid_shape_keeps_cells_square(self):
+        """Test that the grid height follows the bounding box aspect ratio."""
+        assert get_grid_shape((0, 0, 2, 1), resolution=100) == (50, 100)
+
+
+@pytest.mark.django_db
+class TestInterpolationView:
+    """Test suite for the interpolation endpoint."""
+
+    def test_json_grid(self, api_client, compound, stations):
+        """Test that the grid is returned as rows of values."""
+        response = api_client.get(
+            reverse("readings-interpolation"), query_params(compound)
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert (data["width"], data["height"], data["stations"]) == (4, 2, 2)
+        assert data["bbox"] == [0.0, 0.0, 2.0, 1.0]
+        assert len(data["values"]) == 2
+        assert 10.0 < data["values"][0][0] < data["values"][0][3] < 20.0
+        assert (data["min"], data["max"]) == (
+            min(data["values"][0]),
+            max(data["values"][0]),
+        )
+
+    def test_png_grid(self, api_client, compound, stations):
+        """Test that the grid can be negotiated as a PNG image."""
+        response = api_client.get(
+            reverse("readings-interpolation"),
+            query_params(compound),
+            HTTP_ACCEPT="image/png",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "image/png"
+        assert response.content.startswith(b"\x89PNG\r\n\x1a\n")
+        assert float(response["X-Value-Min"]) > 10.0
+
+    def test_no_stations(self, api_client, compound):
+        """Test that a box without stations returns an empty grid."""
+        response = api_client.get(
+            reverse("readings-interpolation"), query_params(compound)
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert (response.json()["stations"], response.json()["values"]) == (0, None)
+
+    def test_invalid_bbox(self, api_client, compound):
+        """Test that malformed bounding boxes are rejected."""
+        response = api_client.get(
+            reverse("readings-interpolation"), query_params(compound, bbox="2,0,0,1")
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_grids_are_cached(self, compound, stations, django_assert_num_queries):
+        """Test that repeated requests are served from the cache."""
+        now = timezone.now()
+        data = {
+            "bbox": parse_bbox("0,0,2,1"),
+            "resolution": 4,
+            "compound": compound,
+            "concentration_unit": "ug_m3",
+            "start_date": now - timedelta(hours=1),
+            "end_date": now + timedelta(hours=1),
+        }
+        first = get_interpolated_grid(data)
+
+        with django_assert_num_queries(0):
+            second = get_interpolated_grid(data)
+
+        np.testing.assert_array_equal(first["values"], second["values"])
+
+    def test_ingestion_does_not_invalidate_grids(self, compound, stations):
+        """Test that grids of live windows are reused within a time bucket."""
+        with freeze_time() as frozen:
+            now = timezone.now()
+            data = {
+                "bbox": parse_bbox("0,0,2,1"),
+                "resolution": 4,
+                "compound": compound,
+                "concentration_unit": "ug_m3",
+                "start_date": now - timedelta(hours=1),
+                "end_date": now + timedelta(hours=1),
+            }
+            get_interpolated_grid(data)
+            AirCompoundReadingFactory(
+                location=LocationFactory(coordinates=Point(1, 0.5, srid=4326)),
+                compound=compound,
+            )
+
+            cached = get_interpolated_grid(data)
+            frozen.tick(timedelta(minutes=1))
+            refreshed = get_interpolated_grid(data)
+
+        assert cached["stations"] == 2
+        assert refreshed["stations"] == 3
@@ -0,0 +1,150 @@
+from datetime import timedelta
+
+import pytest
+from apps.air_quality.models import LocationNeighbor
+from apps.air_quality.neighbors import refresh_location_neighbors
+from apps.air_quality.tests.factories import (
+    AirCompoundReadingFactory,
+    CompoundFactory,
+    LocationFactory,
+)
+from django.contrib.gis.geos import Point
+from django.db.models import QuerySet
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.users.tests.factories import UserFactory
+from core.tests.factories import APIClientFactory
+
+
+@pytest.fixture
+def api_client():
+    return APIClientFactory(user=UserFactory())
+
+
+@pytest.fixture
+def locations(django_capture_on_commit_callbacks):
+    """Three stations about 0, 56 and 222 km away from the first one."""
+    with django_capture_on_commit_callbacks(execute=True):
+        return [
+            LocationFactory(name=name, coordinates=Point(0, latitude, srid=4326))
+            for name, latitude in (("Origin", 0), ("Near", 0.5), ("Far", 2))
+        ]
+
+
+def get_neighbors(location):
+    return dict(
+        LocationNeighbor.objects.filter(location=location).values_list(
+            "neighbor__name", "distance_km"
+        )
+    )
+
+
+@pytest.mark.django_db
+class TestLocationNeighbors:
+    """Test suite for the precomputed location neighbor table."""
+
+    def test_neighbors_within_max_radius_are_stored(self, locations):
+        """Test that pairs are stored both ways up to the maximum radius."""
+        origin, near, far = locations
+
+        assert get_neighbors(origin) == {"Near": pytest.approx(55.3, abs=0.1)}
+        assert get_neighbors(near) == {"Origin": pytest.approx(55.3, abs=0.1)}
+        assert get_neighbors(far) == {}
+
+    def test_moved_location_is_refreshed(
+        self, locations, django_capture_on_commit_callbacks
+    ):
+        """Test that changing coordinates recomputes the location pairs."""
+        origin, near, far = locations
+        far.coordinates = Point(0, 1, srid=4326)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            far.save()
+
+        assert set(get_neighbors(far)) == {"Origin", "Near"}
+        assert set(get_neighbors(origin)) == {"Near", "Far"}
+
+    def test_pairs_stored_concurrently_are_overwritten(self, locations, monkeypatch):
+        """Test that pairs inserted by a concurrent refresh do not conflict."""
+        origin, near, far = locations
+        LocationNeighbor.objects.filter(location=origin).update(distance_km=0)
+        monkeypatch.setattr(QuerySet, "delete", lambda self: (0, {}))
+
+        refresh_location_neighbors([origin.pk])
+
+        assert get_neighbors(origin) == {"Near": pytest.approx(55.3, abs=0.1)}
+
+    def test_full_rebuild(self, locations, settings):
+        """Test that a rebuild applies a new maximum radius."""
+        settings.AIR_QUALITY_LOCATION_NEIGHBORS = {"MAX_RADIUS_KM": 300}
+
+        assert refresh_location_neighbors() == 6
+
+
+@pytest.mark.django_db
+class TestNearFilters:
+    """Test suite for filters around a known station."""
+
+    def test_locations_near_a_station(self, api_client, locations):
+        """Test that a station and its neighbors within the distance match."""
+        response = api_client.get(
+            reverse("locations-list"), {"near": "Origin", "within_km": 60}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        names = {
+            feature["properties"]["name"]
+            for feature in response.json()["results"]["features"]
+        }
+        assert names == {"Origin", "Near"}
+
+    def test_distances_beyond_the_table_fall_back_to_dwithin(
+        self, api_client, locations
+    ):
+        """Test that distances above the maximum radius still match."""
+        response = api_client.get(
+            reverse("locations-list"), {"near": "Origin", "within_km": 250}
+        )
+
+        names = {
+            feature["properties"]["name"]
+            for feature in response.json()["results"]["features"]
+        }
+        assert names == {"Origin", "Near", "Far"}
+
+    def test_distance_is_required(self, api_client, locations):
+        """Test that near without a distance is rejected."""
+        response = api_client.get(reverse("locations-list"), {"near": "Origin"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_radius_stats_around_a_station(self, api_client, locations):
+        """Test that radius statistics can be centered on a station."""
+        origin, near, far = locations
+        compound = CompoundFactory()
+        for location, value in ((origin, 10.0), (near, 20.0), (far, 90.0)):
+            AirCompoundReadingFactory(
+                location=location,
+                compound=compound,
+                entered_concentration_value=value,
+                entered_concentration_unit="ug_m3",
+            )
+        now = timezone.now()
+
+        response = api_client.get(
+            reverse("stats-radius-readings"),
+            {
+                "location": "Origin",
+                "radius": 60,
+                "compound": compound.symbol,
+                "concentration_unit": "ug_m3",
+                "start_date": (now - timedelta(hours=1)).isoformat(),
+                "end_date": (now + timedelta(hours=1)).isoformat(),
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["stats"]["max_concentration"] == 20.0
+        assert (response.json()["longitude"], response.json()["latitude"]) == (0, 0)
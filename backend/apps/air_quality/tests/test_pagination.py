@@ -0,0 +1,101 @@
+import pytest
+from apps.air_quality.models import AirCompoundReading
+from apps.air_quality.pagination import estimate_count
+from apps.air_quality.tests.factories import AirCompoundReadingFactory, LocationFactory
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from apps.users.tests.factories import UserFactory
+from core.tests.factories import APIClientFactory
+
+
+@pytest.fixture
+def api_client():
+    return APIClientFactory(user=UserFactory())
+
+
+@pytest.mark.django_db
+class TestCountModePagination:
+    """Test suite for pagination without exact counts."""
+
+    def test_uncounted_pages(self, api_client):
+        """Test that pages are linked without counting the rows."""
+        AirCompoundReadingFactory.create_batch(12)
+        url = reverse("readings-list")
+
+        with CaptureQueriesContext(connection) as queries:
+            first = api_client.get(url, {"count": "none"})
+        last = api_client.get(first.json()["next"])
+
+        assert first.status_code == status.HTTP_200_OK
+        assert first.json()["count"] is None
+        assert len(first.json()["results"]) == 10
+        assert first.json()["previous"] is None
+        assert "page=2" in first.json()["next"]
+        assert len(last.json()["results"]) == 2
+        assert last.json()["next"] is None
+        assert last.json()["previous"] is not None
+        assert not any("COUNT(" in query["sql"] for query in queries.captured_queries)
+
+    def test_full_last_page_has_no_next(self, api_client):
+        """Test that a page exactly filled by the last rows has no next page."""
+        AirCompoundReadingFactory.create_batch(10)
+
+        response = api_client.get(reverse("readings-list"), {"count": "none"})
+
+        assert len(response.json()["results"]) == 10
+        assert response.json()["next"] is None
+
+    def test_pages_past_the_end_are_not_found(self, api_client):
+        """Test that an empty page past the results is reported as missing."""
+        AirCompoundReadingFactory()
+
+        response = api_client.get(
+            reverse("readings-list"), {"count": "none", "page": 2}
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_estimated_count(self, api_client):
+        """Test that the estimate mode reports a planner row estimate."""
+        location = LocationFactory()
+        AirCompoundReadingFactory.create_batch(3, location=location)
+        AirCompoundReadingFactory()
+
+        response = api_client.get(
+            reverse("readings-list"),
+            {"count": "estimate", "location": location.name},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.json()["count"], int)
+        assert len(response.json()["results"]) == 3
+
+    def test_unfiltered_estimate_reads_table_statistics(self):
+        """Test that analyzed tables are estimated from their statistics."""
+        AirCompoundReadingFactory.create_batch(5)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE air_quality_aircompoundreading")
+
+        assert estimate_count(AirCompoundReading.objects.all()) == 5
+
+    def test_exact_count_is_the_default(self, api_client):
+        """Test that pages are counted exactly, once, unless asked otherwise."""
+        AirCompoundReadingFactory.create_batch(12)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(reverse("readings-list"))
+
+        assert response.json()["count"] == 12
+        counts = [
+            query for query in queries.captured_queries if "COUNT(" in query["sql"]
+        ]
+        assert len(counts) == 1
+
+    def test_unknown_count_mode(self, api_client):
+        """Test that unknown count modes are rejected."""
+        response = api_client.get(reverse("readings-list"), {"count": "maybe"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,321 @@
+from datetime import timedelta
+
+import pytest
+from apps.air_quality import ingestion
+from apps.air_quality.conversions import get_qs_with_converted_concentration
+from apps.air_quality.models import AirCompoundReading
+from apps.air_quality.recent import (
+    convert_values,
+    get_recent_index,
+    invalidate_recent_index,
+    recent_index,
+)
+from apps.air_quality.tests.factories import (
+    AirCompoundReadingFactory,
+    CompoundFactory,
+    LocationFactory,
+)
+from apps.air_quality.views import AirCompoundStatsWithinRadiusView
+from django.contrib.gis.geos import Point
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.users.tests.factories import UserFactory
+from core.tests.factories import APIClientFactory
+
+UNITS = ["ug_m3", "mg_m3", "ppm", "ppb"]
+
+
+@pytest.fixture(autouse=True)
+def enable_recent_index(settings):
+    settings.AIR_QUALITY_RECENT_INDEX = {
+        "ENABLED": True,
+        "HOURS": 48,
+        "REFRESH_SECONDS": 0,
+    }
+    recent_index.clear()
+    yield
+    recent_index.clear()
+
+
+@pytest.fixture
+def api_client():
+    return APIClientFactory(user=UserFactory())
+
+
+@pytest.fixture
+def compound():
+    return CompoundFactory(is_gaseous=True, molecular_weight=46)
+
+
+@pytest.fixture
+def location():
+    return LocationFactory(coordinates=Point(0, 0, srid=4326))
+
+
+def radius_query(compound, **data):
+    now = timezone.now()
+    return {
+        "longitude": 0.0,
+        "latitude": 0.0,
+        "radius": 10.0,
+        "compound": compound,
+        "concentration_unit": "ppb",
+        "start_date": now - timedelta(hours=1),
+        "end_date": now + timedelta(minutes=1),
+        "exclude_flagged": True,
+        **data,
+    }
+
+
+@pytest.mark.django_db
+class TestRecentReadingsIndex:
+    """Test suite for the in-memory recent readings index."""
+
+    @pytest.mark.parametrize("is_gaseous", [True, False])
+    def test_conversions_match_the_database(self, is_gaseous):
+        """Test that in-memory conversions give the database results."""
+        compound = CompoundFactory(is_gaseous=is_gaseous, molecular_weight=28.01)
+        for unit in UNITS:
+            AirCompoundReadingFactory(
+                compound=compound,
+                entered_concentration_value=42.0,
+                entered_concentration_unit=unit,
+            )
+        index = get_recent_index(start=timezone.now() - timedelta(hours=1))
+        columns = index.columns()
+
+        for target_unit in UNITS:
+            expected = dict(
+                get_qs_with_converted_concentration(
+                    AirCompoundReading.objects.all(), target_unit
+                ).values_list("entered_concentration_unit", "concentration_value")
+            )
+            converted = convert_values(index, columns, target_unit)
+            actual = {
+                UNITS[unit]: None if value != value else pytest.approx(value)
+                for unit, value in zip(columns.units.tolist(), converted.tolist())
+            }
+            assert actual == expected
+
+    def test_radius_stats_match_the_database(self, compound, location):
+        """Test that radius statistics are the same with and without the index."""
+        far_location = LocationFactory(coordinates=Point(1, 1, srid=4326))
+        for value, unit, reading_location in (
+            (10.0, "ug_m3", location),
+            (0.02, "ppm", location),
+            (500.0, "ppb", far_location),
+        ):
+            AirCompoundReadingFactory(
+                location=reading_location,
+                compound=compound,
+                entered_concentration_value=value,
+                entered_concentration_unit=unit,
+            )
+        view = AirCompoundStatsWithinRadiusView()
+
+        from_index = view.get_radius_stats(radius_query(compound))
+        from_database = view.get_radius_stats(
+            radius_query(compound, exclude_flagged=False)
+        )
+
+        assert from_index == from_database
+        assert from_index["max_concentration"] == 20.0
+
+    def test_older_windows_fall_back_to_the_database(self, compound):
+        """Test that windows starting before the index are not answered by it."""
+        assert get_recent_index(start=timezone.now() - timedelta(hours=72)) is None
+
+    def test_ingested_readings_are_added_without_reloading(
+        self, compound, location, django_capture_on_commit_callbacks
+    ):
+        """Test that the ingest path keeps a warm index up to date."""
+        get_recent_index(start=timezone.now())
+        with django_capture_on_commit_callbacks(execute=True):
+            ingestion.store_readings(
+                [
+                    AirCompoundReading(
+                        location=location,
+                        compound=compound,
+                        entered_concentration_value=5.0,
+                        entered_concentration_unit="ug_m3",
+                    )
+                ]
+            )
+
+        assert len(recent_index.columns()) == 1
+
+    def test_deleted_readings_are_discarded(
+        self, compound, location, django_capture_on_commit_callbacks
+    ):
+        """Test that deleted readings leave the index."""
+        reading = AirCompoundReadingFactory(location=location, compound=compound)
+        get_recent_index(start=timezone.now() - timedelta(hours=1))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            reading.delete()
+
+        assert len(recent_index.columns()) == 0
+
+    def test_readings_stored_elsewhere_are_pulled(self, compound, location):
+        """Test that readings written by other processes are refreshed."""
+        get_recent_index(start=timezone.now())
+        AirCompoundReading.objects.bulk_create(
+            [
+                AirCompoundReading(
+                    location=location,
+                    compound=compound,
+                    entered_concentration_value=5.0,
+                    entered_concentration_unit="ug_m3",
+                )
+            ]
+        )
+
+        get_recent_index(start=timezone.now())
+
+        assert len(recent_index.columns()) == 1
+
+    def test_local_additions_do_not_skip_other_processes_rows(
+        self, compound, location, django_capture_on_commit_callbacks
+    ):
+        """Test that a row stored elsewhere is pulled after a newer local add."""
+        get_recent_index(start=timezone.now())
+        [elsewhere] = AirCompoundReading.objects.bulk_create(
+            [
+                AirCompoundReading(
+                    location=location,
+                    compound=compound,
+                    entered_concentration_value=5.0,
+                    entered_concentration_unit="ug_m3",
+                )
+            ]
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            local = AirCompoundReadingFactory(location=location, compound=compound)
+
+        get_recent_index(start=timezone.now())
+
+        assert local.pk > elsewhere.pk
+        assert len(recent_index.columns()) == 2
+
+    def test_rows_committed_out_of_order_are_pulled(self, compound, location):
+        """Test that a row committed after a refresh that missed it is pulled."""
+        get_recent_index(start=timezone.now())
+        reading = AirCompoundReadingFactory(location=location, compound=compound)
+        AirCompoundReading.objects.filter(pk=reading.pk).update(
+            updated_at=recent_index.watermark - timedelta(seconds=30)
+        )
+
+        get_recent_index(start=timezone.now())
+
+        assert len(recent_index.columns()) == 1
+
+    def test_upserted_readings_reload_every_index(
+        self, compound, location, django_capture_on_commit_callbacks
+    ):
+        """Test that overwriting a stored reading starts a new generation."""
+        reading = AirCompoundReadingFactory(
+            location=location,
+            compound=compound,
+            entered_concentration_value=5.0,
+            entered_concentration_unit="ug_m3",
+        )
+        get_recent_index(start=timezone.now() - timedelta(hours=1))
+        generation = recent_index.generation
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ingestion.store_readings(
+                [
+                    AirCompoundReading(
+                        location=location,
+                        compound=compound,
+                        timestamp=reading.timestamp,
+                        entered_concentration_value=9.0,
+                        entered_concentration_unit="ug_m3",
+                    )
+                ]
+            )
+
+        index = get_recent_index(start=timezone.now() - timedelta(hours=1))
+        assert index.generation != generation
+        assert index.columns().values.tolist() == [9.0]
+
+    def test_pulled_rows_are_not_duplicated(self, compound, location):
+        """Test that rows pulled again replace the copies already held."""
+        AirCompoundReadingFactory.create_batch(2, location=location, compound=compound)
+        get_recent_index(start=timezone.now() - timedelta(hours=1))
+        recent_index.watermark -= timedelta(hours=1)
+
+        get_recent_index(start=timezone.now() - timedelta(hours=1))
+
+        assert len(recent_index.columns()) == 2
+
+    def test_invalidated_index_is_reloaded(self, compound, location):
+        """Test that an invalidation published by any process reloads the index."""
+        reading = AirCompoundReadingFactory(
+            location=location,
+            compound=compound,
+            entered_concentration_value=5.0,
+            entered_concentration_unit="ug_m3",
+        )
+        get_recent_index(start=timezone.now() - timedelta(hours=1))
+        AirCompoundReading.objects.filter(pk=reading.pk).update(
+            entered_concentration_value=9.0
+        )
+
+        invalidate_recent_index()
+        index = get_recent_index(start=timezone.now() - timedelta(hours=1))
+
+        assert index.columns().values.tolist() == [9.0]
+
+
+@pytest.mark.django_db
+class TestRecentReadingViews:
+    """Test suite for views answered by the recent readings index."""
+
+    def test_latest_readings(self, api_client, compound, location, settings):
+        """Test that the latest reading of each pair is the same from both sources."""
+        now = timezone.now()
+        for minutes, value in ((30, 1.0), (10, 2.0)):
+            AirCompoundReadingFactory(
+                location=location,
+                compound=compound,
+                timestamp=now - timedelta(minutes=minutes),
+                entered_concentration_value=value,
+                entered_concentration_unit="ug_m3",
+            )
+        params = {"compound": compound.symbol, "concentration_unit": "ug_m3"}
+
+        from_index = api_client.get(reverse("readings-latest"), params)
+        settings.AIR_QUALITY_RECENT_INDEX = {"ENABLED": False}
+        from_database = api_client.get(reverse("readings-latest"), params)
+
+        assert from_index.status_code == status.HTTP_200_OK
+        assert from_index.json() == from_database.json()
+        assert [row["concentration_value"] for row in from_index.json()] == [2.0]
+
+    def test_series(self, api_client, compound, location):
+        """Test that readings are returned as time-ordered columns."""
+        now = timezone.now()
+        for minutes, value in ((10, 2.0), (30, 1.0)):
+            AirCompoundReadingFactory(
+                location=location,
+                compound=compound,
+                timestamp=now - timedelta(minutes=minutes),
+                entered_concentration_value=value,
+                entered_concentration_unit="mg_m3",
+            )
+        params = {
+            "location": location.name,
+            "compound": compound.symbol,
+            "concentration_unit": "ug_m3",
+            "start_date": (now - timedelta(hours=1)).isoformat(),
+            "end_date": now.isoformat(),
+        }
+
+        response = api_client.get(reverse("readings-series"), params)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["values"] == [1000.0, 2000.0]
+        assert len(response.json()["timestamps"]) == 2
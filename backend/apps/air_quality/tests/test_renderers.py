@@ -0,0 +1,97 @@
+import pytest
+from apps.air_quality.renderers import to_columnar
+from apps.air_quality.tests.factories import AirCompoundReadingFactory, LocationFactory
+from django.urls import reverse
+from rest_framework import status
+
+from apps.users.tests.factories import UserFactory
+from core.tests.factories import APIClientFactory
+
+
+@pytest.fixture
+def api_client():
+    return APIClientFactory(user=UserFactory())
+
+
+class TestToColumnar:
+    """Test suite for the columnar layout conversion."""
+
+    def test_rows_are_converted_to_dictionary_encoded_columns(self):
+        """Test that rows become parallel arrays with encoded repeated values."""
+        rows = [
+            {"id": 1, "location": "A", "value": 1.0},
+            {"id": 2, "location": "B", "value": 2.0},
+            {"id": 3, "location": "A", "value": 3.0},
+        ]
+
+        assert to_columnar(rows, dictionary_encoded_fields=("location",)) == {
+            "length": 3,
+            "columns": {
+                "id": [1, 2, 3],
+                "location": [0, 1, 0],
+                "value": [1.0, 2.0, 3.0],
+            },
+            "dictionaries": {"location": ["A", "B"]},
+        }
+
+    def test_pagination_keys_are_kept(self):
+        """Test that paginated payloads keep their pagination keys."""
+        data = {"count": 0, "next": None, "previous": None, "results": []}
+
+        assert to_columnar(data) == {
+            "count": 0,
+            "next": None,
+            "previous": None,
+            "length": 0,
+            "columns": {},
+            "dictionaries": {},
+        }
+
+    def test_non_list_payloads_are_unchanged(self):
+        """Test that errors and single objects are rendered as is."""
+        assert to_columnar({"detail": "Not found."}) == {"detail": "Not found."}
+
+
+@pytest.mark.django_db
+class TestReadingRenderers:
+    """Test suite for negotiated reading renderers."""
+
+    def test_columnar_readings(self, api_client):
+        """Test requesting readings in the columnar layout."""
+        location = LocationFactory()
+        readings = AirCompoundReadingFactory.create_batch(3, location=location)
+
+        response = api_client.get(
+            reverse("readings-list"),
+            HTTP_ACCEPT="application/vnd.airquality.columnar+json",
+        )
+        data = response.json()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert data["count"] == 3
+        assert sorted(data["columns"]["id"]) == sorted(r.pk for r in readings)
+        assert data["columns"]["location"] == [0, 0, 0]
+        assert data["dictionaries"]["location"] == [location.name]
+
+    def test_msgpack_readings(self, api_client):
+        """Test requesting readings as MessagePack."""
+        msgpack = pytest.importorskip("msgpack")
+        reading = AirCompoundReadingFactory()
+
+        response = api_client.get(reverse("readings-list"), {"format": "msgpack"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/msgpack"
+        assert msgpack.unpackb(response.content)["results"][0]["id"] == reading.pk
+
+    def test_location_readings_support_columnar_format(self, api_client):
+        """Test that location readings negotiate the same renderers."""
+        reading = AirCompoundReadingFactory()
+
+        response = api_client.get(
+            reverse("locations-get-readings", args=[reading.location.pk]),
+            {"format": "columnar"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["columns"]["id"] == [reading.pk]
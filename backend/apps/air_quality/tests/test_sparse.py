@@ -0,0 +1,109 @@
+import pytest
+from apps.air_quality.tests.factories import (
+    AirCompoundReadingFactory,
+    LocationFactory,
+    TagFactory,
+)
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from apps.users.tests.factories import UserFactory
+from core.tests.factories import APIClientFactory
+
+
+@pytest.fixture
+def api_client():
+    return APIClientFactory(user=UserFactory())
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """Test suite for field selection on list and detail endpoints."""
+
+    def test_location_fields_are_trimmed(self, api_client):
+        """Test that unselected location fields are neither loaded nor returned."""
+        location = LocationFactory(tags=[TagFactory()])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(reverse("locations-list"), {"fields": "name"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"]["features"] == [
+            {
+                "id": location.pk,
+                "type": "Feature",
+                "geometry": None,
+                "properties": {"name": location.name},
+            }
+        ]
+        sql = " ".join(query["sql"] for query in queries.captured_queries)
+        assert "air_quality_tag" not in sql
+        assert '"air_quality_location"."coordinates"' not in sql
+
+    def test_location_tags_are_prefetched_when_selected(self, api_client):
+        """Test that selected tags are still returned."""
+        tag = TagFactory()
+        LocationFactory(tags=[tag])
+
+        response = api_client.get(
+            reverse("locations-list"), {"fields": "tags,coordinates"}
+        )
+
+        feature = response.json()["results"]["features"][0]
+        assert feature["properties"] == {"tags": [tag.name]}
+        assert feature["geometry"]["type"] == "Point"
+
+    def test_reading_fields_are_trimmed(self, api_client):
+        """Test that readings can be listed without their relations."""
+        reading = AirCompoundReadingFactory(
+            entered_concentration_value=12.5, entered_concentration_unit="ug_m3"
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(
+                reverse("readings-list"), {"fields": "concentration_value,timestamp"}
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        [row] = response.json()["results"]
+        assert set(row) == {"id", "concentration_value", "timestamp"}
+        assert (row["id"], row["concentration_value"]) == (reading.pk, 12.5)
+        select = queries.captured_queries[-1]["sql"]
+        assert "air_quality_location" not in select
+        assert "air_quality_compound" not in select
+
+    def test_selected_relation_is_joined(self, api_client):
+        """Test that a selected relation is loaded without a query per row."""
+        AirCompoundReadingFactory.create_batch(3)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(reverse("readings-list"), {"fields": "location"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert all(set(row) == {"id", "location"} for row in response.json()["results"])
+        assert not any(
+            'FROM "air_quality_location"' in query["sql"]
+            for query in queries.captured_queries
+        )
+
+    def test_detail_fields(self, api_client):
+        """Test that field selection applies to detail responses."""
+        reading = AirCompoundReadingFactory()
+
+        response = api_client.get(
+            reverse("readings-detail", args=[reading.pk]), {"fields": "compound"}
+        )
+
+        assert response.json() == {
+            "id": reading.pk,
+            "compound": reading.compound.full_name,
+        }
+
+    def test_unknown_fields_are_rejected(self, api_client):
+        """Test that unknown field names are reported as invalid."""
+        response = api_client.get(reverse("readings-list"), {"fields": "id,secret"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "secret" in response.json()["fields"]
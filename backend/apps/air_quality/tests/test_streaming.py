@@ -0,0 +1,212 @@
+import asyncio
+import threading
+
+import orjson
+import pytest
+from apps.air_quality.streaming import (
+    ReadingBroker,
+    Subscription,
+    format_event,
+    reading_broker,
+    stream_events,
+)
+from apps.air_quality.tests.factories import (
+    AirCompoundReadingFactory,
+    CompoundFactory,
+    LocationFactory,
+    TagFactory,
+)
+from apps.air_quality.views import ReadingStreamView
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users.tests.factories import UserFactory
+from core.tests.factories import APIClientFactory
+
+
+class TestReadingBroker:
+    """Test suite for the in-process reading broker."""
+
+    def test_events_are_delivered_to_matching_subscribers(self):
+        """Test that events only reach subscribers whose filters match."""
+        broker = ReadingBroker()
+
+        async def run():
+            by_location = broker.subscribe(
+                Subscription(location_ids=frozenset({1})), max_pending=10
+            )
+            by_compound = broker.subscribe(
+                Subscription(compound_ids=frozenset({7})), max_pending=10
+            )
+            broker.publish([(1, 5, b"first"), (2, 7, b"second"), (3, 8, b"third")])
+            await asyncio.sleep(0)
+            return (
+                [
+                    by_location.queue.get_nowait()
+                    for _ in range(by_location.queue.qsize())
+                ],
+                [
+                    by_compound.queue.get_nowait()
+                    for _ in range(by_compound.queue.qsize())
+                ],
+            )
+
+        assert asyncio.run(run()) == ([b"first"], [b"second"])
+
+    def test_events_published_from_another_thread(self):
+        """Test that ingestion threads can publish to event loop subscribers."""
+        broker = ReadingBroker()
+
+        async def run():
+            subscriber = broker.subscribe(Subscription(), max_pending=10)
+            thread = threading.Thread(target=broker.publish, args=([(1, 1, b"event")],))
+            thread.start()
+            event = await asyncio.wait_for(subscriber.queue.get(), timeout=1)
+            thread.join()
+            return event
+
+        assert asyncio.run(run()) == b"event"
+
+    def test_slow_subscribers_drop_oldest_events(self):
+        """Test that a full subscriber queue drops its oldest events."""
+        broker = ReadingBroker()
+
+        async def run():
+            subscriber = broker.subscribe(Subscription(), max_pending=2)
+            broker.publish([(1, 1, b"1"), (1, 1, b"2"), (1, 1, b"3")])
+            await asyncio.sleep(0)
+            return subscriber, [subscriber.queue.get_nowait() for _ in range(2)]
+
+        subscriber, events = asyncio.run(run())
+
+        assert events == [b"2", b"3"]
+        assert subscriber.dropped == 1
+
+    def test_unsubscribe(self):
+        """Test that unsubscribed clients are removed from the index."""
+        broker = ReadingBroker()
+
+        async def run():
+            subscriber = broker.subscribe(
+                Subscription(location_ids=frozenset({1, 2})), max_pending=1
+            )
+            broker.unsubscribe(subscriber)
+
+        asyncio.run(run())
+
+        assert not broker.has_subscribers()
+
+
+@pytest.mark.django_db
+class TestReadingStream:
+    """Test suite for the live reading stream."""
+
+    def test_stream_yields_published_readings(self, settings):
+        """Test that the event stream sends published readings."""
+        settings.READING_STREAM = {"KEEPALIVE_SECONDS": 0.05}
+        reading = AirCompoundReadingFactory()
+        event = format_event(reading, reading.location.name, reading.compound.full_name)
+
+        async def run():
+            events = stream_events(Subscription())
+            retry = await events.__anext__()
+            reading_broker.publish([(reading.location_id, reading.compound_id, event)])
+            received = await events.__anext__()
+            keepalive = await events.__anext__()
+            await events.aclose()
+            return retry, received, keepalive
+
+        retry, received, keepalive = asyncio.run(run())
+
+        assert retry.startswith(b"retry:")
+        assert received == event
+        assert keepalive == b": keepalive\n\n"
+        assert not reading_broker.has_subscribers()
+
+    def test_event_payload(self):
+        """Test that events carry the reading representation."""
+        reading = AirCompoundReadingFactory(
+            entered_concentration_value=1.23456, entered_concentration_unit="ppb"
+        )
+
+        event = format_event(reading, "Paris", "Ozone")
+
+        header, data = event.decode().strip().rsplit("\n", 1)
+        assert header == f"id: {reading.pk}\nevent: reading"
+        assert orjson.loads(data.removeprefix("data: ")) == {
+            "id": reading.pk,
+            "location": "Paris",
+            "compound": "Ozone",
+            "concentration_unit": "ppb",
+            "concentration_value": 1.2346,
+            "timestamp": reading.timestamp.isoformat().replace("+00:00", "Z"),
+        }
+
+    def test_subscription_resolves_locations(self):
+        """Test that tag and location filters resolve to location ids."""
+        tag = TagFactory()
+        compound = CompoundFactory()
+        tagged = LocationFactory(tags=[tag])
+        LocationFactory()
+
+        subscription = ReadingStreamView.get_subscription(
+            {"compound": [compound], "tag": [tag]}
+        )
+
+        assert subscription == Subscription(
+            compound_ids=frozenset({compound.pk}),
+            location_ids=frozenset({tagged.pk}),
+        )
+
+    def test_stream_requires_authentication(self):
+        """Test that anonymous clients cannot subscribe."""
+        response = APIClient().get(reverse("readings-stream"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_incomplete_radius_is_rejected(self):
+        """Test that radius filters need a center and a radius."""
+        client = APIClientFactory(user=UserFactory())
+
+        response = client.get(reverse("readings-stream"), {"radius": 5})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_empty_radius_is_rejected(self):
+        """Test that a zero radius does not subscribe to every location."""
+        client = APIClientFactory(user=UserFactory())
+
+        response = client.get(
+            reverse("readings-stream"), {"longitude": 0, "latitude": 0, "radius": 0}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "radius" in response.json()
+
+    def test_access_token_query_parameter(self):
+        """Test that clients unable to send headers subscribe with a token."""
+        token = AccessToken.for_user(UserFactory())
+
+        response = APIClient().get(
+            reverse("readings-stream"),
+            {"access_token": str(token)},
+            HTTP_ACCEPT="text/event-stream",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+
+    def test_stream_response(self):
+        """Test that subscribing returns an event stream."""
+        client = APIClientFactory(user=UserFactory())
+
+        response = client.get(
+            reverse("readings-stream"), HTTP_ACCEPT="text/event-stream"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"] == "text/event-stream"
+        assert response["Cache-Control"] == "no-cache"
@@ -0,0 +1,307 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from apps.air_quality import ingestion, validation
+from apps.air_quality.conversions import CONVERSION_FACTORS, convert_to_ug_m3
+from apps.air_quality.models import AirCompoundReading, QueuedReading
+from apps.air_quality.tests.factories import (
+    AirCompoundReadingFactory,
+    CompoundFactory,
+    LocationFactory,
+)
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from apps.users.tests.factories import UserFactory
+from core.tests.factories import APIClientFactory
+
+
+@pytest.fixture(autouse=True)
+def rolling_statistics():
+    validation.rolling_statistics.clear()
+    yield validation.rolling_statistics
+    validation.rolling_statistics.clear()
+
+
+@pytest.fixture
+def location():
+    return LocationFactory()
+
+
+@pytest.fixture
+def compound():
+    return CompoundFactory(is_gaseous=True, molecular_weight=28)
+
+
+def make_readings(location, compound, values, unit="ug_m3"):
+    now = timezone.now()
+    return [
+        AirCompoundReading(
+            location=location,
+            compound=compound,
+            entered_concentration_value=value,
+            entered_concentration_unit=unit,
+            timestamp=now - timedelta(seconds=len(values) - index),
+        )
+        for index, value in enumerate(values)
+    ]
+
+
+class TestConvertToUgM3:
+    """Test suite for vectorized unit conversion."""
+
+    def test_units_are_converted(self):
+        """Test that every unit converts to micrograms per cubic meter."""
+        converted = convert_to_ug_m3(
+            values=[1.0, 1.0, 24.45, 24.45],
+            units=["ug_m3", "mg_m3", "ppm", "ppb"],
+            molecular_weights=[np.nan, np.nan, 28.0, 28.0],
+        )
+
+        np.testing.assert_allclose(converted, [1.0, 1000.0, 28000.0, 28.0])
+
+    @pytest.mark.parametrize(
+        "from_unit,to_unit,expected",
+        [("ug_m3", "ppb", 24.45), ("mg_m3", "ppm", 24.45), ("ppb", "ug_m3", 32.0654)],
+    )
+    def test_conversion_factors(self, from_unit, to_unit, expected):
+        """Test that conversion factors follow the molar volume both ways."""
+        factor, exponent = CONVERSION_FACTORS[(from_unit, to_unit)]
+
+        assert 28.0 * factor * 28.0**exponent == pytest.approx(expected, rel=1e-4)
+
+    def test_volume_ratio_without_molecular_weight_is_nan(self):
+        """Test that ppm without a molecular weight cannot be converted."""
+        [converted] = convert_to_ug_m3([1.0], ["ppm"], [np.nan])
+
+        assert np.isnan(converted)
+
+
+@pytest.mark.django_db
+class TestValidationPipeline:
+    """Test suite for the batch validation pipeline."""
+
+    def test_invalid_values_are_flagged(self, location, compound):
+        """Test that negative and non-finite values are flagged."""
+        ingestion.store_readings(
+            make_readings(location, compound, [10.0, -1.0, float("inf")])
+        )
+
+        flags = AirCompoundReading.objects.order_by("timestamp").values_list(
+            "is_flagged", "flag_reason"
+        )
+        assert list(flags) == [
+            (False, ""),
+            (True, "invalid_value"),
+            (True, "invalid_value"),
+        ]
+
+    def test_unit_mismatch_is_flagged(self, location):
+        """Test that volume ratios of non-gaseous compounds are flagged."""
+        compound = CompoundFactory(is_gaseous=False)
+
+        [reading] = ingestion.store_readings(
+            make_readings(location, compound, [5.0], unit="ppm")
+        )
+
+        assert reading.flag_reason == "unit_mismatch"
+
+    def test_spike_is_flagged_against_rolling_statistics(
+        self, settings, location, compound
+    ):
+        """Test that a spike far from the rolling mean is flagged."""
+        settings.AIR_QUALITY_READING_VALIDATION = {"OUTLIER_MIN_SAMPLES": 10}
+        ingestion.store_readings(
+            make_readings(location, compound, np.linspace(9, 11, 20).tolist())
+        )
+
+        [spike, normal] = ingestion.store_readings(
+            make_readings(location, compound, [10_000.0, 10.5])
+        )
+
+        assert (spike.is_flagged, spike.flag_reason) == (True, "outlier")
+        assert not normal.is_flagged
+
+    def test_statistics_are_warmed_up_from_recent_readings(
+        self, settings, rolling_statistics, location, compound
+    ):
+        """Test that statistics missing in memory are loaded from the database."""
+        settings.AIR_QUALITY_READING_VALIDATION = {"OUTLIER_MIN_SAMPLES": 10}
+        for value in np.linspace(9, 11, 20):
+            AirCompoundReadingFactory(
+                location=location,
+                compound=compound,
+                entered_concentration_value=value,
+                entered_concentration_unit="ug_m3",
+            )
+
+        [spike] = ingestion.store_readings(
+            make_readings(location, compound, [10_000.0])
+        )
+
+        assert spike.flag_reason == "outlier"
+
+    def test_lasting_level_shift_is_accepted(self, settings, location, compound):
+        """Test that repeated outliers at a new level end up being accepted."""
+        settings.AIR_QUALITY_READING_VALIDATION = {"OUTLIER_MIN_SAMPLES": 10}
+        ingestion.store_readings(
+            make_readings(location, compound, np.linspace(9, 11, 20).tolist())
+        )
+
+        flags = []
+        for _ in range(100):
+            [reading] = ingestion.store_readings(
+                make_readings(location, compound, [100.0])
+            )
+            flags.append(reading.is_flagged)
+
+        assert flags[0]
+        assert not flags[-1]
+
+    def test_quarantined_readings_are_not_stored(self, settings, location, compound):
+        """Test that the quarantine action keeps failing readings out."""
+        settings.AIR_QUALITY_READING_VALIDATION = {
+            "ACTION": validation.QUARANTINE_ACTION
+        }
+
+        stored = ingestion.store_readings(
+            make_readings(location, compound, [1.0, -1.0])
+        )
+
+        assert [reading.entered_concentration_value for reading in stored] == [1.0]
+        quarantined = QueuedReading.objects.get()
+        assert quarantined.status == QueuedReading.QUARANTINED
+        assert quarantined.last_error == "invalid_value"
+
+    def test_quarantined_reading_is_acknowledged(self, settings, location, compound):
+        """Test that a quarantined reading is not reported as created."""
+        settings.AIR_QUALITY_READING_VALIDATION = {
+            "ACTION": validation.QUARANTINE_ACTION
+        }
+        client = APIClientFactory(user=UserFactory())
+
+        response = client.post(
+            reverse("readings-list"),
+            {
+                "compound": compound.full_name,
+                "location": location.name,
+                "entered_concentration_value": -1.0,
+                "entered_concentration_unit": "ug_m3",
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json() == {
+            "status": QueuedReading.QUARANTINED,
+            "reason": "invalid_value",
+        }
+        assert not AirCompoundReading.objects.exists()
+
+    def test_edited_readings_are_validated(self, location, compound):
+        """Test that the flag of a reading follows edits of its value."""
+        reading = AirCompoundReadingFactory(
+            location=location,
+            compound=compound,
+            entered_concentration_value=10.0,
+            entered_concentration_unit="ug_m3",
+        )
+        client = APIClientFactory(user=UserFactory())
+        url = reverse("readings-detail", args=[reading.pk])
+
+        client.patch(url, {"entered_concentration_value": -1.0}, format="json")
+        reading.refresh_from_db()
+        assert (reading.is_flagged, reading.flag_reason) == (True, "invalid_value")
+
+        client.patch(url, {"entered_concentration_value": 12.0}, format="json")
+        reading.refresh_from_db()
+        assert (reading.is_flagged, reading.flag_reason) == (False, "")
+
+    def test_edits_are_not_counted_as_observations(
+        self, rolling_statistics, location, compound
+    ):
+        """Test that revalidating an edited reading leaves statistics as is."""
+        reading = AirCompoundReadingFactory(
+            location=location,
+            compound=compound,
+            entered_concentration_value=10.0,
+            entered_concentration_unit="ug_m3",
+        )
+        ingestion.store_readings(make_readings(location, compound, [10.0]))
+        key = (location.pk, compound.pk)
+        before = [column.tolist() for column in rolling_statistics.get([key])]
+
+        client = APIClientFactory(user=UserFactory())
+        client.patch(
+            reverse("readings-detail", args=[reading.pk]),
+            {"entered_concentration_value": 50.0},
+            format="json",
+        )
+
+        assert [column.tolist() for column in rolling_statistics.get([key])] == before
+
+    def test_attached_compounds_are_not_fetched_again(self, location, compound):
+        """Test that a warm single reading is validated without queries."""
+        validation.validate_readings(make_readings(location, compound, [10.0]))
+
+        with CaptureQueriesContext(connection) as queries:
+            validation.validate_readings(make_readings(location, compound, [11.0]))
+
+        assert len(queries) == 0
+
+    def test_validation_queries_do_not_grow_with_batch_size(self, compound):
+        """Test that validation runs a constant number of queries per batch."""
+        query_counts = []
+        for size in (5, 50):
+            readings = make_readings(LocationFactory(), compound, [1.0] * size)
+            with CaptureQueriesContext(connection) as queries:
+                ingestion.store_readings(readings)
+            query_counts.append(len(queries))
+
+        assert query_counts[0] == query_counts[1]
+
+
+@pytest.mark.django_db
+class TestFlaggedReadingsInStats:
+    """Test suite for excluding flagged readings from statistics."""
+
+    def test_flagged_readings_are_excluded_by_default(self, location, compound):
+        """Test that radius statistics skip flagged readings unless asked."""
+        now = timezone.now()
+        AirCompoundReadingFactory(
+            location=location,
+            compound=compound,
+            entered_concentration_value=10.0,
+            entered_concentration_unit="ug_m3",
+        )
+        AirCompoundReadingFactory(
+            location=location,
+            compound=compound,
+            entered_concentration_value=1000.0,
+            entered_concentration_unit="ug_m3",
+            is_flagged=True,
+            flag_reason="outlier",
+        )
+        client = APIClientFactory(user=UserFactory())
+        params = {
+            "latitude": 0,
+            "longitude": 0,
+            "radius": 10,
+            "compound": compound.symbol,
+            "start_date": (now - timedelta(days=1)).isoformat(),
+            "end_date": (now + timedelta(days=1)).isoformat(),
+            "concentration_unit": "ug_m3",
+        }
+
+        excluded = client.get(reverse("stats-radius-readings"), params)
+        included = client.get(
+            reverse("stats-radius-readings"), {**params, "exclude_flagged": False}
+        )
+
+        assert excluded.status_code == status.HTTP_200_OK
+        assert excluded.json()["stats"]["max_concentration"] == 10.0
+        assert included.json()["stats"]["max_concentration"] == 1000.0
@@ -1,5 +1,6 @@
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 
+import orjson
 import pytest
 from apps.air_quality.models import AirCompoundReading
 from apps.air_quality.tests.factories import (
@@ -8,6 +9,9 @@ from apps.air_quality.tests.factories import (
     LocationFactory,
     TagFactory,
 )
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from freezegun import freeze_time
@@ -178,6 +182,63 @@ class TestLocationViewSet:
             ],
         }
 
+    def test_get_readings_with_filters(self, api_client, location, compound):
+        """Test filtering, converting and ordering readings of a location."""
+        other_compound = CompoundFactory()
+        older = AirCompoundReadingFactory(
+            location=location,
+            compound=compound,
+            entered_concentration_unit="ppm",
+            entered_concentration_value=1.0,
+        )
+        newer = AirCompoundReadingFactory(
+            location=location,
+            compound=compound,
+            entered_concentration_unit="ppm",
+            entered_concentration_value=2.0,
+        )
+        AirCompoundReadingFactory(location=location, compound=other_compound)
+        AirCompoundReadingFactory(compound=compound)
+
+        url = reverse("locations-get-readings", args=[location.id])
+        response = api_client.get(
+            url,
+            {
+                "compound": compound.symbol,
+                "concentration_unit": "ppb",
+                "ordering": "timestamp",
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        assert [row["id"] for row in results] == [older.pk, newer.pk]
+        assert [row["concentration_unit"] for row in results] == ["ppb", "ppb"]
+        assert [row["concentration_value"] for row in results] == [1000.0, 2000.0]
+
+    def test_get_readings_query_count_is_constant(
+        self, api_client, location, compound, django_assert_num_queries
+    ):
+        """Test that listing location readings does not query per reading."""
+        url = reverse("locations-get-readings", args=[location.id])
+        AirCompoundReadingFactory.create_batch(2, location=location, compound=compound)
+        with CaptureQueriesContext(connection) as few_readings:
+            api_client.get(url)
+
+        AirCompoundReadingFactory.create_batch(
+            10, location=location, compound=CompoundFactory()
+        )
+        with django_assert_num_queries(len(few_readings)):
+            response = api_client.get(url)
+
+        assert response.json()["count"] == 12
+
+    def test_get_readings_unknown_location(self, api_client):
+        """Test that readings of an unknown location return 404."""
+        response = api_client.get(reverse("locations-get-readings", args=[0]))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
 
 @pytest.mark.django_db
 class TestAirCompoundReadingViewSet:
@@ -263,13 +324,7 @@ class TestAirCompoundReadingViewSet:
     def test_list_readings_with_pagination(self, api_client, location, compound):
         """Test pagination of air compound readings."""
         # Create 15 readings
-        readings = [
-            AirCompoundReadingFactory(
-                location=location,
-                compound=compound,
-            )
-            for i in range(15)
-        ]
+        AirCompoundReadingFactory.create_batch(15, location=location, compound=compound)
 
         url = reverse("readings-list")
         # Test first page
@@ -417,9 +472,91 @@ class TestAirCompoundStatsWithinRadiusView:
             "concentration_unit": "ppb",
             "start_date": "2025-01-26T00:00:00Z",
             "end_date": "2025-01-28T00:00:00Z",
+            "exclude_flagged": True,
             "stats": {
                 "min_concentration": 11.4519,
                 "max_concentration": 22.9039,
                 "mean_concentration": 17.1779,
             },
         }
+
+
+async def read_streaming_content(response):
+    return b"".join([part async for part in response.streaming_content])
+
+
+@pytest.mark.django_db
+class TestRollingMeanView:
+    """Test suite for RollingMeanView."""
+
+    @pytest.fixture
+    def hourly_readings(self, compound, location):
+        start = datetime(2025, 1, 27, tzinfo=dt_timezone.utc)
+        other_location = LocationFactory()
+        hourly_values = ((-2, 40.0), (0, 10.0), (0, 30.0), (1, 60.0), (3, 90.0))
+        for minutes, (hours, value) in enumerate(hourly_values):
+            AirCompoundReadingFactory(
+                location=location,
+                compound=compound,
+                timestamp=start + timedelta(hours=hours, minutes=minutes),
+                entered_concentration_value=value,
+                entered_concentration_unit="ug_m3",
+            )
+        AirCompoundReadingFactory(
+            location=other_location,
+            compound=compound,
+            timestamp=start,
+            entered_concentration_value=1000.0,
+            entered_concentration_unit="ug_m3",
+        )
+        return start
+
+    def test_rolling_means(self, api_client, compound, location, hourly_readings):
+        """Test that hourly means are averaged over windows reaching before start."""
+        params = {
+            "compound": compound.symbol,
+            "location": location.name,
+            "concentration_unit": "ug_m3",
+            "window_hours": 3,
+            "start_date": hourly_readings.isoformat(),
+            "end_date": (hourly_readings + timedelta(hours=4)).isoformat(),
+        }
+
+        response = api_client.get(reverse("readings-rolling"), params)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = async_to_sync(read_streaming_content)(response).splitlines()
+        assert [orjson.loads(line) for line in lines] == [
+            {
+                "location": location.name,
+                "hour": "2025-01-27T00:00:00Z",
+                "rolling_mean": 30.0,
+                "hours": 2,
+            },
+            {
+                "location": location.name,
+                "hour": "2025-01-27T01:00:00Z",
+                "rolling_mean": 40.0,
+                "hours": 2,
+            },
+            {
+                "location": location.name,
+                "hour": "2025-01-27T03:00:00Z",
+                "rolling_mean": 75.0,
+                "hours": 2,
+            },
+        ]
+
+    def test_rolling_means_invalid_period(self, api_client, compound):
+        """Test that an end date before the start date is rejected."""
+        params = {
+            "compound": compound.symbol,
+            "concentration_unit": "ug_m3",
+            "start_date": "2025-01-27T00:00:00Z",
+            "end_date": "2025-01-26T00:00:00Z",
+        }
+
+        response = api_client.get(reverse("readings-rolling"), params)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
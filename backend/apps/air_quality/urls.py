@@ -2,7 +2,12 @@ from apps.air_quality.views import (
     AirCompoundReadingViewSet,
     AirCompoundStatsWithinRadiusView,
     CompoundViewSet,
+    InterpolationView,
+    LatestReadingsView,
     LocationViewSet,
+    ReadingSeriesView,
+    ReadingStreamView,
+    RollingMeanView,
     TagViewSet,
 )
 from django.urls import path
@@ -22,5 +27,14 @@ urlpatterns = [
         "readings/stats/radius",
         AirCompoundStatsWithinRadiusView.as_view(),
         name="stats-radius-readings",
-    )
+    ),
+    path(
+        "readings/interpolation",
+        InterpolationView.as_view(),
+        name="readings-interpolation",
+    ),
+    path("readings/latest", LatestReadingsView.as_view(), name="readings-latest"),
+    path("readings/rolling", RollingMeanView.as_view(), name="readings-rolling"),
+    path("readings/series", ReadingSeriesView.as_view(), name="readings-series"),
+    path("readings/stream", ReadingStreamView.as_view(), name="readings-stream"),
 ] + router.urls
@@ -0,0 +1,390 @@
+import threading
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import lru_cache
+
+import numpy as np
+from apps.air_quality.conversions import (
+    convert_to_ug_m3,
+    get_qs_with_converted_concentration,
+)
+from apps.air_quality.models import AirCompoundReading, Compound
+from django.conf import settings
+from django.db.models import Avg, Count, Variance
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+FLAG_ACTION = "flag"
+QUARANTINE_ACTION = "quarantine"
+
+DEFAULT_READING_VALIDATION = {
+    "ENABLED": True,
+    "ACTION": FLAG_ACTION,
+    "VALIDATORS": [
+        "apps.air_quality.validation.InvalidValueValidator",
+        "apps.air_quality.validation.UnitMismatchValidator",
+        "apps.air_quality.validation.PhysicalRangeValidator",
+        "apps.air_quality.validation.RollingOutlierValidator",
+    ],
+    "MAX_CONCENTRATION_UG_M3": 1_000_000,
+    "OUTLIER_Z_SCORE": 6.0,
+    "OUTLIER_MIN_SAMPLES": 30,
+    "ROLLING_WINDOW": 500,
+    "WARMUP_HOURS": 24,
+}
+"""
+Default reading validation configuration, overridden by
+settings.AIR_QUALITY_READING_VALIDATION.
+"""
+
+
+def get_validation_config():
+    """
+    Returns the reading validation configuration merged with defaults.
+    """
+    return {
+        **DEFAULT_READING_VALIDATION,
+        **getattr(settings, "AIR_QUALITY_READING_VALIDATION", {}),
+    }
+
+
+@dataclass
+class ReadingBatch:
+    """
+    Column arrays describing a batch of incoming readings.
+    """
+
+    location_ids: np.ndarray
+    compound_ids: np.ndarray
+    values: np.ndarray
+    units: np.ndarray
+    is_gaseous: np.ndarray
+    molecular_weights: np.ndarray
+    values_ug_m3: np.ndarray
+
+    def __len__(self):
+        return len(self.values)
+
+    @classmethod
+    def from_readings(cls, readings):
+        """
+        Builds a batch from unsaved readings.
+
+        Compounds already attached to the readings are used as they are; the
+        others are fetched with a single query.
+        """
+        compound_ids = np.array([reading.compound_id for reading in readings])
+        compounds = {
+            reading.compound_id: reading.compound
+            for reading in readings
+            if AirCompoundReading.compound.is_cached(reading)
+        }
+        missing = set(compound_ids.tolist()) - compounds.keys()
+        if missing:
+            compounds.update(
+                Compound.objects.only("is_gaseous", "molecular_weight").in_bulk(missing)
+            )
+        is_gaseous = np.array(
+            [compounds[compound_id].is_gaseous for compound_id in compound_ids],
+            dtype=bool,
+        )
+        molecular_weights = np.array(
+            [
+                compounds[compound_id].molecular_weight or np.nan
+                for compound_id in compound_ids
+            ],
+            dtype=float,
+        )
+        values = np.array(
+            [reading.entered_concentration_value for reading in readings], dtype=float
+        )
+        units = np.array(
+            [reading.entered_concentration_unit for reading in readings], dtype=object
+        )
+        return cls(
+            location_ids=np.array([reading.location_id for reading in readings]),
+            compound_ids=compound_ids,
+            values=values,
+            units=units,
+            is_gaseous=is_gaseous,
+            molecular_weights=molecular_weights,
+            values_ug_m3=convert_to_ug_m3(values, units, molecular_weights),
+        )
+
+    def group_keys(self):
+        """
+        Returns unique (location, compound) pairs and the pair index of each row.
+        """
+        keys, inverse = np.unique(
+            np.column_stack([self.location_ids, self.compound_ids]),
+            axis=0,
+            return_inverse=True,
+        )
+        return [tuple(key) for key in keys.tolist()], inverse.reshape(-1)
+
+
+class RollingStatistics:
+    """
+    Exponentially weighted mean and variance of readings in micrograms per
+    cubic meter, kept in memory per (location, compound) pair.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+    def missing(self, keys):
+        """
+        Returns the keys without statistics in memory.
+        """
+        with self._lock:
+            return [key for key in keys if key not in self._stats]
+
+    def load(self, stats):
+        """
+        Stores (samples, mean, variance) tuples by key.
+        """
+        with self._lock:
+            self._stats.update(stats)
+
+    def get(self, keys):
+        """
+        Returns sample counts, means and variances of the given keys as arrays.
+        """
+        with self._lock:
+            rows = [self._stats.get(key, (0, 0.0, 0.0)) for key in keys]
+        samples, means, variances = np.array(rows, dtype=float).reshape(-1, 3).T
+        return samples, means, variances
+
+    def update(self, keys, inverse, values, window):
+        """
+        Folds new values into the statistics of their keys.
+
+        Each key is updated once per batch: the batch mean and variance are
+        weighted as if the values had been added one by one to an exponential
+        moving average over `window` samples.
+        """
+        counts = np.bincount(inverse, minlength=len(keys))
+        present = counts > 0
+        if not present.any():
+            return
+
+        sums = np.bincount(inverse, weights=values, minlength=len(keys))
+        squares = np.bincount(inverse, weights=values**2, minlength=len(keys))
+        batch_means = np.divide(sums, counts, where=present, out=np.zeros(len(keys)))
+        batch_variances = np.maximum(
+            np.divide(squares, counts, where=present, out=np.zeros(len(keys)))
+            - batch_means**2,
+            0.0,
+        )
+
+        alpha = 2 / (window + 1)
+        with self._lock:
+            samples, means, variances = (
+                np.array(
+                    [self._stats.get(key, (0, 0.0, 0.0)) for key in keys], dtype=float
+                )
+                .reshape(-1, 3)
+                .T
+            )
+            weights = np.where(samples > 0, 1 - (1 - alpha) ** counts, 1.0)
+            new_means = (1 - weights) * means + weights * batch_means
+            new_variances = (1 - weights) * (
+                variances + (means - new_means) ** 2
+            ) + weights * (batch_variances + (batch_means - new_means) ** 2)
+
+            for index in np.flatnonzero(present):
+                self._stats[keys[index]] = (
+                    int(samples[index] + counts[index]),
+                    float(new_means[index]),
+                    float(new_variances[index]),
+                )
+
+
+rolling_statistics = RollingStatistics()
+
+
+def warm_up_statistics(keys, hours):
+    """
+    Loads statistics of recent unflagged readings for keys not in memory.
+    """
+    missing = rolling_statistics.missing(keys)
+    if not missing:
+        return
+
+    location_ids, compound_ids = zip(*missing)
+    queryset = AirCompoundReading.objects.filter(
+        location_id__in=set(location_ids),
+        compound_id__in=set(compound_ids),
+        is_flagged=False,
+        timestamp__gte=timezone.now() - timedelta(hours=hours),
+    )
+    rows = (
+        get_qs_with_converted_concentration(queryset=queryset, target_unit="ug_m3")
+        .values("location_id", "compound_id")
+        .annotate(
+            samples=Count("concentration_value"),
+            mean=Avg("concentration_value"),
+            variance=Variance("concentration_value"),
+        )
+        .order_by()
+    )
+    stats = {key: (0, 0.0, 0.0) for key in missing}
+    for row in rows:
+        key = (row["location_id"], row["compound_id"])
+        if key in stats and row["samples"]:
+            stats[key] = (row["samples"], row["mean"], row["variance"] or 0.0)
+    rolling_statistics.load(stats)
+
+
+class ReadingValidator:
+    """
+    Base class for vectorized checks run on batches of incoming readings.
+    """
+
+    reason = ""
+
+    def check(self, batch: ReadingBatch, config: dict) -> np.ndarray:
+        """
+        Returns a boolean mask of the readings to flag.
+        """
+        raise NotImplementedError
+
+    def observe(self, batch: ReadingBatch, reasons: np.ndarray, config: dict):
+        """
+        Receives the flag reason of every reading, empty for accepted ones.
+        """
+
+
+class InvalidValueValidator(ReadingValidator):
+    """
+    Flags negative and non-finite values.
+    """
+
+    reason = "invalid_value"
+
+    def check(self, batch, config):
+        return ~np.isfinite(batch.values) | (batch.values < 0)
+
+
+class UnitMismatchValidator(ReadingValidator):
+    """
+    Flags volume ratios of non-gaseous compounds or of compounds without a
+    molecular weight, which cannot be converted to mass concentrations.
+    """
+
+    reason = "unit_mismatch"
+
+    def check(self, batch, config):
+        is_volume_ratio = np.isin(batch.units, ("ppm", "ppb"))
+        return is_volume_ratio & (~batch.is_gaseous | np.isnan(batch.molecular_weights))
+
+
+class PhysicalRangeValidator(ReadingValidator):
+    """
+    Flags concentrations above a physically plausible maximum.
+    """
+
+    reason = "out_of_range"
+
+    def check(self, batch, config):
+        return batch.values_ug_m3 > config["MAX_CONCENTRATION_UG_M3"]
+
+
+class RollingOutlierValidator(ReadingValidator):
+    """
+    Flags values far from the rolling mean of their location and compound.
+
+    Outliers are folded into the statistics clipped to the flagging threshold,
+    so a lasting shift of the level widens the spread until it is accepted
+    while a single spike barely moves it.
+    """
+
+    reason = "outlier"
+
+    def check(self, batch, config):
+        keys, inverse = batch.group_keys()
+        warm_up_statistics(keys, hours=config["WARMUP_HOURS"])
+        samples, means, variances = rolling_statistics.get(keys)
+
+        deviations = np.abs(batch.values_ug_m3 - means[inverse])
+        stds = np.sqrt(variances[inverse])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z_scores = deviations / stds
+        return (
+            (samples[inverse] >= config["OUTLIER_MIN_SAMPLES"])
+            & (stds > 0)
+            & (z_scores > config["OUTLIER_Z_SCORE"])
+        )
+
+    def observe(self, batch, reasons, config):
+        keys, inverse = batch.group_keys()
+        observed = ((reasons == "") | (reasons == self.reason)) & np.isfinite(
+            batch.values_ug_m3
+        )
+        _, means, variances = rolling_statistics.get(keys)
+        spreads = config["OUTLIER_Z_SCORE"] * np.sqrt(variances[inverse])
+        values = np.where(
+            reasons == self.reason,
+            np.clip(
+                batch.values_ug_m3, means[inverse] - spreads, means[inverse] + spreads
+            ),
+            batch.values_ug_m3,
+        )
+        rolling_statistics.update(
+            keys=keys,
+            inverse=inverse[observed],
+            values=values[observed],
+            window=config["ROLLING_WINDOW"],
+        )
+
+
+@lru_cache
+def get_validators(paths: tuple):
+    """
+    Returns validator instances from their dotted paths.
+    """
+    return [import_string(path)() for path in paths]
+
+
+def validate_readings(readings, action=None, observe=True):
+    """
+    Runs the validation pipeline on a batch of unsaved readings.
+
+    Failing readings are flagged in place. With the quarantine action, which
+    defaults to the configured one, they are returned separately instead of
+    being accepted. Without observe, readings are checked but not folded into
+    the rolling statistics, e.g. when revalidating stored readings.
+
+    Returns the accepted and the quarantined readings.
+    """
+    config = get_validation_config()
+    action = action or config["ACTION"]
+    if not config["ENABLED"] or not readings:
+        return readings, []
+
+    batch = ReadingBatch.from_readings(readings)
+    validators = get_validators(tuple(config["VALIDATORS"]))
+    reasons = np.full(len(batch), "", dtype=object)
+    for validator in validators:
+        flagged = validator.check(batch, config) & (reasons == "")
+        reasons[flagged] = validator.reason
+
+    if observe:
+        for validator in validators:
+            validator.observe(batch, reasons, config)
+
+    for reading, reason in zip(readings, reasons):
+        reading.is_flagged = bool(reason)
+        reading.flag_reason = reason
+
+    if action != QUARANTINE_ACTION:
+        return readings, []
+    return (
+        [reading for reading in readings if not reading.is_flagged],
+        [reading for reading in readings if reading.is_flagged],
+    )
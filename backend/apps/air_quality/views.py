@@ -1,33 +1,84 @@
+from datetime import timedelta
+
+from apps.air_quality import ingestion
+from apps.air_quality.aqi import get_aqi_config, get_latest_location_aqi
+from apps.air_quality.bulk import correct_readings, delete_readings
+from apps.air_quality.conditional import ConditionalListMixin
 from apps.air_quality.conversions import get_qs_with_converted_concentration
 from apps.air_quality.filters import AirCompoundReadingFilterSet, LocationFilterSet
-from apps.air_quality.models import AirCompoundReading, Compound, Location, Tag
+from apps.air_quality.interpolation import get_interpolated_grid
+from apps.air_quality.models import (
+    AirCompoundReading,
+    Compound,
+    Location,
+    QueuedReading,
+    Tag,
+)
+from apps.air_quality.neighbors import get_nearby_filter
+from apps.air_quality.pagination import CountModePagination
+from apps.air_quality.recent import (
+    get_latest_values,
+    get_radius_stats,
+    get_recent_index,
+    get_series,
+)
+from apps.air_quality.renderers import (
+    READING_RENDERER_CLASSES,
+    EventStreamRenderer,
+    GridPNGRenderer,
+    NDJSONRenderer,
+)
+from apps.air_quality.rolling import stream_rolling_means
 from apps.air_quality.serializers.model_serializers import (
     AirCompoundReadingSerializer,
     CompoundSerializer,
     CreateAirCompoundReadingSerializer,
+    LocationAQISerializer,
     LocationSerializer,
     TagSerializer,
 )
 from apps.air_quality.serializers.query_serializers import (
     AirCompoundRadiusQuerySerializer,
+    BulkReadingDeleteSerializer,
+    BulkReadingUpdateSerializer,
+    InterpolationQuerySerializer,
+    LatestReadingsQuerySerializer,
+    LocationAQIQuerySerializer,
+    ReadingSeriesQuerySerializer,
+    ReadingStreamQuerySerializer,
+    RollingMeanQuerySerializer,
 )
 from apps.air_quality.serializers.response_serializers import (
     AirCompoundRadiusResponseSerializer,
+    BulkReadingResultSerializer,
+    IngestionQueueStatsSerializer,
 )
+from apps.air_quality.sparse import SparseFieldsetMixin
+from apps.air_quality.streaming import Subscription, stream_events
+from apps.users.authentication import QueryParameterJWTAuthentication
+from apps.users.models import APIKey
 from django.contrib.gis.geos import Point
 from django.contrib.gis.measure import D
-from django.db.models import Avg, Max, Min
+from django.db.models import Avg, F, Max, Min, Q
 from django.db.models.functions import Round
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import mixins, viewsets
+from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import Throttled, ValidationError
 from rest_framework.filters import OrderingFilter
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
 
 class LocationViewSet(
+    SparseFieldsetMixin,
+    ConditionalListMixin,
     viewsets.GenericViewSet,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
@@ -41,26 +92,81 @@ class LocationViewSet(
 
     queryset = Location.objects.prefetch_related("tags").order_by("name")
     serializer_class = LocationSerializer
+    conditional_models = (Location, Tag)
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = LocationFilterSet
     ordering_fields = ["id", "name"]
+    sparse_fields = {
+        "id": ("id",),
+        "name": ("name",),
+        "coordinates": ("coordinates",),
+        "tags": ("tags",),
+    }
 
     @swagger_auto_schema(responses={200: AirCompoundReadingSerializer})
-    @action(detail=True, methods=["get"], url_path="readings")
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="readings",
+        renderer_classes=READING_RENDERER_CLASSES,
+        serializer_class=AirCompoundReadingSerializer,
+        filterset_class=AirCompoundReadingFilterSet,
+        ordering_fields=["timestamp"],
+        pagination_class=CountModePagination,
+    )
     def get_readings(self, request, pk=None):
         """
         Retrieves air compound readings for a specific location.
         """
-        location = self.get_object()
-        readings = location.air_readings.all()
+        location = get_object_or_404(Location.objects.only("id"), pk=pk)
+        self.check_object_permissions(request, location)
+
+        readings = self.filter_queryset(
+            AirCompoundReading.objects.with_related()
+            .filter(location=location)
+            .order_by("-timestamp")
+        )
 
         paginated_readings = self.paginate_queryset(readings)
-        serializer = AirCompoundReadingSerializer(paginated_readings, many=True)
+        serializer = self.get_serializer(paginated_readings, many=True)
 
         return self.get_paginated_response(serializer.data)
 
+    @swagger_auto_schema(
+        query_serializer=LocationAQIQuerySerializer,
+        responses={200: LocationAQISerializer(many=True)},
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="aqi",
+        serializer_class=LocationAQISerializer,
+    )
+    def get_aqi(self, request):
+        """
+        Retrieves the latest air quality index of every location.
+        """
+        query_serializer = LocationAQIQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        scale = query_serializer.validated_data.get("scale", get_aqi_config()["SCALE"])
+
+        serializer = self.get_serializer(get_latest_location_aqi(scale), many=True)
+        return Response(serializer.data)
+
+    def get_serializer_context(self):
+        """
+        Adds concentration_unit from query parameters to the serializer context.
+        """
+        context = super().get_serializer_context()
+        context["concentration_unit"] = self.request.query_params.get(
+            "concentration_unit"
+        )
+        return context
+
 
 class AirCompoundReadingViewSet(
+    SparseFieldsetMixin,
+    ConditionalListMixin,
     viewsets.GenericViewSet,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
@@ -75,15 +181,27 @@ class AirCompoundReadingViewSet(
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = AirCompoundReadingFilterSet
     ordering_fields = ["timestamp", "location"]
+    renderer_classes = READING_RENDERER_CLASSES
+    pagination_class = CountModePagination
+    api_key_scopes = {"create": APIKey.INGEST_SCOPE}
+    conditional_models = (AirCompoundReading, Location, Compound)
+    sparse_fields = {
+        "id": ("id",),
+        "location": ("location__name",),
+        "compound": ("compound__full_name",),
+        "concentration_unit": (
+            "entered_concentration_unit",
+            "entered_concentration_value",
+        ),
+        "concentration_value": ("entered_concentration_value",),
+        "timestamp": ("timestamp",),
+    }
 
     def get_queryset(self):
         """
         Returns a queryset of AirCompoundReading objects with related data.
         """
-        qs = AirCompoundReading.objects.select_related("compound", "location").order_by(
-            "-timestamp"
-        )
-        return qs
+        return AirCompoundReading.objects.with_related().order_by("-timestamp")
 
     def get_serializer_class(self):
         """
@@ -93,6 +211,155 @@ class AirCompoundReadingViewSet(
             return CreateAirCompoundReadingSerializer
         return AirCompoundReadingSerializer
 
+    def create(self, request, *args, **kwargs):
+        """
+        Creates a reading, or acknowledges it immediately in queued ingestion mode.
+
+        A reading quarantined by validation is acknowledged without being stored.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        if not ingestion.is_queued_mode():
+            reading = serializer.save()
+            if reading.pk is None:
+                return Response(
+                    data={
+                        "status": QueuedReading.QUARANTINED,
+                        "reason": reading.flag_reason,
+                    },
+                    status=status.HTTP_202_ACCEPTED,
+                )
+            return Response(
+                data=serializer.data,
+                status=status.HTTP_201_CREATED,
+                headers=self.get_success_headers(serializer.data),
+            )
+
+        if ingestion.queue_is_full():
+            raise Throttled(
+                wait=ingestion.get_ingestion_config()["RETRY_DELAY_SECONDS"],
+                detail="Ingestion queue is full.",
+            )
+
+        [queued_reading] = ingestion.enqueue_readings([serializer.validated_data])
+
+        return Response(
+            data={"queued_id": queued_reading.pk, "status": queued_reading.status},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    @swagger_auto_schema(responses={200: IngestionQueueStatsSerializer})
+    @action(detail=False, methods=["get"], url_path="queue")
+    def queue_stats(self, request):
+        """
+        Retrieves depth and lag of the ingestion queue.
+        """
+        serializer = IngestionQueueStatsSerializer(instance=ingestion.get_queue_stats())
+        return Response(data=serializer.data)
+
+    @swagger_auto_schema(
+        request_body=BulkReadingUpdateSerializer,
+        responses={200: BulkReadingResultSerializer},
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk-update",
+        permission_classes=[*api_settings.DEFAULT_PERMISSION_CLASSES, IsAdminUser],
+    )
+    def bulk_update(self, request):
+        """
+        Corrects the values or unit of every reading matching the filters.
+        """
+        serializer = BulkReadingUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        queryset = self.get_bulk_queryset()
+
+        unit = data.get("unit")
+        if (
+            unit in ("ppm", "ppb")
+            and queryset.filter(compound__is_gaseous=False).exists()
+        ):
+            raise ValidationError(
+                {"unit": "Non-gaseous compound cannot be expressed in ppm or ppb."}
+            )
+        if (
+            data["offset"] < 0
+            and queryset.alias(
+                corrected=F("entered_concentration_value") * data["scale"]
+                + data["offset"]
+            )
+            .filter(corrected__lt=0, entered_concentration_value__gte=0)
+            .exists()
+        ):
+            raise ValidationError(
+                {"offset": "Correction would make concentration values negative."}
+            )
+
+        return self.get_bulk_response(
+            queryset,
+            data["dry_run"],
+            lambda: correct_readings(
+                queryset, scale=data["scale"], offset=data["offset"], unit=unit
+            ),
+        )
+
+    @swagger_auto_schema(
+        request_body=BulkReadingDeleteSerializer,
+        responses={200: BulkReadingResultSerializer},
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk-delete",
+        permission_classes=[*api_settings.DEFAULT_PERMISSION_CLASSES, IsAdminUser],
+    )
+    def bulk_delete(self, request):
+        """
+        Deletes every reading matching the filters.
+        """
+        serializer = BulkReadingDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = self.get_bulk_queryset()
+
+        return self.get_bulk_response(
+            queryset,
+            serializer.validated_data["dry_run"],
+            lambda: delete_readings(queryset),
+        )
+
+    def get_bulk_queryset(self):
+        """
+        Returns the readings matching the filter parameters, of which at least
+        one must restrict the rows.
+        """
+        filterset = self.filterset_class(
+            self.request.query_params,
+            queryset=AirCompoundReading.objects.all(),
+            request=self.request,
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        if not filterset.get_narrowing_filters():
+            raise ValidationError(
+                "Bulk operations require at least one filter restricting the readings."
+            )
+        return filterset.qs
+
+    @staticmethod
+    def get_bulk_response(queryset, dry_run, operation):
+        """
+        Counts the matching readings and runs the operation unless dry_run is set.
+        """
+        matched = queryset.count()
+        changed = 0 if dry_run or not matched else operation()
+        serializer = BulkReadingResultSerializer(
+            instance={"matched": matched, "changed": changed, "dry_run": dry_run}
+        )
+        return Response(data=serializer.data)
+
     def get_serializer_context(self):
         """
         Adds concentration_unit from query parameters to the serializer context.
@@ -105,6 +372,7 @@ class AirCompoundReadingViewSet(
 
 
 class TagViewSet(
+    ConditionalListMixin,
     viewsets.GenericViewSet,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
@@ -118,6 +386,7 @@ class TagViewSet(
 
     serializer_class = TagSerializer
     queryset = Tag.objects.all()
+    conditional_models = (Tag,)
     filter_backends = [
         OrderingFilter,
     ]
@@ -127,6 +396,7 @@ class TagViewSet(
 
 
 class CompoundViewSet(
+    ConditionalListMixin,
     viewsets.GenericViewSet,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
@@ -140,6 +410,7 @@ class CompoundViewSet(
 
     serializer_class = CompoundSerializer
     queryset = Compound.objects.all()
+    conditional_models = (Compound,)
     filter_backends = [
         OrderingFilter,
     ]
@@ -174,7 +445,15 @@ class AirCompoundStatsWithinRadiusView(APIView):
     def get_radius_stats(self, data):
         """
         Calculates statistics for air compound readings within the specified radius.
+
+        Recent windows are answered by the in-memory recent readings index
+        when it is enabled.
         """
+        if data.get("exclude_flagged", True):
+            index = get_recent_index(start=data["start_date"])
+            if index is not None:
+                return get_radius_stats(index, data)
+
         qs = self.get_queryset_within_radius(data)
         return qs.aggregate(
             min_concentration=Round(Min("concentration_value"), 4),
@@ -186,18 +465,258 @@ class AirCompoundStatsWithinRadiusView(APIView):
     def get_queryset_within_radius(data):
         """
         Returns a queryset of air compound readings within the specified radius.
+
+        Around a known location, nearby locations are looked up in the
+        precomputed neighbor table instead of scanning geographies.
         """
-        center = Point(
-            x=data.get("longitude"),
-            y=data.get("latitude"),
-            srid=4326,
-        )
+        if data.get("location") is not None:
+            within_radius = get_nearby_filter(
+                data["location"], data["radius"], field="location"
+            )
+        else:
+            center = Point(
+                x=data.get("longitude"),
+                y=data.get("latitude"),
+                srid=4326,
+            )
+            within_radius = Q(
+                location__coordinates__dwithin=(center, D(km=data.get("radius")))
+            )
         qs = AirCompoundReading.objects.filter(
+            within_radius,
             compound=data.get("compound"),
-            location__coordinates__dwithin=(center, D(km=data.get("radius"))),
             timestamp__gte=data.get("start_date"),
             timestamp__lte=data.get("end_date"),
         )
+        if data.get("exclude_flagged", True):
+            qs = qs.filter(is_flagged=False)
         return get_qs_with_converted_concentration(
             queryset=qs, target_unit=data.get("concentration_unit")
         )
+
+
+class ReadingStreamView(APIView):
+    """
+    API view streaming new readings as server-sent events.
+
+    Browser EventSource clients cannot send an Authorization header, so a JWT
+    access token is also accepted in the "access_token" query parameter.
+    """
+
+    authentication_classes = [
+        *api_settings.DEFAULT_AUTHENTICATION_CLASSES,
+        QueryParameterJWTAuthentication,
+    ]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, EventStreamRenderer]
+
+    @swagger_auto_schema(query_serializer=ReadingStreamQuerySerializer)
+    def get(self, request, *args, **kwargs):
+        """
+        Subscribes to new readings matching the given compounds and locations.
+
+        The stream is served asynchronously and requires an ASGI server.
+        """
+        query_serializer = ReadingStreamQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+
+        response = StreamingHttpResponse(
+            stream_events(self.get_subscription(query_serializer.validated_data)),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    @staticmethod
+    def get_subscription(data) -> Subscription:
+        """
+        Resolves subscription filters into compound and location id sets.
+        """
+        compound_ids = None
+        if data.get("compound"):
+            compound_ids = frozenset(compound.pk for compound in data["compound"])
+
+        if not any(data.get(name) for name in ("location", "tag", "radius")):
+            return Subscription(compound_ids=compound_ids)
+
+        locations = Location.objects.all()
+        if data.get("location"):
+            locations = locations.filter(
+                pk__in=[location.pk for location in data["location"]]
+            )
+        if data.get("tag"):
+            locations = locations.filter(
+                tag_ids__overlap=[tag.pk for tag in data["tag"]]
+            )
+        if data.get("radius"):
+            center = Point(x=data["longitude"], y=data["latitude"], srid=4326)
+            locations = locations.filter(
+                coordinates__dwithin=(center, D(km=data["radius"]))
+            )
+        return Subscription(
+            compound_ids=compound_ids,
+            location_ids=frozenset(locations.values_list("id", flat=True)),
+        )
+
+
+class RollingMeanView(APIView):
+    """
+    API view streaming rolling means of hourly concentrations per location.
+    """
+
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+
+    @swagger_auto_schema(query_serializer=RollingMeanQuerySerializer)
+    def get(self, request, *args, **kwargs):
+        """
+        Streams one JSON line per location and hour with the mean of the
+        preceding `window_hours` hourly means, in the requested unit.
+        """
+        query_serializer = RollingMeanQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+
+        return StreamingHttpResponse(
+            stream_rolling_means(query_serializer.validated_data),
+            content_type="application/x-ndjson",
+        )
+
+
+class InterpolationView(APIView):
+    """
+    API view interpolating concentrations between locations on a grid.
+    """
+
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, GridPNGRenderer]
+
+    @swagger_auto_schema(query_serializer=InterpolationQuerySerializer)
+    def get(self, request, *args, **kwargs):
+        """
+        Retrieves an inverse-distance-weighted grid of mean concentrations
+        over a bounding box, as JSON rows from north to south or as a PNG.
+        """
+        query_serializer = InterpolationQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        data = query_serializer.validated_data
+
+        return Response(
+            {
+                **get_interpolated_grid(data),
+                "compound": data["compound"].symbol,
+                "concentration_unit": data["concentration_unit"],
+                "start_date": data["start_date"],
+                "end_date": data["end_date"],
+            }
+        )
+
+
+class LatestReadingsView(APIView):
+    """
+    API view to retrieve the latest reading of each location and compound.
+    """
+
+    @swagger_auto_schema(query_serializer=LatestReadingsQuerySerializer)
+    def get(self, request, *args, **kwargs):
+        """
+        Retrieves the latest unflagged reading of each location and compound
+        within the last hours, in the requested unit.
+        """
+        query_serializer = LatestReadingsQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        data = query_serializer.validated_data
+
+        since = timezone.now() - timedelta(hours=data["hours"])
+        index = get_recent_index(start=since)
+        if index is not None:
+            latest = get_latest_values(index, data, since=since)
+        else:
+            latest = self.get_latest_from_database(data, since=since)
+        return Response(
+            [
+                {**reading, "concentration_unit": data["concentration_unit"]}
+                for reading in latest
+            ]
+        )
+
+    @staticmethod
+    def get_latest_from_database(data, since):
+        """
+        Returns the latest reading of each location and compound since a date.
+        """
+        qs = AirCompoundReading.objects.filter(timestamp__gte=since, is_flagged=False)
+        if data.get("compound"):
+            qs = qs.filter(compound__in=data["compound"])
+        if data.get("location"):
+            qs = qs.filter(location__in=data["location"])
+        rows = (
+            get_qs_with_converted_concentration(
+                queryset=qs, target_unit=data["concentration_unit"]
+            )
+            .order_by("location_id", "compound_id", "-timestamp")
+            .distinct("location_id", "compound_id")
+            .values_list(
+                "location__name",
+                "compound__symbol",
+                "timestamp",
+                Round("concentration_value", 4),
+            )
+        )
+        return [
+            {
+                "location": location,
+                "compound": compound,
+                "timestamp": timestamp,
+                "concentration_value": value,
+            }
+            for location, compound, timestamp, value in rows
+        ]
+
+
+class ReadingSeriesView(APIView):
+    """
+    API view to retrieve the readings of one location and compound as columns.
+    """
+
+    @swagger_auto_schema(query_serializer=ReadingSeriesQuerySerializer)
+    def get(self, request, *args, **kwargs):
+        """
+        Retrieves unflagged reading timestamps and values in time order.
+        """
+        query_serializer = ReadingSeriesQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        data = query_serializer.validated_data
+
+        index = get_recent_index(start=data["start_date"])
+        if index is not None:
+            series = get_series(index, data)
+        else:
+            series = self.get_series_from_database(data)
+        timestamps, values = zip(*series) if series else ((), ())
+        return Response(
+            {
+                "location": data["location"].name,
+                "compound": data["compound"].symbol,
+                "concentration_unit": data["concentration_unit"],
+                "timestamps": list(timestamps),
+                "values": list(values),
+            }
+        )
+
+    @staticmethod
+    def get_series_from_database(data):
+        """
+        Returns (timestamp, value) pairs of one location and compound.
+        """
+        qs = AirCompoundReading.objects.filter(
+            location=data["location"],
+            compound=data["compound"],
+            timestamp__gte=data["start_date"],
+            timestamp__lt=data["end_date"],
+            is_flagged=False,
+        )
+        return list(
+            get_qs_with_converted_concentration(
+                queryset=qs, target_unit=data["concentration_unit"]
+            )
+            .order_by("timestamp")
+            .values_list("timestamp", Round("concentration_value", 4))
+        )
@@ -0,0 +1,28 @@
+from apps.monitoring.models import SlowQueryFingerprint
+from django.contrib import admin
+
+
+@admin.register(SlowQueryFingerprint)
+class SlowQueryFingerprintAdmin(admin.ModelAdmin):
+    """
+    Read-only admin report of slow query fingerprints.
+    """
+
+    list_display = (
+        "fingerprint",
+        "calls",
+        "total_duration_ms",
+        "max_duration_ms",
+        "mean_duration_ms",
+        "last_view",
+        "last_seen",
+    )
+    list_filter = ("last_view",)
+    search_fields = ("normalized_sql", "last_view")
+    readonly_fields = [field.name for field in SlowQueryFingerprint._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
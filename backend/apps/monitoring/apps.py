@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    """
+    Configuration for the database monitoring application.
+    """
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.monitoring"
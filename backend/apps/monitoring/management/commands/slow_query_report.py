@@ -0,0 +1,53 @@
+from apps.monitoring.models import SlowQueryFingerprint
+from django.core.management.base import BaseCommand
+from django.db.models import ExpressionWrapper, F, FloatField
+
+ORDERINGS = {
+    "total": "-total_duration_ms",
+    "max": "-max_duration_ms",
+    "mean": "-mean_duration",
+    "calls": "-calls",
+}
+
+
+class Command(BaseCommand):
+    """
+    Prints slow query fingerprints aggregated by the slow query log.
+    """
+
+    help = "Reports slow queries aggregated by fingerprint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--order-by", choices=ORDERINGS.keys(), default="total")
+        parser.add_argument(
+            "--explain", action="store_true", help="Print captured query plans."
+        )
+        parser.add_argument(
+            "--reset", action="store_true", help="Delete all aggregated entries."
+        )
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            deleted, _ = SlowQueryFingerprint.objects.all().delete()
+            self.stdout.write(f"Deleted {deleted} slow query fingerprints.")
+            return
+
+        fingerprints = SlowQueryFingerprint.objects.annotate(
+            mean_duration=ExpressionWrapper(
+                F("total_duration_ms") / F("calls"), output_field=FloatField()
+            )
+        ).order_by(ORDERINGS[options["order_by"]])[: options["limit"]]
+
+        for entry in fingerprints:
+            self.stdout.write(
+                f"{entry.fingerprint[:12]}  calls={entry.calls}  "
+                f"total={entry.total_duration_ms:.1f}ms  "
+                f"max={entry.max_duration_ms:.1f}ms  "
+                f"mean={entry.mean_duration:.1f}ms  view={entry.last_view}"
+            )
+            self.stdout.write(f"    {entry.normalized_sql}")
+            if entry.last_params:
+                self.stdout.write(f"    params: {entry.last_params}")
+            if options["explain"] and entry.last_explain:
+                self.stdout.write(entry.last_explain)
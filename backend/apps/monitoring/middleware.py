@@ -0,0 +1,48 @@
+from contextlib import ExitStack
+
+from apps.monitoring.query_log import (
+    SlowQueryCollector,
+    get_slow_query_config,
+    record_slow_queries,
+)
+from django.db import connections
+
+
+class SlowQueryLogMiddleware:
+    """
+    Middleware recording slow queries executed while handling a request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = get_slow_query_config()
+        if not config["ENABLED"]:
+            return self.get_response(request)
+
+        collector = SlowQueryCollector(threshold_ms=config["THRESHOLD_MS"])
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(collector))
+            response = self.get_response(request)
+
+        if collector.queries:
+            record_slow_queries(
+                queries=collector.queries,
+                view=self.get_view_name(request),
+                params=request.GET.dict(),
+                explain_sample_rate=config["EXPLAIN_SAMPLE_RATE"],
+            )
+
+        return response
+
+    @staticmethod
+    def get_view_name(request) -> str:
+        """
+        Returns the name of the view that handled the request.
+        """
+        match = request.resolver_match
+        if match is None:
+            return request.path
+        return match.view_name or match._func_path
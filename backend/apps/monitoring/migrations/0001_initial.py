@@ -0,0 +1,40 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQueryFingerprint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("fingerprint", models.CharField(max_length=40, unique=True)),
+                ("normalized_sql", models.TextField()),
+                ("calls", models.PositiveBigIntegerField(default=0)),
+                ("total_duration_ms", models.FloatField(default=0)),
+                ("max_duration_ms", models.FloatField(default=0)),
+                ("last_view", models.CharField(blank=True, max_length=200)),
+                ("last_params", models.JSONField(blank=True, default=dict)),
+                ("last_explain", models.TextField(blank=True)),
+                ("first_seen", models.DateTimeField(auto_now_add=True)),
+                ("last_seen", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ("-total_duration_ms",),
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import models
+
+
+class SlowQueryFingerprint(models.Model):
+    """
+    Model aggregating slow queries sharing the same normalized SQL.
+    """
+
+    fingerprint = models.CharField(max_length=40, unique=True)
+    normalized_sql = models.TextField()
+    calls = models.PositiveBigIntegerField(default=0)
+    total_duration_ms = models.FloatField(default=0)
+    max_duration_ms = models.FloatField(default=0)
+    last_view = models.CharField(max_length=200, blank=True)
+    last_params = models.JSONField(default=dict, blank=True)
+    last_explain = models.TextField(blank=True)
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ("-total_duration_ms",)
+
+    def __str__(self):
+        return self.fingerprint
+
+    @property
+    def mean_duration_ms(self):
+        """
+        Returns the mean duration of the aggregated queries.
+        """
+        if not self.calls:
+            return 0.0
+        return self.total_duration_ms / self.calls
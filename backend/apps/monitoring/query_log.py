@@ -0,0 +1,180 @@
+import hashlib
+import logging
+import random
+import re
+import time
+from dataclasses import dataclass
+
+from apps.monitoring.models import SlowQueryFingerprint
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connections, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_LOG = {
+    "ENABLED": False,
+    "THRESHOLD_MS": 200,
+    "EXPLAIN_SAMPLE_RATE": 0.0,
+}
+"""
+Default slow query log configuration, overridden by settings.SLOW_QUERY_LOG.
+"""
+
+NORMALIZATION_RULES = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\?(?:\s*,\s*\?)+"), "?, ..."),
+    (re.compile(r"\s+"), " "),
+)
+"""
+Ordered regex substitutions turning raw SQL into a normalized statement.
+"""
+
+LOCKING_CLAUSE = re.compile(
+    r"\bFOR\s+(?:NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.IGNORECASE
+)
+"""
+Row locking clause of a SELECT, which is never explained.
+"""
+
+
+@dataclass
+class SlowQuery:
+    """
+    Single query that took longer than the configured threshold.
+    """
+
+    sql: str
+    params: object
+    many: bool
+    duration_ms: float
+    alias: str
+
+
+def get_slow_query_config():
+    """
+    Returns the slow query log configuration merged with defaults.
+    """
+    return {**DEFAULT_SLOW_QUERY_LOG, **getattr(settings, "SLOW_QUERY_LOG", {})}
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Replaces literals and placeholders so similar queries share one statement.
+    """
+    for pattern, replacement in NORMALIZATION_RULES:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def fingerprint_sql(normalized_sql: str) -> str:
+    """
+    Returns a stable fingerprint of a normalized SQL statement.
+    """
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()
+
+
+class SlowQueryCollector:
+    """
+    Database execute wrapper collecting queries slower than a threshold.
+    """
+
+    def __init__(self, threshold_ms: float):
+        self.threshold_ms = threshold_ms
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if duration_ms >= self.threshold_ms:
+                self.queries.append(
+                    SlowQuery(
+                        sql=sql,
+                        params=params,
+                        many=many,
+                        duration_ms=duration_ms,
+                        alias=context["connection"].alias,
+                    )
+                )
+
+
+def explain_query(query: SlowQuery) -> str:
+    """
+    Returns the EXPLAIN plan of a slow read query.
+
+    The plan is only estimated: the query is not run again, so a sampled
+    request does not pay for it twice. Queries locking rows are skipped.
+    """
+    connection = connections[query.alias]
+    if connection.vendor != "postgresql" or query.many:
+        return ""
+    if not query.sql.lstrip().upper().startswith("SELECT"):
+        return ""
+    if LOCKING_CLAUSE.search(query.sql):
+        return ""
+
+    try:
+        with transaction.atomic(using=query.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN {query.sql}", query.params)
+                return "\n".join(row[0] for row in cursor.fetchall())
+    except DatabaseError:
+        logger.exception("Unable to explain slow query.")
+        return ""
+
+
+def record_slow_queries(queries, view: str, params: dict, explain_sample_rate=0.0):
+    """
+    Logs slow queries and aggregates them by fingerprint.
+    """
+    for query in queries:
+        normalized_sql = normalize_sql(query.sql)
+        fingerprint = fingerprint_sql(normalized_sql)
+        logger.warning(
+            "Slow query (%.1f ms) in %s with %s: %s",
+            query.duration_ms,
+            view,
+            params,
+            normalized_sql,
+        )
+
+        explain = ""
+        if explain_sample_rate and random.random() < explain_sample_rate:
+            explain = explain_query(query)
+
+        updates = {
+            "calls": F("calls") + 1,
+            "total_duration_ms": F("total_duration_ms") + query.duration_ms,
+            "max_duration_ms": Greatest("max_duration_ms", Value(query.duration_ms)),
+            "last_view": view,
+            "last_params": params,
+            "last_seen": timezone.now(),
+        }
+        if explain:
+            updates["last_explain"] = explain
+
+        fingerprints = SlowQueryFingerprint.objects.filter(fingerprint=fingerprint)
+        if fingerprints.update(**updates):
+            continue
+
+        try:
+            with transaction.atomic():
+                SlowQueryFingerprint.objects.create(
+                    fingerprint=fingerprint,
+                    normalized_sql=normalized_sql,
+                    calls=1,
+                    total_duration_ms=query.duration_ms,
+                    max_duration_ms=query.duration_ms,
+                    last_view=view,
+                    last_params=params,
+                    last_explain=explain,
+                )
+        except IntegrityError:
+            fingerprints.update(**updates)
@@ -0,0 +1,131 @@
+import pytest
+from apps.monitoring.models import SlowQueryFingerprint
+from apps.monitoring.query_log import (
+    SlowQuery,
+    SlowQueryCollector,
+    explain_query,
+    fingerprint_sql,
+    normalize_sql,
+)
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+
+from apps.users.tests.factories import UserFactory
+from core.tests.factories import APIClientFactory
+
+
+class TestNormalizeSql:
+    """Test suite for SQL normalization."""
+
+    def test_literals_and_placeholders_are_replaced(self):
+        """Test that literals and placeholders are normalized."""
+        sql = "SELECT * FROM t WHERE name = 'abc' AND id = 42 AND x = %s"
+        assert (
+            normalize_sql(sql) == "SELECT * FROM t WHERE name = ? AND id = ? AND x = ?"
+        )
+
+    def test_in_lists_of_any_length_share_a_fingerprint(self):
+        """Test that IN lists of different sizes produce the same fingerprint."""
+        short = normalize_sql("SELECT * FROM t WHERE id IN (%s, %s)")
+        long = normalize_sql("SELECT * FROM t WHERE id IN (%s, %s, %s, %s)")
+        assert short == long
+        assert fingerprint_sql(short) == fingerprint_sql(long)
+
+
+@pytest.mark.django_db
+class TestSlowQueryCollector:
+    """Test suite for the slow query execute wrapper."""
+
+    def test_collects_queries_over_threshold(self):
+        """Test that queries slower than the threshold are collected."""
+        collector = SlowQueryCollector(threshold_ms=0)
+        with connection.execute_wrapper(collector):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+
+        assert len(collector.queries) == 1
+        assert collector.queries[0].sql == "SELECT 1"
+
+    def test_ignores_fast_queries(self):
+        """Test that queries faster than the threshold are ignored."""
+        collector = SlowQueryCollector(threshold_ms=60_000)
+        with connection.execute_wrapper(collector):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+
+        assert collector.queries == []
+
+
+def make_slow_query(sql):
+    return SlowQuery(sql=sql, params=None, many=False, duration_ms=500, alias="default")
+
+
+@pytest.mark.django_db
+class TestExplainQuery:
+    """Test suite for EXPLAIN sampling of slow queries."""
+
+    def test_plan_is_estimated_without_running_the_query(self):
+        """Test that slow queries are explained without ANALYZE."""
+        plan = explain_query(
+            make_slow_query("SELECT * FROM monitoring_slowqueryfingerprint")
+        )
+
+        assert "Seq Scan" in plan
+        assert "actual time" not in plan
+
+    @pytest.mark.parametrize("clause", ["FOR UPDATE", "for share", "FOR NO KEY UPDATE"])
+    def test_locking_queries_are_skipped(self, clause):
+        """Test that queries locking rows are never explained."""
+        query = make_slow_query(
+            f"SELECT * FROM monitoring_slowqueryfingerprint {clause}"
+        )
+
+        assert explain_query(query) == ""
+
+
+@pytest.mark.django_db
+class TestSlowQueryLogMiddleware:
+    """Test suite for the slow query log middleware."""
+
+    def test_slow_queries_are_aggregated_by_fingerprint(self, settings):
+        """Test that repeated requests aggregate into fingerprints."""
+        settings.SLOW_QUERY_LOG = {"ENABLED": True, "THRESHOLD_MS": 0}
+        client = APIClientFactory(user=UserFactory())
+
+        client.get(reverse("tags-list"), {"ordering": "name"})
+        client.get(reverse("tags-list"), {"ordering": "name"})
+
+        entry = SlowQueryFingerprint.objects.get(
+            normalized_sql__contains='FROM "air_quality_tag"',
+            normalized_sql__icontains="ORDER BY",
+        )
+        assert entry.calls == 2
+        assert entry.last_view == "tags-list"
+        assert entry.last_params == {"ordering": "name"}
+
+    def test_disabled_log_records_nothing(self, settings):
+        """Test that nothing is recorded when the log is disabled."""
+        settings.SLOW_QUERY_LOG = {"ENABLED": False, "THRESHOLD_MS": 0}
+        client = APIClientFactory(user=UserFactory())
+
+        client.get(reverse("tags-list"))
+
+        assert not SlowQueryFingerprint.objects.exists()
+
+    def test_report_command_lists_fingerprints(self, capsys):
+        """Test that the report command prints aggregated fingerprints."""
+        SlowQueryFingerprint.objects.create(
+            fingerprint="abc123",
+            normalized_sql="SELECT ?",
+            calls=2,
+            total_duration_ms=500,
+            max_duration_ms=300,
+            last_view="readings-list",
+        )
+
+        call_command("slow_query_report")
+
+        output = capsys.readouterr().out
+        assert "abc123" in output
+        assert "mean=250.0ms" in output
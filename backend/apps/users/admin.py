@@ -1,3 +1,23 @@
+from apps.users.models import APIKey
 from django.contrib import admin
 
-# Register your models here.
+
+@admin.register(APIKey)
+class APIKeyAdmin(admin.ModelAdmin):
+    """
+    Admin for API keys; keys are created with the create_api_key command.
+    """
+
+    list_display = ("name", "prefix", "user", "scope", "created_at", "revoked_at")
+    list_filter = ("scope",)
+    search_fields = ("name", "prefix", "user__username")
+    readonly_fields = ("prefix", "hashed_key", "created_at", "revoked_at")
+    actions = ("revoke_keys",)
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Revoke selected API keys")
+    def revoke_keys(self, request, queryset):
+        for api_key in queryset.filter(revoked_at__isnull=True):
+            api_key.revoke()
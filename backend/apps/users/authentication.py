@@ -0,0 +1,157 @@
+from apps.users.models import APIKey
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import HTTP_HEADER_ENCODING
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def get_user_cache_key(user_id) -> str:
+    """
+    Returns the cache key of an authenticated user.
+    """
+    return f"users:auth_user:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    """
+    Removes a user from the authentication cache.
+    """
+    cache.delete(get_user_cache_key(user_id))
+
+
+def get_api_key_cache_key(prefix: str) -> str:
+    """
+    Returns the cache key of an API key.
+    """
+    return f"users:api_key:{prefix}"
+
+
+def invalidate_cached_api_keys(prefixes):
+    """
+    Removes API keys from the authentication cache.
+    """
+    cache.delete_many([get_api_key_cache_key(prefix) for prefix in prefixes])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication caching user lookups by id for AUTH_USER_CACHE_TIMEOUT seconds.
+
+    Cached users are invalidated whenever they are saved or deleted, so
+    deactivation takes effect on the next request.
+    """
+
+    def get_user(self, validated_token):
+        """
+        Returns the token user from the cache, querying the database on a miss.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        cache_key = get_user_cache_key(user_id)
+        user = cache.get(cache_key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(cache_key, user, getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 60))
+            return user
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+
+class QueryParameterJWTAuthentication(CachedJWTAuthentication):
+    """
+    JWT authentication reading the access token from the "access_token" query parameter.
+
+    Meant for streaming clients such as browser EventSource, which cannot send
+    headers. Access tokens are short-lived, but URLs may be kept in server and
+    proxy logs, so API keys are never accepted this way.
+    """
+
+    query_param = "access_token"
+
+    def authenticate(self, request):
+        raw_token = request.query_params.get(self.query_param)
+        if not raw_token:
+            return None
+
+        validated_token = self.get_validated_token(
+            raw_token.encode(HTTP_HEADER_ENCODING)
+        )
+        return self.get_user(validated_token), validated_token
+
+
+class APIKeyAuthentication(BaseAuthentication):
+    """
+    Authentication for machine-to-machine clients using "Authorization: Api-Key <key>".
+
+    Keys are looked up by their unique prefix, verified against the stored digest
+    in constant time and cached for API_KEY_CACHE_TIMEOUT seconds, so high-rate
+    writers authenticate without any query.
+    """
+
+    keyword = "Api-Key"
+
+    def authenticate(self, request):
+        parts = get_authorization_header(request).split()
+        if not parts or parts[0] != self.keyword.encode(HTTP_HEADER_ENCODING):
+            return None
+
+        if len(parts) != 2:
+            raise AuthenticationFailed(
+                _("Authorization header must contain two space-delimited values"),
+                code="bad_authorization_header",
+            )
+
+        try:
+            raw_key = parts[1].decode(HTTP_HEADER_ENCODING)
+        except UnicodeError:
+            raise AuthenticationFailed(_("Invalid API key."), code="invalid_api_key")
+
+        api_key = self.get_api_key(raw_key)
+        if api_key is None or api_key.is_revoked or not api_key.matches(raw_key):
+            raise AuthenticationFailed(_("Invalid API key."), code="invalid_api_key")
+
+        if not api_key.user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return api_key.user, api_key
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+    @staticmethod
+    def get_api_key(raw_key: str):
+        """
+        Returns the API key matching the prefix of a raw key, from the cache if possible.
+        """
+        prefix = raw_key.split(".", 1)[0]
+        cache_key = get_api_key_cache_key(prefix)
+        api_key = cache.get(cache_key)
+        if api_key is None:
+            api_key = (
+                APIKey.objects.select_related("user").filter(prefix=prefix).first()
+            )
+            if api_key is None:
+                return None
+            cache.set(
+                cache_key, api_key, getattr(settings, "API_KEY_CACHE_TIMEOUT", 300)
+            )
+        return api_key
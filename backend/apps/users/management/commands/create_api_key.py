@@ -0,0 +1,33 @@
+from apps.users.models import APIKey
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """
+    Creates an API key for a user and prints its raw value once.
+    """
+
+    help = "Creates an API key for a sensor gateway."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("name", help="Human readable name of the key.")
+        parser.add_argument(
+            "--scope",
+            choices=[scope for scope, _ in APIKey.SCOPES],
+            default=APIKey.INGEST_SCOPE,
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["username"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User '{options['username']}' does not exist.")
+
+        api_key, raw_key = APIKey.generate(
+            user=user, name=options["name"], scope=options["scope"]
+        )
+        self.stdout.write(f"Created API key {api_key.prefix} for {user.username}.")
+        self.stdout.write("Store it now, it will not be shown again:")
+        self.stdout.write(raw_key)
@@ -0,0 +1,22 @@
+from apps.users.models import APIKey
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """
+    Revokes an API key by prefix.
+    """
+
+    help = "Revokes an API key."
+
+    def add_arguments(self, parser):
+        parser.add_argument("prefix")
+
+    def handle(self, *args, **options):
+        try:
+            api_key = APIKey.objects.get(prefix=options["prefix"])
+        except APIKey.DoesNotExist:
+            raise CommandError(f"API key '{options['prefix']}' does not exist.")
+
+        api_key.revoke()
+        self.stdout.write(f"Revoked API key {api_key.prefix}.")
@@ -1,3 +1,72 @@
+import hashlib
+import hmac
+import secrets
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
+
+
+def hash_api_key(raw_key: str) -> str:
+    """
+    Returns the SHA-256 digest of a raw API key.
+    """
+    return hashlib.sha256(raw_key.encode()).hexdigest()
+
+
+class APIKey(models.Model):
+    """
+    Model for hashed, revocable API keys used by sensor gateways.
+
+    Keys are random high-entropy secrets, so a fast hash is enough to store them
+    safely. The raw key is only returned once, when the key is generated.
+    """
+
+    INGEST_SCOPE = "ingest"
+    SCOPES = ((INGEST_SCOPE, "Reading ingestion"),)
+
+    user = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="api_keys"
+    )
+    name = models.CharField(max_length=64)
+    prefix = models.CharField(max_length=16, unique=True)
+    hashed_key = models.CharField(max_length=64)
+    scope = models.CharField(max_length=20, choices=SCOPES, default=INGEST_SCOPE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.prefix})"
+
+    @property
+    def is_revoked(self) -> bool:
+        return self.revoked_at is not None
+
+    @classmethod
+    def generate(cls, user, name: str, scope: str = INGEST_SCOPE):
+        """
+        Creates a new key and returns it with its raw value.
+        """
+        prefix = secrets.token_hex(4)
+        raw_key = f"{prefix}.{secrets.token_urlsafe(32)}"
+        api_key = cls.objects.create(
+            user=user,
+            name=name,
+            prefix=prefix,
+            hashed_key=hash_api_key(raw_key),
+            scope=scope,
+        )
+        return api_key, raw_key
+
+    def matches(self, raw_key: str) -> bool:
+        """
+        Compares a raw key with the stored digest in constant time.
+        """
+        return hmac.compare_digest(self.hashed_key, hash_api_key(raw_key))
 
-# Create your models here.
+    def revoke(self):
+        """
+        Revokes the key.
+        """
+        self.revoked_at = timezone.now()
+        self.save(update_fields=["revoked_at"])
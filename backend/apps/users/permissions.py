@@ -0,0 +1,19 @@
+from apps.users.models import APIKey
+from rest_framework.permissions import BasePermission
+
+
+class APIKeyScopePermission(BasePermission):
+    """
+    Restricts API key authenticated requests to the view actions matching the key scope.
+
+    Views declare the actions reachable with an API key through an ``api_key_scopes``
+    mapping of action names to scopes; requests authenticated otherwise are unaffected.
+    """
+
+    message = "This API key is not allowed to perform this action."
+
+    def has_permission(self, request, view):
+        if not isinstance(request.auth, APIKey):
+            return True
+        scopes = getattr(view, "api_key_scopes", {})
+        return scopes.get(getattr(view, "action", None)) == request.auth.scope
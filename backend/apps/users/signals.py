@@ -0,0 +1,26 @@
+from apps.users.authentication import invalidate_cached_api_keys, invalidate_cached_user
+from apps.users.models import APIKey
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_user_cache(sender, instance, **kwargs):
+    """
+    Drops a saved or deleted user and its API keys from the authentication cache.
+    """
+    invalidate_cached_user(instance.pk)
+    invalidate_cached_api_keys(
+        APIKey.objects.filter(user_id=instance.pk).values_list("prefix", flat=True)
+    )
+
+
+@receiver(post_save, sender=APIKey)
+@receiver(post_delete, sender=APIKey)
+def invalidate_api_key_cache(sender, instance, **kwargs):
+    """
+    Drops a saved, revoked or deleted API key from the authentication cache.
+    """
+    invalidate_cached_api_keys([instance.prefix])
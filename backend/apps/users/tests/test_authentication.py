@@ -0,0 +1,156 @@
+import pytest
+from apps.air_quality.tests.factories import CompoundFactory, LocationFactory
+from apps.users.authentication import (
+    APIKeyAuthentication,
+    CachedJWTAuthentication,
+    get_user_cache_key,
+)
+from apps.users.models import APIKey
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .factories import UserFactory
+
+
+@pytest.fixture
+def user():
+    user = UserFactory()
+    cache.delete(get_user_cache_key(user.pk))
+    return user
+
+
+@pytest.fixture
+def token(user):
+    return AccessToken.for_user(user)
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    """Test suite for cached JWT authentication."""
+
+    def test_user_is_cached_after_first_lookup(
+        self, user, token, django_assert_num_queries
+    ):
+        """Test that only the first authentication queries the user."""
+        authentication = CachedJWTAuthentication()
+
+        with django_assert_num_queries(1):
+            assert authentication.get_user(token) == user
+        with django_assert_num_queries(0):
+            assert authentication.get_user(token) == user
+
+    def test_deactivated_user_is_rejected(self, user, token):
+        """Test that deactivating a user invalidates its cache entry."""
+        authentication = CachedJWTAuthentication()
+        authentication.get_user(token)
+
+        user.is_active = False
+        user.save()
+
+        with pytest.raises(AuthenticationFailed):
+            authentication.get_user(token)
+
+    def test_deleted_user_is_rejected(self, user, token):
+        """Test that deleting a user invalidates its cache entry."""
+        authentication = CachedJWTAuthentication()
+        authentication.get_user(token)
+
+        user.delete()
+
+        with pytest.raises(AuthenticationFailed):
+            authentication.get_user(token)
+
+    def test_authenticated_request(self, token):
+        """Test that API requests authenticate with a bearer token."""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = client.get(reverse("tags-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.fixture
+def api_key(user):
+    return APIKey.generate(user=user, name="gateway")
+
+
+@pytest.fixture
+def reading_data():
+    location = LocationFactory()
+    compound = CompoundFactory()
+    return {
+        "compound": compound.full_name,
+        "location": location.name,
+        "entered_concentration_value": 42.0,
+        "entered_concentration_unit": "ug_m3",
+    }
+
+
+def api_key_client(raw_key):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Api-Key {raw_key}")
+    return client
+
+
+@pytest.mark.django_db
+class TestAPIKeyAuthentication:
+    """Test suite for API key authentication."""
+
+    def test_api_key_can_create_readings(self, api_key, reading_data):
+        """Test that an ingestion key can post readings."""
+        _, raw_key = api_key
+
+        response = api_key_client(raw_key).post(
+            reverse("readings-list"), reading_data, format="json"
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_api_key_is_limited_to_its_scope(self, api_key):
+        """Test that an ingestion key cannot read other endpoints."""
+        _, raw_key = api_key
+
+        response = api_key_client(raw_key).get(reverse("readings-list"))
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_cached_api_key_authenticates_without_queries(
+        self, api_key, django_assert_num_queries
+    ):
+        """Test that verified keys are served from the cache."""
+        _, raw_key = api_key
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Api-Key {raw_key}")
+        authentication = APIKeyAuthentication()
+        authentication.authenticate(request)
+
+        with django_assert_num_queries(0):
+            user, auth = authentication.authenticate(request)
+
+        assert auth.prefix == api_key[0].prefix
+
+    @pytest.mark.parametrize(
+        "mangle", [lambda key: key + "x", lambda key: "deadbeef." + key.split(".")[1]]
+    )
+    def test_invalid_api_key_is_rejected(self, api_key, mangle):
+        """Test that wrong secrets and unknown prefixes are rejected."""
+        _, raw_key = api_key
+
+        response = api_key_client(mangle(raw_key)).get(reverse("readings-list"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_revoked_api_key_is_rejected(self, api_key, reading_data):
+        """Test that revoking a key invalidates its cache entry."""
+        key, raw_key = api_key
+        client = api_key_client(raw_key)
+        client.post(reverse("readings-list"), reading_data, format="json")
+
+        key.revoke()
+        response = client.post(reverse("readings-list"), reading_data, format="json")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,55 @@
+"""
+Measures per-request authentication overhead of JWT authentication classes.
+
+Runs against the configured database and needs an existing user:
+
+    python -m benchmarks.bench_authentication --username admin
+"""
+
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from apps.users.authentication import CachedJWTAuthentication  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from rest_framework_simplejwt.authentication import JWTAuthentication  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+
+def bench(authentication, request, iterations: int) -> float:
+    """
+    Returns the mean time in microseconds spent authenticating a request.
+    """
+    authentication.authenticate(request)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        authentication.authenticate(request)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    user = get_user_model().objects.get(username=args.username)
+    token = AccessToken.for_user(user)
+    request = Request(
+        APIRequestFactory().get("/readings", HTTP_AUTHORIZATION=f"Bearer {token}")
+    )
+
+    for authentication in (JWTAuthentication(), CachedJWTAuthentication()):
+        mean = bench(authentication, request, args.iterations)
+        print(f"{type(authentication).__name__}: {mean:.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compares DRF's JSONRenderer with ORJSONRenderer on large GeoJSON feature collections.
+
+    python -m benchmarks.bench_json --features 20000
+"""
+
+import argparse
+import os
+import random
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from django.contrib.gis.geos import Point  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework_gis.fields import GeoJsonDict  # noqa: E402
+
+from core.renderers import ORJSONRenderer  # noqa: E402
+
+
+def make_feature_collection(features: int) -> dict:
+    """
+    Returns a payload shaped like paginated LocationSerializer output.
+    """
+    return {
+        "count": features,
+        "next": None,
+        "previous": None,
+        "results": {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "id": index,
+                    "type": "Feature",
+                    "geometry": GeoJsonDict(
+                        Point(random.uniform(-180, 180), random.uniform(-90, 90))
+                    ),
+                    "properties": {
+                        "name": f"Station {index}",
+                        "tags": ["urban", "traffic"],
+                    },
+                }
+                for index in range(features)
+            ],
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--features", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    payload = make_feature_collection(args.features)
+    for renderer in (JSONRenderer(), ORJSONRenderer()):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            content = renderer.render(payload)
+        elapsed_ms = (time.perf_counter() - start) / args.repeat * 1000
+        print(
+            f"{type(renderer).__name__:<16} {elapsed_ms:8.2f} ms  {len(content)} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compares encode time and payload size of reading renderers.
+
+    python -m benchmarks.bench_renderers --rows 10000
+"""
+
+import argparse
+import os
+import random
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from apps.air_quality.renderers import READING_RENDERER_CLASSES  # noqa: E402
+
+
+def make_page(rows: int, locations: int = 50, compounds: int = 8) -> dict:
+    """
+    Returns a paginated payload shaped like AirCompoundReadingSerializer output.
+    """
+    return {
+        "count": rows,
+        "next": None,
+        "previous": None,
+        "results": [
+            {
+                "id": index,
+                "location": f"Station {random.randrange(locations)}",
+                "compound": f"Compound {random.randrange(compounds)}",
+                "concentration_unit": random.choice(["ug_m3", "mg_m3", "ppm", "ppb"]),
+                "concentration_value": round(random.uniform(0, 500), 4),
+                "timestamp": "2025-01-27T00:00:00.123456Z",
+            }
+            for index in range(rows)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    page = make_page(args.rows)
+    for renderer_class in READING_RENDERER_CLASSES:
+        renderer = renderer_class()
+        if renderer.format == "api":
+            continue
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            content = renderer.render(page, renderer.media_type, {})
+        elapsed_ms = (time.perf_counter() - start) / args.repeat * 1000
+        print(
+            f"{renderer_class.__name__:<24} {elapsed_ms:8.2f} ms  {len(content):>10} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Measures requests per second of a running API endpoint.
+
+Compare connection handling strategies by starting the server with different
+environment variables and running the same benchmark against it, e.g.:
+
+    DB_CONN_MAX_AGE=0 python manage.py runserver      # new connection per request
+    DB_CONN_MAX_AGE=60 python manage.py runserver     # persistent connections
+    DB_POOL=true python manage.py runserver           # psycopg connection pool
+
+    python -m benchmarks.bench_requests --url http://localhost:8000/health
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import Request, urlopen
+
+
+def timed_request(url: str, headers: dict) -> float:
+    """
+    Performs a GET request and returns its latency in milliseconds.
+    """
+    start = time.perf_counter()
+    with urlopen(Request(url, headers=headers)) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(url: str, requests: int, concurrency: int, headers: dict):
+    """
+    Sends requests concurrently and prints throughput and latency percentiles.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = sorted(
+            executor.map(lambda _: timed_request(url, headers), range(requests))
+        )
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{requests} requests, concurrency {concurrency}: {requests / elapsed:.1f} req/s"
+    )
+    print(
+        f"latency ms: mean={statistics.mean(latencies):.2f} "
+        f"p50={latencies[len(latencies) // 2]:.2f} "
+        f"p95={latencies[int(len(latencies) * 0.95) - 1]:.2f} "
+        f"max={latencies[-1]:.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8000/health")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--token", help="Bearer token for authenticated endpoints.")
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    run(
+        url=args.url,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        headers=headers,
+    )
+
+
+if __name__ == "__main__":
+    main()
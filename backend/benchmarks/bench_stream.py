@@ -0,0 +1,108 @@
+"""
+Measures fan-out of the in-process reading broker to many stream subscribers.
+
+Subscribers listen to random locations and compounds on one event loop while
+batches are published from an ingestion thread, without network or database:
+
+    python -m benchmarks.bench_stream --subscribers 5000 --batches 100
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import threading
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from apps.air_quality.streaming import ReadingBroker, Subscription  # noqa: E402
+
+
+async def consume(subscriber, latencies):
+    """
+    Records the delay between publication and reception of each event.
+    """
+    while True:
+        published_at = await subscriber.queue.get()
+        latencies.append(time.perf_counter() - published_at)
+
+
+def publish(broker, batches, batch_size, locations, compounds, interval):
+    """
+    Publishes batches of events stamped with their publication time.
+    """
+    for _ in range(batches):
+        now = time.perf_counter()
+        broker.publish(
+            (random.randrange(locations), random.randrange(compounds), now)
+            for _ in range(batch_size)
+        )
+        time.sleep(interval)
+
+
+async def run(args):
+    broker = ReadingBroker()
+    latencies = []
+    consumers = []
+    for _ in range(args.subscribers):
+        subscription = Subscription(
+            location_ids=frozenset(random.sample(range(args.locations), 3)),
+            compound_ids=(
+                frozenset({random.randrange(args.compounds)})
+                if random.random() < 0.5
+                else None
+            ),
+        )
+        subscriber = broker.subscribe(subscription, max_pending=1000)
+        consumers.append(asyncio.create_task(consume(subscriber, latencies)))
+
+    start = time.perf_counter()
+    publisher = threading.Thread(
+        target=publish,
+        args=(
+            broker,
+            args.batches,
+            args.batch_size,
+            args.locations,
+            args.compounds,
+            args.interval,
+        ),
+    )
+    publisher.start()
+    while publisher.is_alive():
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.1)
+    elapsed = time.perf_counter() - start
+
+    for consumer in consumers:
+        consumer.cancel()
+
+    published = args.batches * args.batch_size
+    print(f"{args.subscribers} subscribers, {published} readings in {elapsed:.2f}s")
+    print(f"{len(latencies)} deliveries: {len(latencies) / elapsed:.0f} deliveries/s")
+    if latencies:
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(
+            f"latency p50 {quantiles[49] * 1000:.2f} ms, "
+            f"p99 {quantiles[98] * 1000:.2f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--locations", type=int, default=500)
+    parser.add_argument("--compounds", type=int, default=10)
+    parser.add_argument("--batches", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--interval", type=float, default=0.01)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
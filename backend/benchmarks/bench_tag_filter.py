@@ -0,0 +1,118 @@
+"""
+Compares the M2M join tag filter with the denormalized tag id array filter.
+
+Synthetic data is created in a transaction that is rolled back afterwards:
+
+    python -m benchmarks.bench_tag_filter --tags 200 --locations 5000 --readings 200000
+"""
+
+import argparse
+import os
+import random
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+django.setup()
+
+from apps.air_quality.models import (  # noqa: E402
+    AirCompoundReading,
+    Compound,
+    Location,
+    Tag,
+)
+from django.contrib.gis.geos import Point  # noqa: E402
+from django.db import transaction  # noqa: E402
+
+
+class Rollback(Exception):
+    pass
+
+
+def timed(label: str, queryset, repeat: int):
+    """
+    Prints the mean time to count a queryset.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        count = queryset.count()
+    elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+    print(f"{label:<12} {elapsed_ms:8.2f} ms  ({count} rows)")
+
+
+def populate(tags: int, locations: int, readings: int):
+    """
+    Creates random tags, tagged locations and readings.
+    """
+    tag_objects = Tag.objects.bulk_create(
+        [Tag(name=f"bench-tag-{index}") for index in range(tags)]
+    )
+    location_objects = Location.objects.bulk_create(
+        [
+            Location(
+                name=f"bench-location-{index}",
+                coordinates=Point(random.uniform(-10, 10), random.uniform(40, 50)),
+            )
+            for index in range(locations)
+        ]
+    )
+    Location.tags.through.objects.bulk_create(
+        [
+            Location.tags.through(location_id=location.pk, tag_id=tag.pk)
+            for location in location_objects
+            for tag in random.sample(tag_objects, 3)
+        ]
+    )
+    Location.sync_tag_ids([location.pk for location in location_objects])
+
+    compound = Compound.objects.create(symbol="BENCH", full_name="Benchmark")
+    AirCompoundReading.objects.bulk_create(
+        [
+            AirCompoundReading(
+                location=random.choice(location_objects),
+                compound=compound,
+                entered_concentration_value=random.uniform(0, 100),
+                entered_concentration_unit="ug_m3",
+            )
+            for _ in range(readings)
+        ],
+        batch_size=5000,
+    )
+    return tag_objects
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tags", type=int, default=200)
+    parser.add_argument("--locations", type=int, default=5000)
+    parser.add_argument("--readings", type=int, default=200_000)
+    parser.add_argument("--filter-tags", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    try:
+        with transaction.atomic():
+            tag_objects = populate(args.tags, args.locations, args.readings)
+            selected = random.sample(tag_objects, args.filter_tags)
+            readings = AirCompoundReading.objects.all()
+
+            timed(
+                "m2m join",
+                readings.filter(location__tags__in=selected).distinct(),
+                args.repeat,
+            )
+            timed(
+                "tag_ids",
+                readings.filter(
+                    location__tag_ids__overlap=[tag.pk for tag in selected]
+                ),
+                args.repeat,
+            )
+            raise Rollback
+    except Rollback:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import os
+from urllib.parse import unquote, urlparse
+
+from django.core.exceptions import ImproperlyConfigured
+
+DATABASE_ENGINES = {
+    "postgres": "django.contrib.gis.db.backends.postgis",
+    "postgresql": "django.contrib.gis.db.backends.postgis",
+    "postgis": "django.contrib.gis.db.backends.postgis",
+}
+"""
+Dictionary mapping database URL schemes to Django database engines.
+"""
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    """
+    Reads a boolean flag from the environment.
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_int(name: str, default: int) -> int:
+    """
+    Reads an integer from the environment.
+    """
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ImproperlyConfigured(f"'{name}' must be an integer.")
+
+
+def parse_database_url(url: str) -> dict:
+    """
+    Converts a database URL into a Django database configuration.
+    """
+    parsed = urlparse(url)
+    try:
+        engine = DATABASE_ENGINES[parsed.scheme]
+    except KeyError:
+        raise ImproperlyConfigured(f"Unsupported database scheme '{parsed.scheme}'.")
+
+    return {
+        "ENGINE": engine,
+        "NAME": unquote(parsed.path.lstrip("/")),
+        "USER": unquote(parsed.username or ""),
+        "PASSWORD": unquote(parsed.password or ""),
+        "HOST": parsed.hostname or "",
+        "PORT": str(parsed.port or ""),
+    }
+
+
+def database_config(url: str) -> dict:
+    """
+    Builds a database configuration with connection reuse options from the environment.
+
+    DB_POOL enables the psycopg connection pool (DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE,
+    DB_POOL_TIMEOUT); otherwise connections persist for DB_CONN_MAX_AGE seconds.
+    DB_PGBOUNCER disables server-side cursors for transaction pooling mode.
+    """
+    config = parse_database_url(url)
+    config["CONN_HEALTH_CHECKS"] = True
+
+    if env_bool("DB_POOL"):
+        config["CONN_MAX_AGE"] = 0
+        config["OPTIONS"] = {
+            "pool": {
+                "min_size": env_int("DB_POOL_MIN_SIZE", 2),
+                "max_size": env_int("DB_POOL_MAX_SIZE", 10),
+                "timeout": env_int("DB_POOL_TIMEOUT", 10),
+            }
+        }
+    else:
+        config["CONN_MAX_AGE"] = env_int("DB_CONN_MAX_AGE", 60)
+
+    if env_bool("DB_PGBOUNCER"):
+        config["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+    return config
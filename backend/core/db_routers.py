@@ -0,0 +1,72 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_replica_reads_allowed = ContextVar("replica_reads_allowed", default=False)
+
+DEFAULT_UNPINNED_APPS = ("silk", "monitoring")
+"""
+Apps whose writes are request bookkeeping and do not pin reads to the primary.
+"""
+
+
+def get_replica_aliases() -> list:
+    """
+    Returns the aliases of the configured read replicas.
+    """
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def pins_primary(model) -> bool:
+    """
+    Returns whether writing a model keeps the remaining reads on the primary.
+
+    Profiling and slow query records are written on every request and are never
+    read back by the client, so they are left out.
+    """
+    unpinned_apps = getattr(settings, "REPLICA_UNPINNED_APPS", DEFAULT_UNPINNED_APPS)
+    return model._meta.app_label not in unpinned_apps
+
+
+@contextmanager
+def replica_reads(allowed: bool = True):
+    """
+    Allows or forbids routing reads to replicas within the block.
+    """
+    token = _replica_reads_allowed.set(allowed)
+    try:
+        yield
+    finally:
+        _replica_reads_allowed.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Database router sending reads to replicas when the current context allows it.
+
+    Reads stay on the primary once an application model was written in the same
+    context or while a transaction is open on the primary, so clients always see
+    their own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replica_aliases()
+        if not replicas or not _replica_reads_allowed.get():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        if pins_primary(model):
+            _replica_reads_allowed.set(False)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in get_replica_aliases()
@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+
+from core.db_routers import get_replica_aliases, replica_reads
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Middleware routing reads of safe requests to replicas.
+
+    Unsafe requests pin the client to the primary for REPLICA_STICKY_SECONDS
+    through a cookie, keeping read-your-writes consistency despite replica lag.
+    """
+
+    cookie_name = "primary_pinned_until"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not get_replica_aliases():
+            return self.get_response(request)
+
+        use_replicas = request.method in SAFE_METHODS and not self.is_pinned(request)
+        with replica_reads(allowed=use_replicas):
+            response = self.get_response(request)
+
+        if request.method not in SAFE_METHODS:
+            sticky_seconds = getattr(settings, "REPLICA_STICKY_SECONDS", 5)
+            response.set_cookie(
+                self.cookie_name,
+                str(time.time() + sticky_seconds),
+                max_age=sticky_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def is_pinned(self, request) -> bool:
+        """
+        Returns whether the client wrote recently and must read from the primary.
+        """
+        try:
+            pinned_until = float(request.COOKIES.get(self.cookie_name, 0))
+        except ValueError:
+            return False
+        return pinned_until > time.time()
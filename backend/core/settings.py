@@ -10,9 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from datetime import timedelta
 from pathlib import Path
 
+from core.db_config import database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -47,10 +50,12 @@ INSTALLED_APPS = [
     "silk",
     "apps.users",
     "apps.air_quality",
+    "apps.monitoring",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -58,6 +63,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "silk.middleware.SilkyMiddleware",
+    "apps.monitoring.middleware.SlowQueryLogMiddleware",
 ]
 
 ROOT_URLCONF = "core.urls"
@@ -80,18 +86,50 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "core.wsgi.application"
 
+ASGI_APPLICATION = "core.asgi.application"
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
 DATABASES = {
+    "default": database_config(
+        os.environ.get("DATABASE_URL", "postgres://postgres:postgres@db:5432/postgres")
+    ),
+}
+
+DATABASE_REPLICAS = []
+for index, replica_url in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICA_URLS", "").split(",")), start=1
+):
+    DATABASES[f"replica_{index}"] = {
+        **database_config(replica_url.strip()),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{index}")
+
+DATABASE_ROUTERS = ["core.db_routers.PrimaryReplicaRouter"]
+
+REPLICA_STICKY_SECONDS = 5
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+#
+# Table versions behind list ETags and cached grids are kept in the default
+# cache. The local memory cache is only seen by its own process, so a server
+# running more than one worker process must set a shared backend, e.g.
+# CACHE_BACKEND=django.core.cache.backends.db.DatabaseCache with
+# CACHE_LOCATION=cache_table after running createcachetable. Conditional list
+# responses are only served with a shared backend, or when
+# AIR_QUALITY_CONDITIONAL_RESPONSES is set for a single-process server.
+
+CACHES = {
     "default": {
-        "ENGINE": "django.contrib.gis.db.backends.postgis",
-        "NAME": "postgres",
-        "USER": "postgres",
-        "PASSWORD": "postgres",
-        "HOST": "db",
-        "PORT": "5432",
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
     }
 }
 
@@ -139,9 +177,22 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.CachedJWTAuthentication",
+        "apps.users.authentication.APIKeyAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    "DEFAULT_PERMISSION_CLASSES": [
+        "rest_framework.permissions.IsAuthenticated",
+        "apps.users.permissions.APIKeyScopePermission",
     ],
-    "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
@@ -158,6 +209,10 @@ SIMPLE_JWT = {
     "JTI_CLAIM": "jti",
 }
 
+AUTH_USER_CACHE_TIMEOUT = 60
+
+API_KEY_CACHE_TIMEOUT = 300
+
 CORS_ALLOW_ALL_ORIGINS = True
 
 APPEND_SLASH = False
@@ -171,4 +226,53 @@ LOGGING = {
             "class": "logging.StreamHandler",
         },
     },
+    "loggers": {
+        "apps.air_quality": {
+            "handlers": ["terminal"],
+            "level": "INFO",
+        },
+        "apps.monitoring": {
+            "handlers": ["terminal"],
+            "level": "INFO",
+        },
+    },
+}
+
+SLOW_QUERY_LOG = {
+    "ENABLED": True,
+    "THRESHOLD_MS": 200,
+    "EXPLAIN_SAMPLE_RATE": 0.0,
+}
+
+AIR_QUALITY_INGESTION = {
+    "MODE": os.environ.get("AIR_QUALITY_INGESTION_MODE", "sync"),
+    "MAX_QUEUE_DEPTH": 100_000,
+    "BATCH_SIZE": 500,
+    "MAX_ATTEMPTS": 5,
+    "RETRY_DELAY_SECONDS": 10,
+}
+
+READING_STREAM = {
+    "MAX_PENDING_EVENTS": 100,
+    "KEEPALIVE_SECONDS": 15,
+}
+
+AIR_QUALITY_AQI = {
+    "SCALE": os.environ.get("AIR_QUALITY_AQI_SCALE", "epa"),
+    "MAX_AGE_HOURS": 3,
+}
+
+AIR_QUALITY_RECENT_INDEX = {
+    "ENABLED": os.environ.get("AIR_QUALITY_RECENT_INDEX", "false").lower() == "true",
+    "HOURS": 48,
+    "REFRESH_SECONDS": 5,
+    "REFRESH_LOOKBACK_SECONDS": 60,
+}
+
+AIR_QUALITY_READING_VALIDATION = {
+    "ENABLED": True,
+    "ACTION": os.environ.get("AIR_QUALITY_VALIDATION_ACTION", "flag"),
+    "OUTLIER_Z_SCORE": 6.0,
+    "OUTLIER_MIN_SAMPLES": 30,
+    "ROLLING_WINDOW": 500,
 }
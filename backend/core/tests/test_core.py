@@ -1,9 +1,35 @@
 import pytest
+from django.db import DatabaseError, connections
 from rest_framework import status
 from rest_framework.test import APIClient
 
+
 @pytest.mark.django_db
 def test_api_documentation_endpoints():
     """Test that API documentation endpoints are accessible."""
     response = APIClient().get("/doc")
-    assert response.status_code == status.HTTP_200_OK
\ No newline at end of file
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_health_check_endpoint():
+    """Test that the health check reports every database as reachable."""
+    response = APIClient().get("/health")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "ok"
+    assert response.json()["databases"]["default"]["ok"] is True
+
+
+@pytest.mark.django_db
+def test_health_check_hides_database_errors(monkeypatch):
+    """Test that database error details are not exposed by the health check."""
+
+    def failing_cursor():
+        raise DatabaseError('connection to server at "db" failed for user "postgres"')
+
+    monkeypatch.setattr(connections["default"], "cursor", failing_cursor)
+    response = APIClient().get("/health")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json()["databases"]["default"] == {"ok": False}
+    assert "postgres" not in response.content.decode()
@@ -0,0 +1,149 @@
+import time
+
+import pytest
+from apps.air_quality.models import Tag
+from apps.air_quality.tests.factories import TagFactory
+from apps.monitoring.models import SlowQueryFingerprint
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from silk.models import Request
+
+from apps.users.tests.factories import UserFactory
+from core.db_routers import PrimaryReplicaRouter, replica_reads
+from core.middleware import ReplicaRoutingMiddleware
+from core.tests.factories import APIClientFactory
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    settings.REPLICA_STICKY_SECONDS = 5
+    return settings.DATABASE_REPLICAS
+
+
+@pytest.fixture
+def router():
+    return PrimaryReplicaRouter()
+
+
+class TestPrimaryReplicaRouter:
+    """Test suite for PrimaryReplicaRouter."""
+
+    def test_reads_use_primary_outside_replica_context(self, replicas, router):
+        """Test that reads default to the primary."""
+        assert router.db_for_read(Tag) == "default"
+
+    def test_reads_use_replica_inside_replica_context(self, replicas, router):
+        """Test that reads are routed to a replica when allowed."""
+        with replica_reads():
+            assert router.db_for_read(Tag) == "replica_1"
+
+    def test_reads_use_primary_after_write(self, replicas, router):
+        """Test that a write pins the remaining reads to the primary."""
+        with replica_reads():
+            assert router.db_for_write(Tag) == "default"
+            assert router.db_for_read(Tag) == "default"
+
+    @pytest.mark.parametrize("model", [Request, SlowQueryFingerprint])
+    def test_bookkeeping_writes_do_not_pin(self, replicas, router, model):
+        """Test that profiling and monitoring writes keep reads on replicas."""
+        with replica_reads():
+            assert router.db_for_write(model) == "default"
+            assert router.db_for_read(Tag) == "replica_1"
+
+    def test_reads_use_primary_without_replicas(self, settings, router):
+        """Test that reads stay on the primary when no replica is configured."""
+        settings.DATABASE_REPLICAS = []
+        with replica_reads():
+            assert router.db_for_read(Tag) == "default"
+
+    def test_migrations_skip_replicas(self, replicas, router):
+        """Test that migrations only run on the primary."""
+        assert router.allow_migrate("default", "air_quality") is True
+        assert router.allow_migrate("replica_1", "air_quality") is False
+
+
+class TestReplicaRoutingMiddleware:
+    """Test suite for ReplicaRoutingMiddleware."""
+
+    @staticmethod
+    def get_routed_alias(request):
+        routed = {}
+
+        def get_response(request):
+            routed["alias"] = PrimaryReplicaRouter().db_for_read(Tag)
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(get_response)(request)
+        return routed["alias"], response
+
+    def test_safe_request_reads_from_replica(self, replicas):
+        """Test that GET requests read from replicas."""
+        alias, _ = self.get_routed_alias(RequestFactory().get("/readings"))
+        assert alias == "replica_1"
+
+    def test_unsafe_request_pins_client_to_primary(self, replicas):
+        """Test that writes read from the primary and set the sticky cookie."""
+        alias, response = self.get_routed_alias(RequestFactory().post("/readings"))
+
+        assert alias == "default"
+        cookie = response.cookies[ReplicaRoutingMiddleware.cookie_name]
+        assert cookie["max-age"] == 5
+
+    def test_pinned_client_reads_from_primary(self, replicas):
+        """Test that a recently writing client keeps reading from the primary."""
+        request = RequestFactory().get("/readings")
+        request.COOKIES[ReplicaRoutingMiddleware.cookie_name] = str(time.time() + 5)
+
+        alias, _ = self.get_routed_alias(request)
+
+        assert alias == "default"
+
+    def test_expired_pin_reads_from_replica(self, replicas):
+        """Test that an expired pin no longer forces the primary."""
+        request = RequestFactory().get("/readings")
+        request.COOKIES[ReplicaRoutingMiddleware.cookie_name] = str(time.time() - 1)
+
+        alias, _ = self.get_routed_alias(request)
+
+        assert alias == "replica_1"
+
+
+@pytest.mark.django_db
+class TestReplicaRoutingStack:
+    """Test suite for replica routing through the full middleware stack."""
+
+    @pytest.fixture
+    def routed(self, replicas, monkeypatch):
+        """Records routed read aliases while running every query on the primary."""
+        routed = []
+        db_for_read = PrimaryReplicaRouter.db_for_read
+
+        def record_db_for_read(router, model, **hints):
+            routed.append((model, db_for_read(router, model, **hints)))
+            return "default"
+
+        monkeypatch.setattr(PrimaryReplicaRouter, "db_for_read", record_db_for_read)
+        return routed
+
+    def test_safe_request_reads_from_replica(self, routed):
+        """Test that middleware writes do not pin a GET request to the primary."""
+        TagFactory()
+        api_client = APIClientFactory(user=UserFactory())
+
+        response = api_client.get(reverse("tags-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert Request.objects.exists()
+        assert (Tag, "replica_1") in routed
+
+    def test_unsafe_request_reads_from_primary(self, routed):
+        """Test that reads of a POST request stay on the primary."""
+        api_client = APIClientFactory(user=UserFactory())
+
+        response = api_client.post(reverse("tags-list"), {"name": "Urban"})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert all(alias == "default" for _, alias in routed)
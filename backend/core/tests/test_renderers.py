@@ -0,0 +1,66 @@
+import datetime
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from django.contrib.gis.geos import Point
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {
+            "timestamp": datetime.datetime(
+                2025, 1, 27, 0, 0, tzinfo=datetime.timezone.utc
+            )
+        },
+        {"date": datetime.date(2025, 1, 27), "delta": datetime.timedelta(hours=1)},
+        {"value": Decimal("12.50"), "lazy": gettext_lazy("Not found.")},
+        {"nested": [{"id": 1, "tags": ("a", "b")}], "empty": None},
+        {"separator": "line\u2028break"},
+    ],
+)
+def test_renderer_matches_drf_json_renderer(data):
+    """Test that orjson output decodes to the same data as DRF's renderer."""
+    assert json.loads(ORJSONRenderer().render(data)) == json.loads(
+        JSONRenderer().render(data)
+    )
+
+
+def test_renderer_escapes_line_separators():
+    """Test that line separators are escaped like DRF does."""
+    assert ORJSONRenderer().render({"text": "a\u2028b"}) == b'{"text":"a\\u2028b"}'
+
+
+def test_renderer_encodes_geometries_as_geojson():
+    """Test that GEOS geometries are rendered as GeoJSON."""
+    content = ORJSONRenderer().render({"geometry": Point(1.5, 2.5, srid=4326)})
+
+    assert json.loads(content) == {
+        "geometry": {"type": "Point", "coordinates": [1.5, 2.5]}
+    }
+
+
+def test_renderer_renders_none_as_empty_body():
+    """Test that empty responses have no content."""
+    assert ORJSONRenderer().render(None) == b""
+
+
+def test_parser_parses_json():
+    """Test that request bodies are parsed."""
+    stream = io.BytesIO(b'{"name": "Station", "values": [1, 2.5]}')
+
+    assert ORJSONParser().parse(stream) == {"name": "Station", "values": [1, 2.5]}
+
+
+def test_parser_rejects_invalid_json():
+    """Test that malformed bodies raise a parse error."""
+    with pytest.raises(ParseError):
+        ORJSONParser().parse(io.BytesIO(b'{"name": '))
@@ -4,6 +4,8 @@ from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 from rest_framework.permissions import AllowAny
 
+from core.views import HealthCheckView
+
 schema_view = get_schema_view(
     openapi.Info(
         title="Air Quality",
@@ -16,6 +18,7 @@ schema_view = get_schema_view(
 )
 
 urlpatterns = [
+    path("health", HealthCheckView.as_view(), name="health"),
     path("doc", schema_view.with_ui("swagger", cache_timeout=0), name="docs"),
     path("silk", include("silk.urls")),
     path("admin", admin.site.urls),
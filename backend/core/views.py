@@ -0,0 +1,52 @@
+import logging
+
+from django.db import DatabaseError, connections
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+
+class HealthCheckView(APIView):
+    """
+    API view reporting database connectivity and connection pool usage.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Checks every configured database with a lightweight query.
+        """
+        databases = {alias: self.check_database(alias) for alias in connections}
+        healthy = all(database["ok"] for database in databases.values())
+
+        return Response(
+            data={"status": "ok" if healthy else "error", "databases": databases},
+            status=200 if healthy else 503,
+        )
+
+    @staticmethod
+    def check_database(alias: str) -> dict:
+        """
+        Runs a trivial query on a database and returns its status.
+
+        Errors are logged rather than returned, since the endpoint is public
+        and their messages may name hosts and users.
+        """
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+        except DatabaseError:
+            logger.exception("Health check failed for database %s.", alias)
+            return {"ok": False}
+
+        status = {"ok": True}
+        pool = getattr(connection, "pool", None)
+        if pool is not None:
+            status["pool"] = pool.get_stats()
+        return status